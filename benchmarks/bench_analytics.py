@@ -0,0 +1,71 @@
+"""Utilization analytics over a year of occurrences for a large portfolio.
+
+Generates synthetic occurrences (default 500 resources, ~8 bookings per
+resource per weekday for a year) and times loading them into arrays and
+computing the heatmap, peak-hour histogram and cancel rates.
+
+    python benchmarks/bench_analytics.py [--resources N] [--per-day N]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from officerndapilib.analytics import (
+    cancel_rates,
+    load_occurrences,
+    peak_hour_histogram,
+    utilization_heatmap,
+)
+
+YEAR_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def occurrences(resources, per_day, seed=0):
+    rng = random.Random(seed)
+    fmt = "%Y-%m-%dT%H:%M:00.000Z"
+    for day in range(365):
+        date = YEAR_START + timedelta(days=day)
+        if date.weekday() >= 5:
+            continue
+        for r in range(resources):
+            for _ in range(per_day):
+                minute = rng.randrange(9 * 60, 17 * 60, 15)
+                start = date + timedelta(minutes=minute)
+                end = start + timedelta(minutes=rng.choice((30, 60, 90, 120)))
+                yield {
+                    "resourceId": f"{r:024x}",
+                    "start": {"dateTime": start.strftime(fmt)},
+                    "end": {"dateTime": end.strftime(fmt)},
+                    "canceled": rng.random() < 0.05,
+                }
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {time.perf_counter() - started:>8.3f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resources", type=int, default=500)
+    parser.add_argument("--per-day", type=int, default=8)
+    args = parser.parse_args()
+
+    bookings = list(occurrences(args.resources, args.per_day))
+    print(f"{len(bookings):,} occurrences")
+    occ = timed("load_occurrences", lambda: load_occurrences(bookings))
+    year_end = YEAR_START + timedelta(days=365)
+    timed(
+        "utilization_heatmap",
+        lambda: utilization_heatmap(occ, YEAR_START, year_end),
+    )
+    timed("peak_hour_histogram", lambda: peak_hour_histogram(occ))
+    timed("cancel_rates", lambda: cancel_rates(occ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Import-time benchmark for officerndapilib.
+
+Each scenario runs in a fresh interpreter so module caches never leak between
+samples. ``eager`` reproduces the pre-lazy behaviour of loading every
+submodule on ``import officerndapilib``.
+
+    python benchmarks/bench_import.py [--runs N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = {
+    "baseline (python -c pass)": "pass",
+    "import officerndapilib": "import officerndapilib",
+    "from officerndapilib.schema import ORNDBooking": (
+        "from officerndapilib.schema import ORNDBooking"
+    ),
+    "from officerndapilib import get_all_members": (
+        "from officerndapilib import get_all_members"
+    ),
+    "eager (api + reqs)": (
+        "import officerndapilib.api, officerndapilib.reqs"
+    ),
+}
+
+TIMER = (
+    "import time; _t = time.perf_counter(); {stmt}; "
+    "print(time.perf_counter() - _t)"
+)
+
+
+def time_statement(stmt: str, runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", TIMER.format(stmt=stmt)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        samples.append(float(out.stdout.strip()) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<50} {'median ms':>10} {'min ms':>10}")
+    for name, stmt in SCENARIOS.items():
+        samples = time_statement(stmt, args.runs)
+        print(
+            f"{name:<50} {statistics.median(samples):>10.2f} "
+            f"{min(samples):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
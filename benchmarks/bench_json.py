@@ -0,0 +1,111 @@
+"""Decode/encode throughput of the installed JSON backends.
+
+Payloads mimic large ``get_all_members`` and ``bookings/occurrences``
+responses. msgspec is also timed decoding into the generated typed structs.
+
+    python benchmarks/bench_json.py [--records N] [--repeat R]
+"""
+
+import argparse
+import time
+
+from officerndapilib.schema import ORNDBooking, ORNDMember
+from officerndapilib.serialization import Serializer, available_backends
+
+
+def member(i):
+    return {
+        "_id": f"{i:024x}",
+        "name": f"Member {i}",
+        "email": f"member{i}@example.com",
+        "phone": "07426389643",
+        "team": None,
+        "signedDocuments": [],
+        "office": {"name": "12 Moorgate", "isOpen": True, "city": "London"},
+        "createdAt": "2024-01-01T00:00:00.000Z",
+        "createdBy": f"{i:024x}",
+        "modifiedAt": "2024-01-01T00:00:00.000Z",
+        "modifiedBy": f"{i:024x}",
+        "status": "active",
+        "paymentDetails": [],
+    }
+
+
+def booking(i):
+    return {
+        "_id": f"{i:024x}",
+        "office": "65416bf72db05a7176b467ac",
+        "resourceId": "65c38ead5e6d7bd36ed6a540",
+        "start": {"dateTime": "2024-03-01T09:00:00.000Z"},
+        "end": {"dateTime": "2024-03-01T10:00:00.000Z"},
+        "members": [f"{i:024x}"],
+        "fees": [
+            {
+                "date": "2024-03-01",
+                "fee": {"name": "Meeting room", "price": 25.0, "quantity": 1},
+                "credits": [],
+            }
+        ],
+        "canceled": False,
+        "summary": f"Booking {i}",
+        "timezone": "Europe/London",
+    }
+
+
+def throughput(fn, payload, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(payload)
+    elapsed = time.perf_counter() - started
+    return len(payload) * repeat / elapsed / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    stdlib = Serializer("json")
+    payloads = {
+        "members": (
+            stdlib.dumps([member(i) for i in range(args.records)]),
+            list[ORNDMember],
+        ),
+        "occurrences": (
+            stdlib.dumps([booking(i) for i in range(args.records)]),
+            list[ORNDBooking],
+        ),
+    }
+
+    print(
+        f"{'payload':<12} {'backend':<16} "
+        f"{'decode MB/s':>12} {'encode MB/s':>12}"
+    )
+    for name, (payload, type_) in payloads.items():
+        decoded = stdlib.loads(payload)
+        for backend in available_backends():
+            serializer = Serializer(backend)
+            decode = throughput(serializer.loads, payload, args.repeat)
+            encoded = serializer.dumps(decoded)
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                serializer.dumps(decoded)
+            encode = (
+                len(encoded)
+                * args.repeat
+                / (time.perf_counter() - started)
+                / 1e6
+            )
+            print(f"{name:<12} {backend:<16} {decode:>12.1f} {encode:>12.1f}")
+            if backend == "msgspec":
+                typed = throughput(
+                    lambda p: serializer.loads_as(p, type_),
+                    payload,
+                    args.repeat,
+                )
+                print(f"{name:<12} {'msgspec (typed)':<16} {typed:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Booking throughput under ramped concurrency against a local fake API.
+
+Starts a FakeORNDServer answering every request after ``--latency``
+seconds (failing ``--error-rate`` of them with a 503), then runs a mix of
+resource listings, availability computations, checkouts and cancels at
+each concurrency in ``--stages`` for ``--duration`` seconds, printing
+throughput, latency percentiles, error rate and client CPU per operation.
+
+    python benchmarks/bench_load.py [--resources N] [--latency S]
+        [--error-rate F] [--stages 1,2,4,8,16] [--duration S] [--json]
+"""
+
+import argparse
+import json
+
+from officerndapilib.loadtest import DEFAULT_STAGES, FakeORNDServer, run_load
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resources", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--stages", default=",".join(str(s) for s in DEFAULT_STAGES)
+    )
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    stages = [int(s) for s in args.stages.split(",")]
+    with FakeORNDServer(
+        resources=args.resources,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    ) as server:
+        client = server.client(pool_size=max(stages))
+        report = run_load(client, stages=stages, duration=args.duration)
+    if args.json:
+        print(json.dumps(report.as_dict(), indent=2))
+        return
+    print(report.format())
+    for stage in report.stages:
+        if stage.errors:
+            print(f"{stage.concurrency} workers: {stage.errors}")
+
+
+if __name__ == "__main__":
+    main()
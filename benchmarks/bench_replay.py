@@ -0,0 +1,120 @@
+"""Reproducible availability fan-out timings from a replayed cassette.
+
+Builds a cassette for ``find_available_slots`` over N meeting rooms (one
+resources call and one occurrences call per room, each recorded at
+``--latency`` seconds) and replays it at ``--scale`` times that latency, so
+runs are comparable across releases with no network. Pass ``--cassette`` to
+replay a cassette recorded against the live API instead; it must contain the
+same requests.
+
+    python benchmarks/bench_replay.py [--resources N] [--latency S]
+        [--scale F] [--repeat R] [--cassette PATH]
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from officerndapilib.api import get_client
+from officerndapilib.availability import find_available_slots
+from officerndapilib.cassettes import Cassette, Interaction, use_cassette
+from officerndapilib.reqs import RetrieveORNDBookingOccurencesRequest
+
+TOKEN = "token"
+ORGANIZATION = "bench"
+OFFICE = "65416bf72db05a7176b467ac"
+DAY = datetime(2024, 3, 4, tzinfo=timezone.utc)
+
+
+def synthetic_cassette(resources, latency):
+    client = get_client(TOKEN, ORGANIZATION)
+    rooms = [{"_id": f"{i:024x}", "size": 8} for i in range(resources)]
+    interactions = [
+        Interaction(
+            "GET",
+            client.url(
+                "resources", [("office", OFFICE), ("type", "meeting_room")]
+            ),
+            None,
+            200,
+            json.dumps(rooms),
+            elapsed=latency,
+        )
+    ]
+    for room in rooms:
+        request = RetrieveORNDBookingOccurencesRequest(
+            office=OFFICE,
+            resource_id=room["_id"],
+            start=DAY.strftime("%Y-%m-%d"),
+            end=(DAY + timedelta(days=1)).strftime("%Y-%m-%d"),
+        )
+        booked = {
+            "_id": room["_id"],
+            "resourceId": room["_id"],
+            "start": {"dateTime": "2024-03-04T09:00:00Z"},
+            "end": {"dateTime": "2024-03-04T12:00:00Z"},
+        }
+        interactions.append(
+            Interaction(
+                "GET",
+                client.url(
+                    "occurrences",
+                    [
+                        ("$limit", request.limit),
+                        ("start", request.start),
+                        ("end", request.end),
+                        ("resourceId", request.resource_id),
+                        ("office", request.office),
+                    ],
+                ),
+                None,
+                200,
+                json.dumps([booked]),
+                elapsed=latency,
+            )
+        )
+    return Cassette(interactions=interactions)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resources", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cassette")
+    args = parser.parse_args()
+
+    if args.cassette:
+        cassette = Cassette.load(args.cassette)
+    else:
+        cassette = synthetic_cassette(args.resources, args.latency)
+    session = get_client(TOKEN, ORGANIZATION).session
+    use_cassette(session, cassette, latency_scale=args.scale)
+    recorded = sum(i.elapsed for i in cassette.interactions) * args.scale
+    print(f"{len(cassette)} interactions, {recorded:.3f}s sequential latency")
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        slots = find_available_slots(
+            TOKEN,
+            ORGANIZATION,
+            OFFICE,
+            "meeting_room",
+            timedelta(hours=1),
+            DAY.replace(hour=9),
+            DAY.replace(hour=18),
+        )
+        timings.append(time.perf_counter() - started)
+    assert slots and slots[0].start == DAY.replace(hour=12)
+    timings.sort()
+    print(
+        f"find_available_slots  min {timings[0]:.3f}s  "
+        f"median {timings[len(timings) // 2]:.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Per-object cost of validating booking and member request models.
+
+``legacy`` re-implements the previous validators (uncompiled ``re.match``,
+a datetime parse per check); ``current`` builds the real request models.
+Resource lookups are answered from a local dict so only CPU cost is timed.
+
+    python benchmarks/bench_validators.py [--objects N]
+"""
+
+import argparse
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from attrs import define, field, validators
+
+from officerndapilib import reqs
+from officerndapilib.dates import parse_datetime
+from officerndapilib.reqs import (
+    CreateORNDMemberBookingRequest,
+    CreateORNDMemberRequest,
+    validate_requests,
+)
+
+OFFICE = "65416bf72db05a7176b467ac"
+RESOURCE = "65c38ead5e6d7bd36ed6a540"
+MEMBER = "65caaa8d836bde4655bca4de"
+
+
+def legacy_valid_ornd_id(instance, attribute, value):
+    if not re.match(r"^[0-9a-fA-F]{24}$", value):
+        raise ValueError(f"{value} is not a valid ORND ID")
+
+
+def legacy_is_ISO8601_datetime(instance, attribute, value):
+    datetime.fromisoformat(value)
+    dt_str = value.split("T")
+    if len(dt_str) != 2:
+        raise ValueError(f"{value} is not a valid datetime")
+    date, time_ = dt_str
+    if not re.match(r"\d{4}-\d{2}-\d{2}", date):
+        raise ValueError(f"{date} is not a valid date")
+    if not re.match(r"\d{2}:\d{2}(:\d{2})?(Z)?", time_):
+        raise ValueError(f"{time_} is not a valid time")
+
+
+_id = [validators.instance_of(str), legacy_valid_ornd_id]
+_dt = [validators.instance_of(str), legacy_is_ISO8601_datetime]
+_str = [validators.instance_of(str)]
+
+
+@define(kw_only=True)
+class LegacyBookingRequest:
+    """The booking model as it was before the compiled validator engine"""
+
+    organization: str = field(validator=_str)
+    office: str = field(validator=_id)
+    resource_id: str = field(validator=_id)
+    start: str = field(validator=_dt)
+    end: str = field(validator=_dt)
+    summary: str = field(validator=_str)
+    description: Optional[str] = field(default=None)
+    count: int = field(default=1)
+    source: str = field(default="website")
+    free: bool = field(default=False)
+    member: str = field(validator=_id)
+
+    def __attrs_post_init__(self):
+        resource = reqs.get_resource_by_id(self.organization, self.resource_id)
+        assert resource["type"] in ["meeting_room", "hotdesk"]
+        start = datetime.fromisoformat(self.start)
+        end = datetime.fromisoformat(self.end)
+        assert start <= end
+        start = datetime.fromisoformat(self.start)
+        end = datetime.fromisoformat(self.end)
+        assert start.weekday() not in [5, 6] and end.weekday() not in [5, 6]
+        start = datetime.fromisoformat(self.start)
+        start = start.replace(tzinfo=timezone.utc)
+        assert start >= datetime.now(timezone.utc)
+        start = datetime.fromisoformat(self.start)
+        end = datetime.fromisoformat(self.end)
+        assert not (
+            start.time() < datetime.strptime("09:00", "%H:%M").time()
+            or end.time() > datetime.strptime("18:00", "%H:%M").time()
+        )
+        start = datetime.fromisoformat(self.start)
+        end = datetime.fromisoformat(self.end)
+        assert (end - start).seconds / 3600 <= 8
+        now = datetime.now(timezone.utc)
+        booking_start = datetime.fromisoformat(self.start)
+        booking_start = booking_start.replace(tzinfo=timezone.utc)
+        assert (booking_start - now).days <= 30
+
+
+def booking_payloads(n):
+    base = (datetime.now(timezone.utc) + timedelta(days=1)).replace(
+        hour=9, minute=0, second=0, microsecond=0
+    )
+    while base.weekday() in [5, 6]:
+        base += timedelta(days=1)
+    payloads = []
+    for i in range(n):
+        start = base + timedelta(seconds=i)  # distinct strings defeat caching
+        payloads.append(
+            dict(
+                organization="org",
+                office=OFFICE,
+                resource_id=RESOURCE,
+                start=start.isoformat(),
+                end=(start + timedelta(hours=1)).isoformat(),
+                summary="Benchmark",
+                member=MEMBER,
+            )
+        )
+    return payloads
+
+
+def member_payloads(n):
+    return [
+        dict(
+            startDate=f"2024-01-01T00:00:{i % 60:02d}Z",
+            office=OFFICE,
+            name=f"Member {i}",
+            email=f"member{i}@example.com",
+        )
+        for i in range(n)
+    ]
+
+
+def per_object_us(fn, n):
+    t = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=20000)
+    args = parser.parse_args()
+    n = args.objects
+
+    resources = {("org", RESOURCE): {"type": "meeting_room", "name": "LGC"}}
+    reqs.get_resource_by_id = lambda org, id: resources[(org, id)]
+
+    bookings = booking_payloads(n)
+    members = member_payloads(n)
+
+    rows = [
+        (
+            "booking model (legacy)",
+            per_object_us(
+                lambda: [LegacyBookingRequest(**p) for p in bookings], n
+            ),
+        ),
+    ]
+    parse_datetime.cache_clear()
+    rows.append(
+        (
+            "booking model (current, one by one)",
+            per_object_us(
+                lambda: [CreateORNDMemberBookingRequest(**p) for p in bookings],
+                n,
+            ),
+        )
+    )
+    parse_datetime.cache_clear()
+    rows.append(
+        (
+            "booking model (current, batched)",
+            per_object_us(
+                lambda: validate_requests(
+                    CreateORNDMemberBookingRequest, bookings
+                ),
+                n,
+            ),
+        )
+    )
+    rows.append(
+        (
+            "member model (current, batched)",
+            per_object_us(
+                lambda: validate_requests(CreateORNDMemberRequest, members), n
+            ),
+        )
+    )
+
+    print(f"{'scenario':<40} {'us/object':>10}")
+    for name, us in rows:
+        print(f"{name:<40} {us:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,392 +1,355 @@
-import requests
-from datetime import datetime, timedelta
-
-from officerndapilib.schema import (
-    ORNDAuth,
-    ORNDMember,
-    ORNDResource,
-    ORNDResourceType,
-    ORNDBookingDateTime,
-    ORNDBooking,
-)
-
-from officerndapilib.queries import (
-    ORNDResourceQuery,
-    append_queries_to_url,
-)
-
-from .exceptions import HttpException, ValidationException
-
-
-ORND_BASE_URL = "https://app.officernd.com/api/v1/organizations/"
-
-# AUTH
-
-
-def get_ornd_token(auth: ORNDAuth) -> str:
-    url = "https://identity.officernd.com/oauth/token"
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/x-www-form-urlencoded",
-    }
-    body = {
-        "client_id": auth["client_id"],
-        "client_secret": auth["client_secret"],
-        "grant_type": auth["grant_type"],
-        "scope": auth["scope"],
-    }
-    response = requests.post(url, headers=headers, data=body)
-    if response.ok:
-        data: dict[str, str] = response.json()
-        access_token = data["access_token"]
-        return access_token
-    else:
-        raise Exception("Unable to authorize request")
-
-
-# RESOURCES
-
-
-def get_all_resources(
-    token: str,
-    organization: str,
-    office: str,
-    type: ORNDResourceType,
-    queries: list[ORNDResourceQuery] = [],
-) -> list[ORNDResource]:
-    """Retrieves resources for a given office location from OfficeRND API"""
-
-    url = ORND_BASE_URL + organization + f"/resources"
-    url = append_queries_to_url(url, queries)
-    url += f"&office={office}&type={type}"
-
-    headers = {"accept": "application/json", "Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers)
-
-    if response.ok:
-        data: list[ORNDResource] = response.json()
-        return data
-    else:
-        err = response.json()["message"]
-        print(err)
-        raise HttpException(err, response.status_code)
-
-
-def get_resource_by_id(organization: str, id: str) -> ORNDResource:
-    """Retrieves a specific resource by ID from OfficeRND API"""
-
-    url = ORND_BASE_URL + organization + f"/resources/{id}"
-    headers = {"accept": "application/json"}
-    response = requests.get(url, headers=headers)
-    if response.ok:
-        data: ORNDResource = response.json()
-        return data
-    else:
-        raise Exception(response.json()["message"])
-
-
-from officerndapilib.reqs import (
-    CreateORNDMemberRequest,
-    CreateORNDMemberBookingRequest,
-    RetrieveORNDBookingOccurencesRequest,
-)
-
-# MEMBERS
-
-
-def get_all_members(
-    token: str, organization: str, office: str
-) -> list[ORNDMember]:
-    """Retrieves all members from OfficeRND API"""
-
-    url = ORND_BASE_URL + organization + f"/members?office={office}"
-    headers = {"accept": "application/json", "Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers)
-    if response.ok:
-        data: list[ORNDMember] = response.json()
-        return data
-    else:
-        raise Exception(response.json()["message"])
-
-
-def get_member_by_id(token: str, organization: str, id: str) -> ORNDMember:
-    """Retrieves a specific member by ID from OfficeRND API"""
-
-    url = ORND_BASE_URL + organization + f"/members/{id}"
-    headers = {"accept": "application/json", "Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers)
-    if response.ok:
-        data: ORNDMember = response.json()
-        return data
-    else:
-        raise Exception(response.json()["message"])
-
-
-def get_member_by_email(
-    token: str, organization: str, office: str, email: str
-) -> ORNDMember:
-    """Retrieves a specific member by email from OfficeRND API"""
-
-    url = ORND_BASE_URL + organization + f"/members?office={office}"
-    headers = {"accept": "application/json", "Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers)
-    if response.ok:
-        data: list[ORNDMember] = response.json()
-        try:
-            member: ORNDMember = next(
-                member for member in data if member["email"] == email
-            )
-            return member
-        except StopIteration:
-            raise StopIteration(f"Member with email '{email}' not found")
-    else:
-        raise Exception(response.json()["message"])
-
-
-def create_member(
-    token: str, organization: str, member_request: CreateORNDMemberRequest
-) -> list[ORNDMember]:
-    """Creates a member in OfficeRND"""
-
-    url = ORND_BASE_URL + organization + f"/members"
-    headers = {
-        "accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {token}",
-    }
-    payload = member_request.data
-
-    response = requests.post(url, headers=headers, json=payload)
-    if response.ok:
-        data: list[ORNDMember] = response.json()
-        return data
-    else:
-        raise Exception(response.json()["message"])
-
-
-def delete_members(
-    token: str, organization: str, ids: list[str]
-) -> list[ORNDMember]:
-    """Deletes a member in OfficeRND"""
-
-    url = ORND_BASE_URL + organization + f"/members"
-    headers = {
-        "accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {token}",
-    }
-
-    response = requests.delete(url, headers=headers, json=ids)
-    if response.ok:
-        data: list[ORNDMember] = response.json()
-        return data
-    else:
-        raise Exception(response.json()["message"])
-
-
-# BOOKINGS
-
-
-def get_all_bookings(
-    token: str,
-    organization: str,
-    booking_occurence: RetrieveORNDBookingOccurencesRequest,
-) -> list[ORNDBooking]:
-    """Retrieves all bookings from OfficeRND API"""
-
-    url = ORND_BASE_URL + organization + f"/bookings/occurrences?"
-    url += f"$limit={booking_occurence.limit}&start={booking_occurence.start}&end={booking_occurence.end}\
-        &resourceId={booking_occurence.resource_id}&office={booking_occurence.office}"
-    headers = {
-        "accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {token}",
-    }
-    response = requests.get(url, headers=headers)
-    if response.ok:
-        data: list[ORNDBooking] = response.json()
-        return data
-    else:
-        raise Exception(response.json()["message"])
-
-
-def get_booking_times_available_on_date(
-    booking_times: list[dict[str, ORNDBookingDateTime]],
-    date: str,
-    start=9,
-    end=17,
-    interval=60,
-) -> list[str]:
-    """Returns a list of times available for booking on a given date"""
-
-    # array of times from start to end in min intervals
-    times = [
-        f"{hour:02d}:{min:02d}"
-        for hour in range(start, end)
-        for min in range(0, 60, interval)
-    ]
-
-    # filter the times to only include times that are on the date
-    booking_times = [
-        booking_time
-        for booking_time in booking_times
-        if booking_time["start"]["dateTime"].split("T")[0] == date
-    ]
-
-    # filter the times that are already booked between the start[dateTime] and end[dateTime]
-    booked_intervals = []
-    for booking in booking_times:
-        # round down to the nearest min interval
-        start_dt = datetime.fromisoformat(booking["start"]["dateTime"])
-        if start_dt.minute % interval != 0:
-            start_dt = start_dt - timedelta(minutes=start_dt.minute % interval)
-
-        # round up to the nearest min interval
-        end_dt = datetime.fromisoformat(booking["end"]["dateTime"])
-        if end_dt.minute % interval != 0:
-            end_dt = end_dt + timedelta(
-                minutes=interval - end_dt.minute % interval
-            )
-
-        duration_min_intervals = (end_dt - start_dt).seconds / (60 * interval)
-
-        booked_intervals.append(start_dt.strftime("%H:%M"))
-        for _ in range(int(duration_min_intervals) - 1):
-            start_dt += timedelta(minutes=interval)
-            booked_intervals.append(start_dt.strftime("%H:%M"))
-
-    # remove booked intervals from available times
-    times = [time for time in times if time not in booked_intervals]
-
-    # return list of hours that are available
-    return times
-
-
-def validate_booking_request(
-    token: str,
-    organization: str,
-    booking_request: CreateORNDMemberBookingRequest,
-) -> list[ORNDBooking]:
-    """Validates a booking request"""
-
-    url = ORND_BASE_URL + organization + f"/bookings/checkout-summary"
-    headers = {
-        "accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {token}",
-    }
-
-    response = requests.post(url, headers=headers, json=booking_request.data)
-    if response.ok:
-        data: list[ORNDBooking] = response.json()
-        return data
-    else:
-        raise Exception(response.json()["message"])
-
-
-def create_booking(
-    token: str,
-    organization: str,
-    booking_request: CreateORNDMemberBookingRequest,
-) -> list[ORNDBooking]:
-    """Creates a booking in OfficeRND"""
-
-    url = ORND_BASE_URL + organization + f"/bookings/checkout"
-    headers = {
-        "accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {token}",
-    }
-    payload = booking_request.data
-
-    response = requests.post(url, headers=headers, json=payload)
-    if response.ok:
-        data: list[ORNDBooking] = response.json()
-        return data
-    else:
-        raise Exception(response.json()["message"])
-
-
-def validate_booking_creation(
-    token: str,
-    organization: str,
-    booking_request: CreateORNDMemberBookingRequest,
-) -> list[ORNDBooking]:
-    """Validates a booking request made has been created in OfficeRND"""
-
-    url = ORND_BASE_URL + organization + f"/bookings/summary"
-    headers = {
-        "accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {token}",
-    }
-
-    booking_obj = {
-        "resourceId": booking_request.resource_id,
-        "start": {"dateTime": booking_request.start},
-        "end": {"dateTime": booking_request.end},
-    }
-    booking_target = {"member": booking_request.member}
-    payload = {
-        "booking": booking_obj,
-        "target": booking_target,
-    }
-
-    response = requests.post(url, headers=headers, json=payload)
-    if response.ok:
-        data: list[ORNDBooking] = response.json()
-        return data
-    else:
-        raise Exception(response.json()["message"])
-
-
-def delete_booking(token: str, organization: str, booking_id: str):
-    """Deletes a booking in OfficeRND"""
-
-    url = ORND_BASE_URL + organization + f"/bookings/{booking_id}"
-    headers = {
-        "accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {token}",
-    }
-
-    response = requests.delete(url, headers=headers)
-    if response.ok:
-        data = response.json()
-        return data
-    else:
-        raise Exception(response.json()["message"])
-
-
-def cancel_booking(
-    token: str, organization: str, booking_id: str, silent=False, skip_fee=False
-) -> ORNDBooking:
-    """Cancels a booking in OfficeRND"""
-
-    url = ORND_BASE_URL + organization + f"/bookings/{booking_id}/cancel"
-    url += f"?silent={silent}&skipFee={skip_fee}"
-
-    headers = {
-        "accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {token}",
-    }
-
-    response = requests.post(url, headers=headers)
-    if response.ok:
-        data: ORNDBooking = response.json()
-        return data
-    else:
-        raise Exception(response.json()["message"])
-
-
-def booking_checkout(
-    token: str,
-    organization: str,
-    booking_request: CreateORNDMemberBookingRequest,
-):
-    """Validates and creates a booking in OfficeRND"""
-    validate_booking_request(token, organization, booking_request)
-    validate_booking_creation(token, organization, booking_request)
-    booking = create_booking(token, organization, booking_request)
-    return booking
+"""A thin wrapper around the OfficeRnD API.
+
+Submodules and their public names are loaded lazily on first access (PEP 562),
+so ``import officerndapilib`` does not pay for ``requests`` or ``attrs`` until
+an endpoint or request model is actually used.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+_SUBMODULES = {
+    "analytics",
+    "api",
+    "availability",
+    "bulk",
+    "cache",
+    "calendars",
+    "cassettes",
+    "changes",
+    "client",
+    "dates",
+    "exceptions",
+    "idempotency",
+    "intervals",
+    "loaders",
+    "loadtest",
+    "mutations",
+    "queries",
+    "quotes",
+    "ratelimit",
+    "recurrence",
+    "reqs",
+    "resilience",
+    "schema",
+    "serialization",
+    "streams",
+    "tenants",
+    "warmup",
+    "webhooks",
+}
+
+_LAZY_ATTRIBUTES = {
+    # analytics
+    "Occurrences": "analytics",
+    "load_occurrences": "analytics",
+    "booked_minutes": "analytics",
+    "utilization_heatmap": "analytics",
+    "peak_hour_histogram": "analytics",
+    "cancel_rates": "analytics",
+    # api
+    "get_ornd_token": "api",
+    "get_all_resources": "api",
+    "get_resource_by_id": "api",
+    "get_all_members": "api",
+    "get_member_by_id": "api",
+    "get_member_by_email": "api",
+    "create_member": "api",
+    "delete_members": "api",
+    "get_all_bookings": "api",
+    "get_booking_times_available_on_date": "api",
+    "validate_booking_request": "api",
+    "create_booking": "api",
+    "validate_booking_creation": "api",
+    "delete_booking": "api",
+    "cancel_booking": "api",
+    "booking_checkout": "api",
+    "get_all_offices": "api",
+    "get_office_by_id": "api",
+    "request_ornd_token": "api",
+    # availability
+    "AvailableSlot": "availability",
+    "find_available_slots": "availability",
+    # bulk
+    "BulkReport": "bulk",
+    "bulk_cancel_bookings": "bulk",
+    "bulk_delete_members": "bulk",
+    # cache
+    "MemoryCache": "cache",
+    "RefreshScheduler": "cache",
+    "SQLiteCache": "cache",
+    "SWRCache": "cache",
+    # calendars
+    "OfficeCalendar": "calendars",
+    "calendar_for": "calendars",
+    "register_calendar": "calendars",
+    # cassettes
+    "Cassette": "cassettes",
+    "Interaction": "cassettes",
+    "RecordingAdapter": "cassettes",
+    "ReplayAdapter": "cassettes",
+    "use_cassette": "cassettes",
+    # changes
+    "Change": "changes",
+    "ChangeFeed": "changes",
+    "ChangeSet": "changes",
+    "record_hash": "changes",
+    # client
+    "ORND_BASE_URL": "client",
+    "ORNDClient": "client",
+    "get_client": "client",
+    "pooled_session": "client",
+    "set_metadata_cache": "client",
+    # exceptions
+    "CircuitOpenException": "exceptions",
+    "HttpException": "exceptions",
+    "ValidationException": "exceptions",
+    # idempotency
+    "IdempotencyLedger": "idempotency",
+    "IdempotentWriter": "idempotency",
+    "LedgerEntry": "idempotency",
+    "idempotency_key": "idempotency",
+    # intervals
+    "BookingIntervalIndex": "intervals",
+    # loaders
+    "DataLoader": "loaders",
+    "LoaderStats": "loaders",
+    "fetch_by_ids": "loaders",
+    "member_loader": "loaders",
+    "resource_loader": "loaders",
+    # loadtest
+    "FakeORNDServer": "loadtest",
+    "LoadReport": "loadtest",
+    "StageResult": "loadtest",
+    "run_load": "loadtest",
+    # mutations
+    "MutationEvent": "mutations",
+    "MutationPublisher": "mutations",
+    # queries
+    "ORNDResourceQuery": "queries",
+    "ORNDCompanyQuery": "queries",
+    "ORNDMemberQuery": "queries",
+    "append_queries_to_url": "queries",
+    # quotes
+    "QuoteCache": "quotes",
+    "QuoteStats": "quotes",
+    "quote_key": "quotes",
+    # ratelimit
+    "RateLimiter": "ratelimit",
+    # recurrence
+    "RecurrenceRule": "recurrence",
+    "RecurringSeries": "recurrence",
+    "SeriesCache": "recurrence",
+    "compile_series": "recurrence",
+    "parse_rrule": "recurrence",
+    # reqs
+    "CreateORNDMemberRequest": "reqs",
+    "CreateORNDTeamMemberRequest": "reqs",
+    "CreateORNDWebBookingRequest": "reqs",
+    "CreateORNDMemberBookingRequest": "reqs",
+    "CreateORNDTeamBookingRequest": "reqs",
+    "RetrieveORNDBookingOccurencesRequest": "reqs",
+    "resource_lookup": "reqs",
+    "validate_requests": "reqs",
+    # resilience
+    "CircuitBreaker": "resilience",
+    "CircuitBreakers": "resilience",
+    # schema
+    "ORNDAuth": "schema",
+    "ORNDMember": "schema",
+    "ORNDOffice": "schema",
+    "ORNDResource": "schema",
+    "ORNDResourceType": "schema",
+    "ORNDBookingDateTime": "schema",
+    "ORNDBooking": "schema",
+    # serialization
+    "Serializer": "serialization",
+    "get_serializer": "serialization",
+    # streams
+    "fan_out": "streams",
+    "iter_bookings": "streams",
+    "iter_members": "streams",
+    "iter_resources": "streams",
+    # tenants
+    "ClientRegistry": "tenants",
+    "TenantClient": "tenants",
+    "TokenCache": "tenants",
+    # warmup
+    "WarmupReport": "warmup",
+    # webhooks
+    "ORNDWebhookEvent": "webhooks",
+    "WebhookDispatcher": "webhooks",
+    "WebhookReceiver": "webhooks",
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    value = getattr(module, name)
+    globals()[name] = value  # cache so __getattr__ is only hit once per name
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | _SUBMODULES | set(_LAZY_ATTRIBUTES))
+
+
+if TYPE_CHECKING:
+    from officerndapilib.analytics import (
+        Occurrences,
+        load_occurrences,
+        booked_minutes,
+        utilization_heatmap,
+        peak_hour_histogram,
+        cancel_rates,
+    )
+    from officerndapilib.api import (
+        get_ornd_token,
+        get_all_resources,
+        get_resource_by_id,
+        get_all_members,
+        get_member_by_id,
+        get_member_by_email,
+        create_member,
+        delete_members,
+        get_all_bookings,
+        get_booking_times_available_on_date,
+        validate_booking_request,
+        create_booking,
+        validate_booking_creation,
+        delete_booking,
+        cancel_booking,
+        booking_checkout,
+        get_all_offices,
+        get_office_by_id,
+        request_ornd_token,
+    )
+    from officerndapilib.availability import (
+        AvailableSlot,
+        find_available_slots,
+    )
+    from officerndapilib.bulk import (
+        BulkReport,
+        bulk_cancel_bookings,
+        bulk_delete_members,
+    )
+    from officerndapilib.cache import (
+        MemoryCache,
+        RefreshScheduler,
+        SQLiteCache,
+        SWRCache,
+    )
+    from officerndapilib.calendars import (
+        OfficeCalendar,
+        calendar_for,
+        register_calendar,
+    )
+    from officerndapilib.cassettes import (
+        Cassette,
+        Interaction,
+        RecordingAdapter,
+        ReplayAdapter,
+        use_cassette,
+    )
+    from officerndapilib.changes import (
+        Change,
+        ChangeFeed,
+        ChangeSet,
+        record_hash,
+    )
+    from officerndapilib.client import (
+        ORND_BASE_URL,
+        ORNDClient,
+        get_client,
+        pooled_session,
+        set_metadata_cache,
+    )
+    from officerndapilib.exceptions import (
+        CircuitOpenException,
+        HttpException,
+        ValidationException,
+    )
+    from officerndapilib.idempotency import (
+        IdempotencyLedger,
+        IdempotentWriter,
+        LedgerEntry,
+        idempotency_key,
+    )
+    from officerndapilib.intervals import BookingIntervalIndex
+    from officerndapilib.loaders import (
+        DataLoader,
+        LoaderStats,
+        fetch_by_ids,
+        member_loader,
+        resource_loader,
+    )
+    from officerndapilib.loadtest import (
+        FakeORNDServer,
+        LoadReport,
+        StageResult,
+        run_load,
+    )
+    from officerndapilib.mutations import MutationEvent, MutationPublisher
+    from officerndapilib.queries import (
+        ORNDResourceQuery,
+        ORNDCompanyQuery,
+        ORNDMemberQuery,
+        append_queries_to_url,
+    )
+    from officerndapilib.quotes import QuoteCache, QuoteStats, quote_key
+    from officerndapilib.ratelimit import RateLimiter
+    from officerndapilib.recurrence import (
+        RecurrenceRule,
+        RecurringSeries,
+        SeriesCache,
+        compile_series,
+        parse_rrule,
+    )
+    from officerndapilib.reqs import (
+        CreateORNDMemberRequest,
+        CreateORNDTeamMemberRequest,
+        CreateORNDWebBookingRequest,
+        CreateORNDMemberBookingRequest,
+        CreateORNDTeamBookingRequest,
+        RetrieveORNDBookingOccurencesRequest,
+        resource_lookup,
+        validate_requests,
+    )
+    from officerndapilib.resilience import CircuitBreaker, CircuitBreakers
+    from officerndapilib.schema import (
+        ORNDAuth,
+        ORNDMember,
+        ORNDOffice,
+        ORNDResource,
+        ORNDResourceType,
+        ORNDBookingDateTime,
+        ORNDBooking,
+    )
+    from officerndapilib.serialization import Serializer, get_serializer
+    from officerndapilib.streams import (
+        fan_out,
+        iter_bookings,
+        iter_members,
+        iter_resources,
+    )
+    from officerndapilib.tenants import (
+        ClientRegistry,
+        TenantClient,
+        TokenCache,
+    )
+    from officerndapilib.warmup import WarmupReport
+    from officerndapilib.webhooks import (
+        ORNDWebhookEvent,
+        WebhookDispatcher,
+        WebhookReceiver,
+    )
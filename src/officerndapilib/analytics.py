@@ -0,0 +1,224 @@
+from datetime import datetime
+from typing import Iterable, Optional, Union
+
+from attrs import define
+
+from officerndapilib.dates import to_timestamp
+from officerndapilib.schema import ORNDBooking
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+# ANALYTICS
+
+HOURS_PER_WEEK = 168
+EPOCH_WEEKDAY = 3  # 1970-01-01 was a Thursday (Monday = 0)
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError(
+            "officerndapilib.analytics requires numpy, "
+            "install it with 'pip install officerndapilib[analytics]'"
+        )
+
+
+@define
+class Occurrences:
+    """Booking occurrences as parallel NumPy arrays.
+
+    ``start``/``end`` are epoch minutes (UTC) and ``resource`` indexes into
+    ``resource_ids``.
+    """
+
+    resource_ids: list[str]
+    resource: "np.ndarray"
+    start: "np.ndarray"
+    end: "np.ndarray"
+    canceled: "np.ndarray"
+
+    def __len__(self):
+        return len(self.start)
+
+    def clip(self, start: int, end: int) -> "Occurrences":
+        """Occurrences overlapping [start, end) epoch minutes, cut to it"""
+        keep = (self.start < end) & (self.end > start)
+        return Occurrences(
+            resource_ids=self.resource_ids,
+            resource=self.resource[keep],
+            start=np.maximum(self.start[keep], start),
+            end=np.minimum(self.end[keep], end),
+            canceled=self.canceled[keep],
+        )
+
+
+def days_from_civil(
+    year: "np.ndarray", month: "np.ndarray", day: "np.ndarray"
+) -> "np.ndarray":
+    """Days since 1970-01-01 for proleptic Gregorian dates (vectorized)"""
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    day_of_era = (
+        year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    )
+    return era * 146097 + day_of_era - 719468
+
+
+def parse_epoch_minutes(values: list[str]) -> "np.ndarray":
+    """Parses ISO 8601 datetimes to epoch minutes.
+
+    UTC strings (``YYYY-MM-DDTHH:MM...Z``), which is what the API returns,
+    are decoded straight from their digits in one vectorized pass; anything
+    else falls back to per-value parsing.
+    """
+    require_numpy()
+    try:
+        raw = np.array(values, dtype="S")
+    except UnicodeEncodeError:
+        raw = np.array([], dtype="S")
+    if len(raw) and raw.itemsize >= 16:
+        chars = raw.view(np.uint8).reshape(len(raw), raw.itemsize)
+        separators = chars[:, [4, 7, 10, 13]]
+        if (separators == np.frombuffer(b"--T:", np.uint8)).all() and (
+            np.char.endswith(raw, b"Z").all()
+        ):
+            d = chars[:, :16].astype(np.int64) - ord("0")
+            days = days_from_civil(
+                d[:, 0] * 1000 + d[:, 1] * 100 + d[:, 2] * 10 + d[:, 3],
+                d[:, 5] * 10 + d[:, 6],
+                d[:, 8] * 10 + d[:, 9],
+            )
+            hours = d[:, 11] * 10 + d[:, 12]
+            return (days * 24 + hours) * 60 + d[:, 14] * 10 + d[:, 15]
+    return np.array([to_timestamp(v) // 60 for v in values], dtype=np.int64)
+
+
+def load_occurrences(bookings: Iterable[ORNDBooking]) -> Occurrences:
+    """Loads ``get_all_bookings`` occurrences into arrays"""
+    require_numpy()
+    bookings = list(bookings)
+    keys = [b["resourceId"] for b in bookings]
+    resource_ids = list(dict.fromkeys(keys))
+    index = {_id: i for i, _id in enumerate(resource_ids)}
+    return Occurrences(
+        resource_ids=resource_ids,
+        resource=np.fromiter(
+            map(index.__getitem__, keys), dtype=np.int32, count=len(keys)
+        ),
+        start=parse_epoch_minutes([b["start"]["dateTime"] for b in bookings]),
+        end=parse_epoch_minutes([b["end"]["dateTime"] for b in bookings]),
+        canceled=np.fromiter(
+            (b.get("canceled", False) for b in bookings),
+            dtype=bool,
+            count=len(bookings),
+        ),
+    )
+
+
+def hour_of_week(hours: "np.ndarray") -> "np.ndarray":
+    """Maps epoch hours to hour-of-week, Monday 00:00 = 0"""
+    weekday = (hours // 24 + EPOCH_WEEKDAY) % 7
+    return weekday * 24 + hours % 24
+
+
+def booked_minutes(
+    occurrences: Occurrences, utc_offset: int = 0
+) -> "np.ndarray":
+    """Booked minutes per resource and hour-of-week, shape (resources, 168)
+
+    Each occurrence is split at hour boundaries so a 09:30-11:15 booking adds
+    30, 60 and 15 minutes to three slots. Canceled occurrences are ignored.
+    ``utc_offset`` (minutes) shifts slots to office-local time.
+    """
+    require_numpy()
+    keep = ~occurrences.canceled & (occurrences.end > occurrences.start)
+    start = occurrences.start[keep] + utc_offset
+    end = occurrences.end[keep] + utc_offset
+    resource = occurrences.resource[keep]
+
+    first_hour = start // 60
+    spans = (end - 1) // 60 - first_hour + 1
+    row = np.repeat(np.arange(len(start)), spans)
+    # position of each exploded slot within its occurrence
+    offsets = np.arange(len(row)) - np.repeat(np.cumsum(spans) - spans, spans)
+    hours = first_hour[row] + offsets
+    minutes = np.minimum(end[row], (hours + 1) * 60) - np.maximum(
+        start[row], hours * 60
+    )
+    slots = resource[row].astype(np.int64) * HOURS_PER_WEEK + hour_of_week(
+        hours
+    )
+    totals = np.bincount(
+        slots,
+        weights=minutes,
+        minlength=len(occurrences.resource_ids) * HOURS_PER_WEEK,
+    )
+    return totals.reshape(len(occurrences.resource_ids), HOURS_PER_WEEK)
+
+
+def open_hours_mask(
+    opens: int = 9, closes: int = 18, weekdays: Iterable[int] = range(5)
+) -> "np.ndarray":
+    """Boolean (168,) mask of open hours-of-week"""
+    require_numpy()
+    mask = np.zeros(HOURS_PER_WEEK, dtype=bool)
+    for day in weekdays:
+        mask[day * 24 + opens : day * 24 + closes] = True
+    return mask
+
+
+def utilization_heatmap(
+    occurrences: Occurrences,
+    start: Union[str, datetime],
+    end: Union[str, datetime],
+    open_mask: Optional["np.ndarray"] = None,
+    utc_offset: int = 0,
+) -> "np.ndarray":
+    """Booked / open minutes per resource and hour-of-week over a range
+
+    Only the part of each occurrence inside [start, end) counts. Closed
+    slots are NaN. Shape is (resources, 168), rows ordered as
+    ``occurrences.resource_ids``.
+    """
+    require_numpy()
+    if open_mask is None:
+        open_mask = open_hours_mask()
+    start_minute = to_timestamp(start) // 60
+    end_minute = to_timestamp(end) // 60
+    first = (start_minute + utc_offset) // 60
+    last = (end_minute + utc_offset) // 60
+    hour_counts = np.bincount(
+        hour_of_week(np.arange(first, last, dtype=np.int64)),
+        minlength=HOURS_PER_WEEK,
+    )
+    open_minutes = np.where(open_mask, hour_counts * 60, 0).astype(float)
+    in_range = occurrences.clip(start_minute, end_minute)
+    booked = booked_minutes(in_range, utc_offset)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        utilization = booked / open_minutes
+    utilization[:, open_minutes == 0] = np.nan
+    return utilization
+
+
+def peak_hour_histogram(
+    occurrences: Occurrences, utc_offset: int = 0
+) -> "np.ndarray":
+    """Booked minutes per hour of day (24,) across all resources"""
+    weekly = booked_minutes(occurrences, utc_offset).sum(axis=0)
+    return weekly.reshape(7, 24).sum(axis=0)
+
+
+def cancel_rates(occurrences: Occurrences) -> "np.ndarray":
+    """Share of canceled occurrences per resource (NaN if none)"""
+    require_numpy()
+    n = len(occurrences.resource_ids)
+    total = np.bincount(occurrences.resource, minlength=n)
+    canceled = np.bincount(
+        occurrences.resource, weights=occurrences.canceled, minlength=n
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return canceled / total
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import requests
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Optional
+
+from officerndapilib.calendars import OfficeCalendar
+from officerndapilib.client import ORND_BASE_URL, get_client
+from officerndapilib.intervals import ResourceIntervals
+from officerndapilib.schema import (
+    ORNDAuth,
+    ORNDMember,
+    ORNDOffice,
+    ORNDResource,
+    ORNDResourceType,
+    ORNDBookingDateTime,
+    ORNDBooking,
+)
+
+from officerndapilib.queries import ORNDResourceQuery
+
+if TYPE_CHECKING:
+    from officerndapilib.intervals import BookingIntervalIndex
+    from officerndapilib.reqs import (
+        CreateORNDMemberRequest,
+        CreateORNDMemberBookingRequest,
+        RetrieveORNDBookingOccurencesRequest,
+    )
+
+# Each function below delegates to a shared ORNDClient for the token and
+# organization, which reuses its session, URL templates and headers.
+
+# AUTH
+
+
+def request_ornd_token(auth: ORNDAuth) -> dict[str, Any]:
+    """Requests an access token, returning the whole token response"""
+    url = "https://identity.officernd.com/oauth/token"
+    headers = {
+        "accept": "application/json",
+        "content-type": "application/x-www-form-urlencoded",
+    }
+    body = {
+        "client_id": auth["client_id"],
+        "client_secret": auth["client_secret"],
+        "grant_type": auth["grant_type"],
+        "scope": auth["scope"],
+    }
+    response = requests.post(url, headers=headers, data=body)
+    if response.ok:
+        return response.json()
+    else:
+        raise Exception("Unable to authorize request")
+
+
+def get_ornd_token(auth: ORNDAuth) -> str:
+    return request_ornd_token(auth)["access_token"]
+
+
+# OFFICES
+
+
+def get_all_offices(
+    token: str, organization: str, fields: Optional[list[str]] = None
+) -> list[ORNDOffice]:
+    """Retrieves all office locations from OfficeRND API"""
+    return get_client(token, organization).get_all_offices(fields)
+
+
+def get_office_by_id(
+    token: str, organization: str, id: str, fields: Optional[list[str]] = None
+) -> ORNDOffice:
+    """Retrieves a specific office location by ID from OfficeRND API"""
+    return get_client(token, organization).get_office_by_id(id, fields)
+
+
+# RESOURCES
+
+
+def get_all_resources(
+    token: str,
+    organization: str,
+    office: str,
+    type: ORNDResourceType,
+    queries: list[ORNDResourceQuery] = [],
+    fields: Optional[list[str]] = None,
+) -> list[ORNDResource]:
+    """Retrieves resources for a given office location from OfficeRND API"""
+    return get_client(token, organization).get_all_resources(
+        office, type, queries, fields
+    )
+
+
+def get_resource_by_id(
+    organization: str, id: str, fields: Optional[list[str]] = None
+) -> ORNDResource:
+    """Retrieves a specific resource by ID from OfficeRND API"""
+    return get_client(None, organization).get_resource_by_id(id, fields)
+
+
+# MEMBERS
+
+
+def get_all_members(
+    token: str,
+    organization: str,
+    office: str,
+    fields: Optional[list[str]] = None,
+) -> list[ORNDMember]:
+    """Retrieves all members from OfficeRND API"""
+    return get_client(token, organization).get_all_members(office, fields)
+
+
+def get_member_by_id(
+    token: str, organization: str, id: str, fields: Optional[list[str]] = None
+) -> ORNDMember:
+    """Retrieves a specific member by ID from OfficeRND API"""
+    return get_client(token, organization).get_member_by_id(id, fields)
+
+
+def get_member_by_email(
+    token: str, organization: str, office: str, email: str
+) -> ORNDMember:
+    """Retrieves a specific member by email from OfficeRND API"""
+    return get_client(token, organization).get_member_by_email(office, email)
+
+
+def create_member(
+    token: str, organization: str, member_request: CreateORNDMemberRequest
+) -> list[ORNDMember]:
+    """Creates a member in OfficeRND"""
+    return get_client(token, organization).create_member(member_request)
+
+
+def delete_members(
+    token: str, organization: str, ids: list[str]
+) -> list[ORNDMember]:
+    """Deletes a member in OfficeRND"""
+    return get_client(token, organization).delete_members(ids)
+
+
+# BOOKINGS
+
+
+def get_all_bookings(
+    token: str,
+    organization: str,
+    booking_occurence: RetrieveORNDBookingOccurencesRequest,
+    fields: Optional[list[str]] = None,
+) -> list[ORNDBooking]:
+    """Retrieves all bookings from OfficeRND API"""
+    return get_client(token, organization).get_all_bookings(
+        booking_occurence, fields
+    )
+
+
+def get_booking_times_available_on_date(
+    booking_times: list[dict[str, ORNDBookingDateTime]],
+    date: str,
+    start=9,
+    end=17,
+    interval=60,
+    calendar: Optional[OfficeCalendar] = None,
+) -> list[str]:
+    """Returns a list of times available for booking on a given date
+
+    With a ``calendar`` the times span the office's opening window that day
+    in its timezone (none when closed), instead of ``start`` to ``end`` in
+    the bookings' own offsets.
+    """
+    if calendar is not None:
+        busy = ResourceIntervals()
+        for i, booking in enumerate(booking_times):
+            busy.add(
+                str(i),
+                calendar.timestamp(booking["start"]["dateTime"]),
+                calendar.timestamp(booking["end"]["dateTime"]),
+            )
+        return calendar.free_slot_times(
+            datetime.fromisoformat(date).date(), busy.busy(), interval * 60
+        )
+
+    # array of times from start to end in min intervals
+    times = [
+        f"{hour:02d}:{min:02d}"
+        for hour in range(start, end)
+        for min in range(0, 60, interval)
+    ]
+
+    # filter the times to only include times that are on the date
+    booking_times = [
+        booking_time
+        for booking_time in booking_times
+        if booking_time["start"]["dateTime"].split("T")[0] == date
+    ]
+
+    # filter the times that are already booked between the start[dateTime] and end[dateTime]
+    booked_intervals = []
+    for booking in booking_times:
+        # round down to the nearest min interval
+        start_dt = datetime.fromisoformat(booking["start"]["dateTime"])
+        if start_dt.minute % interval != 0:
+            start_dt = start_dt - timedelta(minutes=start_dt.minute % interval)
+
+        # round up to the nearest min interval
+        end_dt = datetime.fromisoformat(booking["end"]["dateTime"])
+        if end_dt.minute % interval != 0:
+            end_dt = end_dt + timedelta(
+                minutes=interval - end_dt.minute % interval
+            )
+
+        duration_min_intervals = (end_dt - start_dt).seconds / (60 * interval)
+
+        booked_intervals.append(start_dt.strftime("%H:%M"))
+        for _ in range(int(duration_min_intervals) - 1):
+            start_dt += timedelta(minutes=interval)
+            booked_intervals.append(start_dt.strftime("%H:%M"))
+
+    # remove booked intervals from available times
+    times = [time for time in times if time not in booked_intervals]
+
+    # return list of hours that are available
+    return times
+
+
+def validate_booking_request(
+    token: str,
+    organization: str,
+    booking_request: CreateORNDMemberBookingRequest,
+) -> list[ORNDBooking]:
+    """Validates a booking request"""
+    return get_client(token, organization).validate_booking_request(
+        booking_request
+    )
+
+
+def create_booking(
+    token: str,
+    organization: str,
+    booking_request: CreateORNDMemberBookingRequest,
+) -> list[ORNDBooking]:
+    """Creates a booking in OfficeRND"""
+    return get_client(token, organization).create_booking(booking_request)
+
+
+def validate_booking_creation(
+    token: str,
+    organization: str,
+    booking_request: CreateORNDMemberBookingRequest,
+) -> list[ORNDBooking]:
+    """Validates a booking request made has been created in OfficeRND"""
+    return get_client(token, organization).validate_booking_creation(
+        booking_request
+    )
+
+
+def delete_booking(
+    token: str,
+    organization: str,
+    booking_id: str,
+    index: Optional[BookingIntervalIndex] = None,
+):
+    """Deletes a booking in OfficeRND, removing it from ``index`` if given"""
+    return get_client(token, organization).delete_booking(booking_id, index)
+
+
+def cancel_booking(
+    token: str,
+    organization: str,
+    booking_id: str,
+    silent=False,
+    skip_fee=False,
+    index: Optional[BookingIntervalIndex] = None,
+) -> ORNDBooking:
+    """Cancels a booking in OfficeRND, removing it from ``index`` if given"""
+    return get_client(token, organization).cancel_booking(
+        booking_id, silent, skip_fee, index
+    )
+
+
+def booking_checkout(
+    token: str,
+    organization: str,
+    booking_request: CreateORNDMemberBookingRequest,
+    index: Optional[BookingIntervalIndex] = None,
+):
+    """Validates and creates a booking in OfficeRND
+
+    If an ``index`` of existing occurrences is given, requests that clash with
+    it are rejected before any network call and the created booking is added.
+    """
+    return get_client(token, organization).booking_checkout(
+        booking_request, index
+    )
@@ -0,0 +1,140 @@
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone, tzinfo
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from attrs import define
+
+from officerndapilib.api import get_all_bookings, get_all_resources
+from officerndapilib.calendars import calendar_for
+from officerndapilib.dates import to_timestamp
+from officerndapilib.intervals import BookingIntervalIndex, free_intervals
+from officerndapilib.recurrence import SeriesCache
+from officerndapilib.reqs import RetrieveORNDBookingOccurencesRequest
+from officerndapilib.schema import ORNDResource, ORNDResourceType
+
+# AVAILABILITY
+
+
+@define(frozen=True)
+class AvailableSlot:
+    resource: ORNDResource
+    start: datetime
+    end: datetime
+
+
+def resource_matches(
+    resource: ORNDResource,
+    amenities: Iterable[str] = (),
+    size: Optional[int] = None,
+) -> bool:
+    """Checks a resource has every amenity and at least ``size`` capacity"""
+    if size is not None and resource.get("size", 0) < size:
+        return False
+    return set(amenities).issubset(resource.get("amenities", []))
+
+
+def iter_slot_starts(
+    gaps: Iterable[tuple[int, int]], window_start: int, duration: int, step: int
+) -> Iterator[int]:
+    """Yields step-aligned start times whose slot fits inside a free gap"""
+    for gap_start, gap_end in gaps:
+        offset = -(-(gap_start - window_start) // step) * step  # round up
+        slot_start = window_start + offset
+        while slot_start + duration <= gap_end:
+            yield slot_start
+            slot_start += step
+
+
+def find_available_slots(
+    token: str,
+    organization: str,
+    office: str,
+    type: ORNDResourceType,
+    duration: timedelta,
+    window_start: datetime,
+    window_end: datetime,
+    amenities: Iterable[str] = (),
+    size: Optional[int] = None,
+    limit: int = 5,
+    step: timedelta = timedelta(minutes=15),
+    index: Optional[BookingIntervalIndex] = None,
+    max_workers: int = 8,
+    series: Optional[SeriesCache] = None,
+) -> list[AvailableSlot]:
+    """Returns the earliest ``limit`` free (resource, start) pairs in a window
+
+    Resources are filtered by amenities and size before any occurrences are
+    fetched, then one occurrences request per remaining resource is made
+    concurrently. Fetched occurrences are added to ``index`` if given.
+
+    Recurring series in ``series`` are expanded locally into the index, e.g.
+    series known from webhooks that the occurrences request has not caught
+    up with yet. A naive window and naive booking times are read in each
+    resource's timezone, as the booking validations read them.
+    """
+    resources = [
+        resource
+        for resource in get_all_resources(token, organization, office, type)
+        if resource_matches(resource, amenities, size)
+    ]
+    if not resources or limit <= 0:
+        return []
+
+    index = index if index is not None else BookingIntervalIndex()
+    first_day = window_start.strftime("%Y-%m-%d")
+    last_day = (window_end + timedelta(days=1)).strftime("%Y-%m-%d")
+
+    def fetch(resource: ORNDResource):
+        request = RetrieveORNDBookingOccurencesRequest(
+            office=office,
+            resource_id=resource["_id"],
+            start=first_day,
+            end=last_day,
+        )
+        return get_all_bookings(token, organization, request)
+
+    zones = [
+        calendar_for(office, resource.get("timezone")).zone
+        for resource in resources
+    ]
+    workers = min(max_workers, len(resources))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for bookings, zone in zip(pool.map(fetch, resources), zones):
+            index.add_all(bookings, zone)
+    if series is not None:
+        for resource, zone in zip(resources, zones):
+            series.expand_into(
+                index, window_start, window_end, resource["_id"], zone
+            )
+
+    seconds = int(duration.total_seconds())
+    step_seconds = int(step.total_seconds())
+
+    def slot_starts(resource: ORNDResource, zone: tzinfo) -> Iterator[int]:
+        start_ts = to_timestamp(window_start, zone)
+        end_ts = to_timestamp(window_end, zone)
+        busy = index.busy_intervals(resource["_id"])
+        return iter_slot_starts(
+            free_intervals(busy, start_ts, end_ts),
+            start_ts,
+            seconds,
+            step_seconds,
+        )
+
+    # merge each resource's ascending start times, earliest first
+    candidates = heapq.merge(
+        *(
+            ((slot_start, i) for slot_start in slot_starts(resource, zone))
+            for i, (resource, zone) in enumerate(zip(resources, zones))
+        )
+    )
+    return [
+        AvailableSlot(
+            resource=resources[i],
+            start=datetime.fromtimestamp(slot_start, timezone.utc),
+            end=datetime.fromtimestamp(slot_start + seconds, timezone.utc),
+        )
+        for slot_start, i in islice(candidates, limit)
+    ]
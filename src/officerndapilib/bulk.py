@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
+
+import requests
+from attrs import asdict, define, field
+
+from officerndapilib.client import ORNDClient
+from officerndapilib.exceptions import HttpException
+
+if TYPE_CHECKING:
+    from officerndapilib.intervals import BookingIntervalIndex
+
+# BULK OPERATIONS
+
+# IDs per DELETE /members body, well below typical request body limits
+MEMBER_DELETE_CHUNK_SIZE = 100
+
+BULK_ERRORS = (HttpException, requests.RequestException)
+
+# called with (IDs done, IDs requested) as a bulk operation progresses
+Progress = Callable[[int, int], None]
+
+
+@define
+class BulkReport:
+    """Per-ID outcome of a bulk operation.
+
+    Pass a report back into the bulk function that produced it to resume:
+    IDs that already succeeded are skipped, failed and pending IDs are retried.
+    """
+
+    succeeded: dict[str, Any] = field(factory=dict)
+    failed: dict[str, str] = field(factory=dict)
+    requested: list[str] = field(factory=list)
+
+    @property
+    def pending(self) -> list[str]:
+        """IDs of the last run that have neither succeeded nor failed"""
+        return [
+            _id
+            for _id in self.requested
+            if _id not in self.succeeded and _id not in self.failed
+        ]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and not self.pending
+
+    def start(self, ids: Iterable[str]) -> list[str]:
+        """Requests the IDs not yet succeeded and returns them"""
+        todo = list(dict.fromkeys(i for i in ids if i not in self.succeeded))
+        for _id in todo:
+            self.failed.pop(_id, None)
+        self.requested = todo
+        return todo
+
+    def succeed(self, _id: str, result: Any = None):
+        self.succeeded[_id] = result
+
+    def fail(self, _id: str, error: Exception):
+        self.failed[_id] = str(error)
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(asdict(self), f)
+
+    @classmethod
+    def load(cls, path: str) -> BulkReport:
+        with open(path) as f:
+            return cls(**json.load(f))
+
+
+def chunked(ids: list[str], size: int) -> list[list[str]]:
+    return [ids[i : i + size] for i in range(0, len(ids), size)]
+
+
+def bulk_delete_members(
+    client: ORNDClient,
+    ids: Iterable[str],
+    chunk_size: int = MEMBER_DELETE_CHUNK_SIZE,
+    max_workers: int = 4,
+    report: Optional[BulkReport] = None,
+    progress: Optional[Progress] = None,
+) -> BulkReport:
+    """Deletes members in concurrent chunks under the client's rate limiter
+
+    An ID is only reported as succeeded once the API returns it as deleted.
+    """
+    report = report if report is not None else BulkReport()
+    todo = report.start(ids)
+    chunks = chunked(todo, chunk_size)
+    if not chunks:
+        return report
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(client.delete_members, chunk): chunk
+            for chunk in chunks
+        }
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                deleted = {member["_id"]: member for member in future.result()}
+            except BULK_ERRORS as e:
+                for _id in chunk:
+                    report.fail(_id, e)
+            else:
+                for _id in chunk:
+                    if _id in deleted:
+                        report.succeed(_id, deleted[_id])
+                    else:
+                        error = HttpException("Member was not deleted")
+                        report.fail(_id, error)
+            if progress is not None:
+                done += len(chunk)
+                progress(done, len(todo))
+    return report
+
+
+def bulk_cancel_bookings(
+    client: ORNDClient,
+    booking_ids: Iterable[str],
+    silent=False,
+    skip_fee=False,
+    max_workers: int = 8,
+    report: Optional[BulkReport] = None,
+    index: Optional[BookingIntervalIndex] = None,
+    progress: Optional[Progress] = None,
+) -> BulkReport:
+    """Cancels bookings concurrently under the client's rate limiter"""
+    report = report if report is not None else BulkReport()
+    todo = report.start(booking_ids)
+    if not todo:
+        return report
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(
+                client.cancel_booking, _id, silent, skip_fee, index
+            ): _id
+            for _id in todo
+        }
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                _id = futures[future]
+                try:
+                    report.succeed(_id, future.result())
+                except BULK_ERRORS as e:
+                    report.fail(_id, e)
+                if progress is not None:
+                    progress(done, len(todo))
+        except BaseException:
+            # interrupted: leave the queued IDs pending in the report
+            for future in futures:
+                future.cancel()
+            raise
+    return report
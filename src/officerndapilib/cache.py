@@ -0,0 +1,374 @@
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import MutableMapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Optional
+
+from attrs import define
+
+from officerndapilib.serialization import Serializer, get_serializer
+
+# CACHES
+
+Entry = tuple[Any, float]  # (value, stored at epoch seconds)
+
+
+class SWRCache(MutableMapping, ABC):
+    """TTL cache serving stale entries while they are refreshed.
+
+    ``get_or_load`` returns fresh entries directly, returns stale entries
+    immediately while refreshing them on a bounded background pool (at most
+    one refresh per key), and only blocks on the loader for missing keys;
+    concurrent readers of a missing key share one load.
+
+    It is also a plain mapping, so it can be used as a client ``stale_cache``.
+    """
+
+    def __init__(self, ttl: float = 3600.0, max_refresh_workers: int = 4):
+        self.ttl = ttl
+        self.scheduler: Optional[RefreshScheduler] = None
+        self._refreshing: dict[str, Future] = {}
+        self._loading: dict[str, Future] = {}
+        self._refresh_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_refresh_workers,
+            thread_name_prefix="ornd-cache-refresh",
+        )
+
+    # storage, implemented by subclasses
+
+    @abstractmethod
+    def read(self, key: str) -> Optional[Entry]: ...
+
+    @abstractmethod
+    def write(self, key: str, value: Any, stored_at: float): ...
+
+    @abstractmethod
+    def delete(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def keys(self): ...  # type: ignore[override]
+
+    def stored_at(self, key: str) -> Optional[float]:
+        entry = self.read(key)
+        return entry[1] if entry is not None else None
+
+    # mapping interface
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self.read(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry[0]
+
+    def __setitem__(self, key: str, value: Any):
+        self.write(key, value, time.time())
+
+    def __delitem__(self, key: str):
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.keys()))
+
+    def __len__(self) -> int:
+        return len(list(self.keys()))
+
+    # stale-while-revalidate
+
+    def is_stale(self, stored_at: float) -> bool:
+        return time.time() - stored_at > self.ttl
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        if self.scheduler is not None:
+            self.scheduler.touch(key, loader)
+        entry = self.read(key)
+        if entry is None:
+            return self._load(key, loader)
+        value, stored_at = entry
+        if self.is_stale(stored_at):
+            self.refresh(key, loader)
+        return value
+
+    def refresh(self, key: str, loader: Callable[[], Any]) -> Future:
+        """Reloads a key in the background unless a refresh is running"""
+        with self._refresh_lock:
+            future = self._refreshing.get(key)
+            if future is None:
+                future = self._pool.submit(self._reload, key, loader)
+                self._refreshing[key] = future
+            return future
+
+    def _load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Loads a missing key, or waits for the load already running"""
+        with self._refresh_lock:
+            future = self._loading.get(key)
+            if future is None:
+                entry = self.read(key)  # stored by a load that just ended
+                if entry is not None:
+                    return entry[0]
+                future = self._loading[key] = Future()
+                loading = True
+            else:
+                loading = False
+        if not loading:
+            return future.result()
+        try:
+            value = loader()
+            self[key] = value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._refresh_lock:
+                self._loading.pop(key, None)
+
+    def _reload(self, key: str, loader: Callable[[], Any]):
+        try:
+            value = loader()
+            self[key] = value
+            return value
+        finally:  # a failed refresh keeps serving the stale value
+            with self._refresh_lock:
+                self._refreshing.pop(key, None)
+
+    def close(self):
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        self._pool.shutdown(wait=True)
+
+
+class MemoryCache(SWRCache):
+    """In-process stale-while-revalidate cache"""
+
+    def __init__(self, ttl: float = 3600.0, max_refresh_workers: int = 4):
+        super().__init__(ttl, max_refresh_workers)
+        self._entries: dict[str, Entry] = {}
+
+    def read(self, key: str) -> Optional[Entry]:
+        return self._entries.get(key)
+
+    def write(self, key: str, value: Any, stored_at: float):
+        self._entries[key] = (value, stored_at)
+
+    def delete(self, key: str) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def keys(self):
+        return list(self._entries)
+
+
+class SQLiteCache(SWRCache):
+    """Stale-while-revalidate cache persisted to a SQLite file.
+
+    Entries survive restarts. With ``revalidate_on_start`` every entry
+    written by an earlier process is treated as stale, so after a deploy it
+    is served immediately and refreshed in the background once, instead of
+    all workers reloading it from the API at the same time.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 3600.0,
+        max_refresh_workers: int = 4,
+        revalidate_on_start: bool = True,
+        serializer: Optional[Serializer] = None,
+    ):
+        super().__init__(ttl, max_refresh_workers)
+        self.path = path
+        self.serializer = serializer or get_serializer()
+        self.started_at = time.time() if revalidate_on_start else 0.0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB, stored_at REAL)"
+            )
+
+    def is_stale(self, stored_at: float) -> bool:
+        return stored_at < self.started_at or super().is_stale(stored_at)
+
+    def read(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, stored_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return self.serializer.loads(row[0]), row[1]
+
+    def write(self, key: str, value: Any, stored_at: float):
+        blob = self.serializer.dumps(value)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                (key, blob, stored_at),
+            )
+
+    def delete(self, key: str) -> bool:
+        with self._lock, self._db:
+            cursor = self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def keys(self):
+        with self._lock:
+            rows = self._db.execute("SELECT key FROM cache").fetchall()
+        return [row[0] for row in rows]
+
+    def stored_at(self, key: str) -> Optional[float]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT stored_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def close(self):
+        super().close()
+        with self._lock:
+            self._db.close()
+
+
+@define
+class KeyActivity:
+    loader: Callable[[], Any]
+    hits: float = 0.0  # accesses, halved every tick
+    last_access: float = 0.0
+
+
+@define
+class TickResult:
+    refreshed: list[str]
+    evicted: list[str]
+
+
+class RefreshScheduler:
+    """Refreshes hot keys of an SWRCache before they expire.
+
+    Once attached, every ``get_or_load`` on the cache counts as an access,
+    e.g. the client's ``metadata_cache`` reads of resources. Every
+    ``interval`` seconds a daemon thread refreshes, hottest first, the keys
+    with at least ``min_hits`` recent accesses that are older than
+    ``refresh_ahead`` of the TTL, so readers rarely see an expired entry.
+    At most ``max_refreshes`` run at a time on the cache's refresh pool,
+    which keeps serving the old value meanwhile. Keys not read for
+    ``cold_after`` seconds (twice the TTL by default) are evicted.
+
+        cache = MemoryCache(ttl=300)
+        RefreshScheduler(cache).start()
+        client = ORNDClient(token, organization, metadata_cache=cache)
+    """
+
+    def __init__(
+        self,
+        cache: SWRCache,
+        interval: Optional[float] = None,
+        refresh_ahead: float = 0.8,
+        min_hits: float = 2.0,
+        cold_after: Optional[float] = None,
+        max_refreshes: int = 2,
+    ):
+        self.cache = cache
+        self.interval = interval or max(cache.ttl / 10, 0.1)
+        self.refresh_ahead = refresh_ahead
+        self.min_hits = min_hits
+        self.cold_after = cold_after or 2 * cache.ttl
+        self.max_refreshes = max_refreshes
+        self._keys: dict[str, KeyActivity] = {}
+        self._in_flight: set[Future] = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        cache.scheduler = self
+
+    def touch(self, key: str, loader: Callable[[], Any]):
+        """Records an access to ``key``, remembering how to reload it"""
+        now = time.time()
+        with self._lock:
+            activity = self._keys.get(key)
+            if activity is None:
+                activity = self._keys[key] = KeyActivity(loader)
+            activity.loader = loader
+            activity.hits += 1
+            activity.last_access = now
+
+    def hits(self, key: str) -> float:
+        with self._lock:
+            activity = self._keys.get(key)
+            return activity.hits if activity is not None else 0.0
+
+    def tick(self) -> TickResult:
+        """Runs one refresh and eviction pass"""
+        now = time.time()
+        result = TickResult([], [])
+        with self._lock:
+            self._in_flight = {f for f in self._in_flight if not f.done()}
+            slots = self.max_refreshes - len(self._in_flight)
+            cold = [
+                key
+                for key, activity in self._keys.items()
+                if now - activity.last_access > self.cold_after
+            ]
+            for key in cold:
+                del self._keys[key]
+            hot = sorted(
+                (
+                    (activity.hits, key, activity.loader)
+                    for key, activity in self._keys.items()
+                    if activity.hits >= self.min_hits
+                ),
+                key=lambda item: item[0],
+                reverse=True,
+            )
+            for activity in self._keys.values():
+                activity.hits /= 2
+        for key in cold:
+            self.cache.delete(key)
+            result.evicted.append(key)
+        for _, key, loader in hot:
+            if slots <= 0:
+                break
+            stored_at = self.cache.stored_at(key)
+            if stored_at is not None and not self.is_due(stored_at, now):
+                continue
+            future = self.cache.refresh(key, loader)
+            with self._lock:
+                self._in_flight.add(future)
+            result.refreshed.append(key)
+            slots -= 1
+        return result
+
+    def is_due(self, stored_at: float, now: float) -> bool:
+        return (
+            self.cache.is_stale(stored_at)
+            or now - stored_at >= self.cache.ttl * self.refresh_ahead
+        )
+
+    def start(self) -> "RefreshScheduler":
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="ornd-cache-scheduler", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.tick()
+            except Exception:  # keep scheduling; the cache serves stale
+                continue
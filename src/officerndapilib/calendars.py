@@ -0,0 +1,166 @@
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from officerndapilib.dates import to_timestamp
+from officerndapilib.intervals import Interval
+
+# CALENDARS
+
+OFFICE_OPENS = time(9, 0)
+OFFICE_CLOSES = time(18, 0)
+
+# weekday (Monday is 0) -> local (opens, closes)
+Hours = Mapping[int, tuple[time, time]]
+DEFAULT_HOURS: Hours = {
+    day: (OFFICE_OPENS, OFFICE_CLOSES) for day in range(5)
+}
+
+# days of opening windows precomputed from the calendar's start
+DEFAULT_HORIZON = 400
+
+
+class OfficeCalendar:
+    """Opening windows of an office in epoch seconds, DST included.
+
+    ``hours`` are local wall-clock times per weekday in ``timezone`` (the
+    ``timezone`` of an ORNDOffice or ORNDResource); days without hours and
+    ``holidays`` are closed. Local midnights and windows are precomputed for
+    ``horizon`` days from ``start`` (yesterday by default), so checks and
+    slot generation are bisects and list lookups; days outside the horizon
+    are computed on demand.
+    """
+
+    def __init__(
+        self,
+        timezone: str = "UTC",
+        hours: Optional[Hours] = None,
+        holidays: Iterable[date] = (),
+        start: Optional[date] = None,
+        horizon: int = DEFAULT_HORIZON,
+    ):
+        try:
+            self.zone = ZoneInfo(timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown timezone '{timezone}'")
+        self.timezone = timezone
+        self.hours = dict(DEFAULT_HOURS if hours is None else hours)
+        self.holidays = frozenset(holidays)
+        first = start or date.today() - timedelta(days=1)
+        self.first_day = first.toordinal()
+        days = [first + timedelta(days=i) for i in range(horizon + 1)]
+        self._midnights = [self._local(day, time()) for day in days]
+        self._windows = [self._compute(day) for day in days[:-1]]
+
+    def __repr__(self):
+        return f"OfficeCalendar(timezone={self.timezone!r})"
+
+    @classmethod
+    def from_office(
+        cls, office: Mapping[str, Any], **options: Any
+    ) -> "OfficeCalendar":
+        """Calendar in an office's (or resource's) timezone, UTC if unset"""
+        return cls(office.get("timezone") or "UTC", **options)
+
+    def timestamp(self, value: Union[str, datetime]) -> int:
+        """Epoch seconds of a datetime, reading naive ones as local time"""
+        return to_timestamp(value, self.zone)
+
+    def local_date(self, ts: int) -> date:
+        i = bisect_right(self._midnights, ts) - 1
+        if 0 <= i < len(self._windows):
+            return date.fromordinal(self.first_day + i)
+        return datetime.fromtimestamp(ts, self.zone).date()
+
+    def is_weekend(self, ts: int) -> bool:
+        return self.local_date(ts).weekday() >= 5
+
+    def window(self, day: date) -> Optional[Interval]:
+        """Opening window of a local day, None when closed"""
+        i = day.toordinal() - self.first_day
+        if 0 <= i < len(self._windows):
+            return self._windows[i]
+        return self._compute(day)
+
+    def window_at(self, ts: int) -> Optional[Interval]:
+        """Opening window of the local day containing ``ts``"""
+        return self.window(self.local_date(ts))
+
+    def is_open(self, start: int, end: int) -> bool:
+        """True if [start, end) lies within one opening window"""
+        window = self.window_at(start)
+        return window is not None and window[0] <= start and end <= window[1]
+
+    def slots(
+        self, day: date, step: int, duration: Optional[int] = None
+    ) -> list[int]:
+        """Start times every ``step`` seconds from opening whose slot of
+        ``duration`` (``step`` by default) ends by closing
+        """
+        window = self.window(day)
+        if window is None:
+            return []
+        duration = step if duration is None else duration
+        return list(range(window[0], window[1] - duration + 1, step))
+
+    def free_slot_times(
+        self, day: date, busy: list[Interval], step: int
+    ) -> list[str]:
+        """Local ``HH:MM`` of the ``step``-second slots of a day that do
+        not overlap ``busy`` (sorted, merged intervals)
+        """
+        ends = [end for _, end in busy]
+        times = []
+        for slot in self.slots(day, step):
+            i = bisect_right(ends, slot)  # first interval ending after slot
+            if i < len(busy) and busy[i][0] < slot + step:
+                continue
+            times.append(datetime.fromtimestamp(slot, self.zone))
+        return [t.strftime("%H:%M") for t in times]
+
+    def _local(self, day: date, at: time) -> int:
+        return int(datetime.combine(day, at, tzinfo=self.zone).timestamp())
+
+    def _compute(self, day: date) -> Optional[Interval]:
+        hours = self.hours.get(day.weekday())
+        if hours is None or day in self.holidays:
+            return None
+        opens, closes = hours
+        end_day = day if closes > opens else day + timedelta(days=1)
+        return self._local(day, opens), self._local(end_day, closes)
+
+
+_registered: dict[str, OfficeCalendar] = {}
+
+
+def register_calendar(office: str, calendar: OfficeCalendar):
+    """Sets the calendar booking validations use for an office"""
+    _registered[office] = calendar
+
+
+def unregister_calendar(office: str):
+    _registered.pop(office, None)
+
+
+@lru_cache(maxsize=64)
+def default_calendar(timezone: str = "UTC") -> OfficeCalendar:
+    """Shared calendar with the default hours, Monday to Friday"""
+    return OfficeCalendar(timezone)
+
+
+def calendar_for(
+    office: Optional[str], timezone: Optional[str] = None
+) -> OfficeCalendar:
+    """The office's registered calendar, else the default hours in
+    ``timezone`` (UTC if unset or unknown)
+    """
+    calendar = _registered.get(office) if office else None
+    if calendar is not None:
+        return calendar
+    try:
+        return default_calendar(timezone or "UTC")
+    except ValueError:
+        return default_calendar("UTC")
+
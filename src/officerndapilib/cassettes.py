@@ -0,0 +1,221 @@
+import base64
+import json
+import threading
+import time
+from typing import Iterable, Optional, Union
+
+import requests
+from attrs import asdict, define, field
+from requests import PreparedRequest
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# CASSETTES
+
+# argument types of requests' adapter ``send``
+Timeout = Union[None, float, tuple[Optional[float], Optional[float]]]
+Cert = Union[None, str, tuple[str, str]]
+
+RECORD = "record"
+REPLAY = "replay"
+
+# bodies are stored decoded, so these no longer describe them
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+@define
+class Interaction:
+    """One recorded request/response pair and how long it took"""
+
+    method: str
+    url: str
+    body: Optional[str]
+    status_code: int
+    content: str
+    headers: dict[str, str] = field(factory=dict)
+    base64: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def key(self) -> tuple[str, str, Optional[str]]:
+        return self.method, self.url, self.body
+
+    def response_content(self) -> bytes:
+        if self.base64:
+            return base64.b64decode(self.content)
+        return self.content.encode()
+
+
+def body_text(body) -> Optional[str]:
+    if body is None or isinstance(body, str):
+        return body
+    return bytes(body).decode("utf-8", errors="replace")
+
+
+class Cassette:
+    """Recorded interactions, saved as a JSON file.
+
+    Identical requests are answered with their recorded responses in
+    order, starting over once all of them were replayed, so a cassette
+    recorded once can drive a benchmark loop.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        interactions: Iterable[Interaction] = (),
+    ):
+        self.path = path
+        self.interactions: list[Interaction] = []
+        self._by_key: dict[tuple, list[Interaction]] = {}
+        self._played: dict[tuple, int] = {}
+        self._lock = threading.Lock()
+        for interaction in interactions:
+            self.record(interaction)
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(path, (Interaction(**i) for i in data["interactions"]))
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        if path is None:
+            raise ValueError("Cassette has no path")
+        with self._lock:
+            data = {"interactions": [asdict(i) for i in self.interactions]}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+
+    def record(self, interaction: Interaction):
+        with self._lock:
+            self.interactions.append(interaction)
+            self._by_key.setdefault(interaction.key, []).append(interaction)
+
+    def play(
+        self, method: str, url: str, body: Optional[str]
+    ) -> Optional[Interaction]:
+        """Returns the next recorded response to a request, if any"""
+        key = (method, url, body)
+        with self._lock:
+            matches = self._by_key.get(key)
+            if not matches:
+                return None
+            played = self._played.get(key, 0)
+            self._played[key] = played + 1
+            return matches[played % len(matches)]
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Sends requests to the network and records them into a cassette"""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: Timeout = None,
+        verify: Union[bool, str] = True,
+        cert: Cert = None,
+        proxies: Optional[dict[str, str]] = None,
+    ) -> requests.Response:
+        started = time.perf_counter()
+        response = super().send(request, stream, timeout, verify, cert, proxies)
+        content = response.content  # read the body before timing stops
+        elapsed = time.perf_counter() - started
+        try:
+            text, encoded = content.decode("utf-8"), False
+        except UnicodeDecodeError:
+            text, encoded = base64.b64encode(content).decode(), True
+        assert request.method is not None and request.url is not None
+        self.cassette.record(
+            Interaction(
+                method=request.method,
+                url=request.url,
+                body=body_text(request.body),
+                status_code=response.status_code,
+                content=text,
+                headers={
+                    k: v
+                    for k, v in response.headers.items()
+                    if k.lower() not in DROPPED_HEADERS
+                },
+                base64=encoded,
+                elapsed=elapsed,
+            )
+        )
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answers requests from a cassette without touching the network.
+
+    Each response is delayed by its recorded latency times
+    ``latency_scale``; 0 replays as fast as possible. Requests missing from
+    the cassette raise requests.ConnectionError.
+    """
+
+    def __init__(self, cassette: Cassette, latency_scale: float = 1.0):
+        super().__init__()
+        self.cassette = cassette
+        self.latency_scale = latency_scale
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: Timeout = None,
+        verify: Union[bool, str] = True,
+        cert: Cert = None,
+        proxies: Optional[dict[str, str]] = None,
+    ) -> requests.Response:
+        assert request.method is not None and request.url is not None
+        interaction = self.cassette.play(
+            request.method, request.url, body_text(request.body)
+        )
+        if interaction is None:
+            raise requests.ConnectionError(
+                f"No recorded response for {request.method} {request.url}",
+                request=request,
+            )
+        if self.latency_scale > 0 and interaction.elapsed > 0:
+            time.sleep(interaction.elapsed * self.latency_scale)
+        response = requests.Response()
+        response.status_code = interaction.status_code
+        response.headers = CaseInsensitiveDict(interaction.headers)
+        response._content = interaction.response_content()
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        response.encoding = "utf-8"
+        return response
+
+    def close(self):
+        pass
+
+
+def use_cassette(
+    session: requests.Session,
+    cassette: Cassette,
+    mode: str = REPLAY,
+    latency_scale: float = 1.0,
+) -> BaseAdapter:
+    """Mounts a recording or replaying adapter on a session, e.g.
+    ``use_cassette(client.session, Cassette.load("checkout.json"))``
+    """
+    if mode == RECORD:
+        adapter: BaseAdapter = RecordingAdapter(cassette)
+    elif mode == REPLAY:
+        adapter = ReplayAdapter(cassette, latency_scale)
+    else:
+        raise ValueError(f"Unknown cassette mode '{mode}'")
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
@@ -0,0 +1,129 @@
+import hashlib
+import json
+from typing import Any, Generator, Iterable, Mapping, Optional
+
+from attrs import define, field
+
+# CHANGE FEEDS
+
+ADDED = "added"
+MODIFIED = "modified"
+REMOVED = "removed"
+
+# bytes of blake2b digest kept per record
+DIGEST_SIZE = 16
+
+
+@define(frozen=True)
+class Change:
+    kind: str
+    id: str
+    record: Optional[Mapping[str, Any]] = None  # None when removed
+
+
+@define
+class ChangeSet:
+    added: list[Mapping[str, Any]] = field(factory=list)
+    modified: list[Mapping[str, Any]] = field(factory=list)
+    removed: list[str] = field(factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.modified) + len(self.removed)
+
+
+def record_hash(
+    record: Mapping[str, Any], ignore: Iterable[str] = ()
+) -> bytes:
+    """Content hash of a record, independent of key order"""
+    if ignore:
+        record = {k: v for k, v in record.items() if k not in ignore}
+    canonical = json.dumps(
+        record, sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.blake2b(
+        canonical.encode(), digest_size=DIGEST_SIZE
+    ).digest()
+
+
+class ChangeFeed:
+    """Tracks records by ``_id`` and a compact content hash.
+
+    Each call to ``changes`` or ``diff`` compares a full listing (e.g.
+    ``iter_members``) against the previous one in a single pass, holding
+    only 16 bytes per record, and emits just the added, modified and removed
+    records. ``ignore`` names fields that should not count as changes, such
+    as ``modifiedAt``.
+    """
+
+    def __init__(
+        self,
+        hashes: Optional[Mapping[str, bytes]] = None,
+        ignore: Iterable[str] = (),
+    ):
+        self.hashes: dict[str, bytes] = dict(hashes or {})
+        self.ignore = frozenset(ignore)
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def __contains__(self, _id: str) -> bool:
+        return _id in self.hashes
+
+    def changes(
+        self, records: Iterable[Mapping[str, Any]]
+    ) -> Generator[Change, None, None]:
+        """Lazily yields changes against a new listing and records it.
+
+        Removals are only known, and yielded, once ``records`` is exhausted,
+        which is also when the feed switches to the new listing; stopping
+        early leaves it unchanged.
+        """
+        previous = self.hashes
+        current: dict[str, bytes] = {}
+        for record in records:
+            _id = record["_id"]
+            digest = record_hash(record, self.ignore)
+            current[_id] = digest
+            old = previous.get(_id)
+            if old is None:
+                yield Change(ADDED, _id, record)
+            elif old != digest:
+                yield Change(MODIFIED, _id, record)
+        removed = [_id for _id in previous if _id not in current]
+        self.hashes = current
+        for _id in removed:
+            yield Change(REMOVED, _id)
+
+    def diff(self, records: Iterable[Mapping[str, Any]]) -> ChangeSet:
+        """Collects the changes against a new listing into a ChangeSet"""
+        change_set = ChangeSet()
+        for change in self.changes(records):
+            if change.kind == REMOVED:
+                change_set.removed.append(change.id)
+            elif change.kind == ADDED:
+                change_set.added.append(change.record)  # type: ignore
+            else:
+                change_set.modified.append(change.record)  # type: ignore
+        return change_set
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "ignore": sorted(self.ignore),
+                    "hashes": {k: v.hex() for k, v in self.hashes.items()},
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "ChangeFeed":
+        with open(path) as f:
+            data = json.load(f)
+        return cls(
+            {k: bytes.fromhex(v) for k, v in data["hashes"].items()},
+            data.get("ignore", ()),
+        )
@@ -0,0 +1,400 @@
+"""``ornd`` command-line tool.
+
+    ornd sync DIR [--kinds members,resources,bookings]
+    ornd export KIND OUTPUT [--format jsonl|parquet]
+    ornd availability --office ID --start DATE --end DATE
+    ornd bulk-cancel [ID ...] [--file PATH] [--report PATH]
+
+Credentials come from ``--token``/``ORND_TOKEN`` or the client credentials
+in ``ORND_CLIENT_ID``, ``ORND_CLIENT_SECRET`` and ``ORND_SCOPE``; the
+organization from ``--organization``/``ORND_ORGANIZATION``. Every command
+takes ``--concurrency`` and ``--rate`` (requests per second).
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, time as clock, timedelta
+from typing import Any, Iterable, Iterator, Mapping, Optional, TextIO
+
+from officerndapilib.api import get_ornd_token
+from officerndapilib.bulk import BulkReport, bulk_cancel_bookings
+from officerndapilib.calendars import OfficeCalendar, calendar_for
+from officerndapilib.client import ORNDClient, pooled_session
+from officerndapilib.intervals import BookingIntervalIndex, free_intervals
+from officerndapilib.ratelimit import RateLimiter
+from officerndapilib.serialization import get_serializer
+from officerndapilib.streams import (
+    RESOURCE_TYPES,
+    iter_bookings,
+    iter_members,
+    iter_resources,
+)
+
+# CLI
+
+KINDS = ("offices", "members", "resources", "bookings")
+FORMATS = ("jsonl", "parquet")
+
+# days of bookings synced or exported when no range is given
+DEFAULT_BOOKING_DAYS = 30
+
+
+class Progress:
+    """Single-line progress counter on stderr, redrawn at most every 0.1s"""
+
+    def __init__(
+        self,
+        label: str,
+        total: Optional[int] = None,
+        stream: Optional[TextIO] = None,
+    ):
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.stream = stream if stream is not None else sys.stderr
+        self._drawn = 0.0
+
+    def update(self, done: Optional[int] = None, total: Optional[int] = None):
+        self.done = self.done + 1 if done is None else done
+        if total is not None:
+            self.total = total
+        now = time.monotonic()
+        if now - self._drawn >= 0.1:
+            self._drawn = now
+            self.draw()
+
+    def draw(self, end: str = ""):
+        total = f"/{self.total}" if self.total is not None else ""
+        self.stream.write(f"\r{self.label}: {self.done}{total}{end}")
+        self.stream.flush()
+
+    def close(self):
+        self.draw("\n")
+
+
+class NoProgress(Progress):
+    def draw(self, end: str = ""):
+        pass
+
+
+def iso_date(value: str) -> date:
+    return date.fromisoformat(value)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--token", default=os.environ.get("ORND_TOKEN"))
+    common.add_argument(
+        "--organization", default=os.environ.get("ORND_ORGANIZATION")
+    )
+    common.add_argument("--concurrency", type=int, default=8)
+    common.add_argument(
+        "--rate", type=float, help="maximum requests per second"
+    )
+    common.add_argument(
+        "--quiet", action="store_true", help="no progress output"
+    )
+
+    ranged = argparse.ArgumentParser(add_help=False)
+    ranged.add_argument("--office", action="append", help="default: all")
+    ranged.add_argument("--start", type=iso_date, help="default: today")
+    ranged.add_argument("--end", type=iso_date, help="exclusive")
+
+    parser = argparse.ArgumentParser(
+        prog="ornd",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync = commands.add_parser(
+        "sync", parents=[common, ranged], help="mirror data to a directory"
+    )
+    sync.add_argument("directory")
+    sync.add_argument("--kinds", default="members,resources,bookings")
+
+    export = commands.add_parser(
+        "export", parents=[common, ranged], help="export one kind of record"
+    )
+    export.add_argument("kind", choices=KINDS)
+    export.add_argument("output", help="file path, or - for stdout")
+    export.add_argument("--format", choices=FORMATS)
+
+    availability = commands.add_parser(
+        "availability",
+        parents=[common, ranged],
+        help="free hours per room and day",
+    )
+    availability.add_argument(
+        "--type", default="meeting_room", choices=RESOURCE_TYPES
+    )
+    availability.add_argument(
+        "--opens", type=int, help="hour, every day; office hours by default"
+    )
+    availability.add_argument("--closes", type=int)
+    availability.add_argument(
+        "--timezone", help="of --opens/--closes, UTC by default"
+    )
+
+    cancel = commands.add_parser(
+        "bulk-cancel", parents=[common], help="cancel bookings by ID"
+    )
+    cancel.add_argument("ids", nargs="*")
+    cancel.add_argument("--file", help="one ID per line, - for stdin")
+    cancel.add_argument("--silent", action="store_true")
+    cancel.add_argument("--skip-fee", action="store_true")
+    cancel.add_argument(
+        "--report", help="JSON report, resumed from if it exists"
+    )
+
+    args = parser.parse_args(argv)
+    if not args.organization:
+        parser.error("--organization or ORND_ORGANIZATION is required")
+    if args.command == "sync":
+        unknown = set(args.kinds.split(",")) - set(KINDS)
+        if unknown:
+            parser.error(f"unknown kinds: {', '.join(sorted(unknown))}")
+    if args.command != "bulk-cancel":
+        args.start = args.start or date.today()
+        args.end = args.end or args.start + timedelta(DEFAULT_BOOKING_DAYS)
+        if args.end <= args.start:
+            parser.error("--end must be after --start")
+    return args
+
+
+def resolve_token(args: argparse.Namespace) -> Optional[str]:
+    if args.token:
+        return args.token
+    if "ORND_CLIENT_ID" not in os.environ:
+        return None
+    return get_ornd_token(
+        {
+            "client_id": os.environ["ORND_CLIENT_ID"],
+            "client_secret": os.environ.get("ORND_CLIENT_SECRET", ""),
+            "grant_type": "client_credentials",
+            "scope": os.environ.get("ORND_SCOPE", ""),
+            "organization_slug": args.organization,
+        }
+    )
+
+
+def make_client(args: argparse.Namespace) -> ORNDClient:
+    """A client pooling one connection per concurrent request"""
+    return ORNDClient(
+        resolve_token(args),
+        args.organization,
+        session=pooled_session(args.concurrency),
+        rate_limiter=RateLimiter(args.rate) if args.rate else None,
+    )
+
+
+def make_progress(args: argparse.Namespace, label: str) -> Progress:
+    return NoProgress(label) if args.quiet else Progress(label)
+
+
+def iter_records(
+    client: ORNDClient, kind: str, args: argparse.Namespace
+) -> Iterator[Mapping[str, Any]]:
+    """Streams records of one kind for the offices and dates in ``args``"""
+    workers = args.concurrency
+    if kind == "offices":
+        yield from client.get_all_offices()
+    elif kind == "members":
+        yield from iter_members(client, args.office, workers)
+    elif kind == "resources":
+        yield from iter_resources(client, args.office, max_workers=workers)
+    elif kind == "bookings":
+        resources = iter_resources(client, args.office, max_workers=workers)
+        yield from iter_bookings(
+            client, resources, args.start, args.end, workers
+        )
+    else:
+        raise ValueError(f"Unknown kind '{kind}'")
+
+
+def write_jsonl(
+    records: Iterable[Mapping[str, Any]], stream, progress: Progress
+) -> int:
+    dumps = get_serializer().dumps
+    for record in records:
+        stream.write(dumps(record) + b"\n")
+        progress.update()
+    return progress.done
+
+
+def write_parquet(
+    records: Iterable[Mapping[str, Any]], path: str, progress: Progress
+) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError(
+            "Parquet export requires pyarrow, "
+            "install it with 'pip install officerndapilib[parquet]'"
+        )
+    rows = []
+    for record in records:
+        rows.append(record)
+        progress.update()
+    pq.write_table(pa.Table.from_pylist(rows), path)
+    return len(rows)
+
+
+def export(client: ORNDClient, args: argparse.Namespace) -> int:
+    fmt = args.format or (
+        "parquet" if args.output.endswith(".parquet") else "jsonl"
+    )
+    progress = make_progress(args, f"export {args.kind}")
+    records = iter_records(client, args.kind, args)
+    try:
+        if fmt == "parquet":
+            if args.output == "-":
+                raise ValueError("Parquet cannot be written to stdout")
+            write_parquet(records, args.output, progress)
+        elif args.output == "-":
+            write_jsonl(records, sys.stdout.buffer, progress)
+        else:
+            with open(args.output, "wb") as f:
+                write_jsonl(records, f, progress)
+    finally:
+        progress.close()
+    return 0
+
+
+def sync(client: ORNDClient, args: argparse.Namespace) -> int:
+    """Writes ``<kind>.jsonl`` snapshots, replacing each only when complete"""
+    os.makedirs(args.directory, exist_ok=True)
+    for kind in args.kinds.split(","):
+        path = os.path.join(args.directory, f"{kind}.jsonl")
+        progress = make_progress(args, f"sync {kind}")
+        try:
+            with open(path + ".tmp", "wb") as f:
+                write_jsonl(iter_records(client, kind, args), f, progress)
+        finally:
+            progress.close()
+        os.replace(path + ".tmp", path)
+    return 0
+
+
+def availability(client: ORNDClient, args: argparse.Namespace) -> int:
+    """Prints free hours within opening hours per room (rows) and day
+
+    Opening hours come from each room's office calendar, in the room's
+    timezone, unless ``--opens``/``--closes`` set the same hours every day.
+    """
+    resources = list(
+        iter_resources(
+            client, args.office, [args.type], max_workers=args.concurrency
+        )
+    )
+    progress = make_progress(args, "availability bookings")
+    index = BookingIntervalIndex()
+    try:
+        for booking in iter_bookings(
+            client, resources, args.start, args.end, args.concurrency
+        ):
+            index.add(booking)
+            progress.update()
+    finally:
+        progress.close()
+
+    days = [
+        args.start + timedelta(days=i)
+        for i in range((args.end - args.start).days)
+    ]
+    print("\t".join(["resource", *(day.isoformat() for day in days)]))
+    fixed = fixed_calendar(args, days)
+    for resource in sorted(resources, key=lambda r: r.get("name", "")):
+        calendar = fixed or calendar_for(
+            resource.get("office"), resource.get("timezone")
+        )
+        busy = index.busy_intervals(resource["_id"])
+        cells = []
+        for day in days:
+            window = calendar.window(day)
+            if window is None:
+                cells.append("closed")
+                continue
+            gaps = free_intervals(busy, *window)
+            free = sum(end - start for start, end in gaps)
+            cells.append(f"{free / 3600:g}h")
+        print("\t".join([resource.get("name", resource["_id"]), *cells]))
+    return 0
+
+
+def fixed_calendar(
+    args: argparse.Namespace, days: list[date]
+) -> Optional[OfficeCalendar]:
+    """Calendar with ``--opens``/``--closes`` every day, if either is set"""
+    if args.opens is None and args.closes is None:
+        return None
+    opens = clock(9 if args.opens is None else args.opens)
+    closes = clock((18 if args.closes is None else args.closes) % 24)
+    return OfficeCalendar(
+        args.timezone or "UTC",
+        hours={weekday: (opens, closes) for weekday in range(7)},
+        start=days[0] if days else None,
+        horizon=len(days),
+    )
+
+
+def read_ids(args: argparse.Namespace) -> list[str]:
+    ids = list(args.ids)
+    if args.file:
+        f = sys.stdin if args.file == "-" else open(args.file)
+        with f:
+            ids.extend(line.strip() for line in f if line.strip())
+    return ids
+
+
+def bulk_cancel(client: ORNDClient, args: argparse.Namespace) -> int:
+    report = BulkReport()
+    ids = read_ids(args)
+    if args.report and os.path.exists(args.report):
+        report = BulkReport.load(args.report)
+        # without IDs, retry whatever the saved run did not finish
+        ids = ids or [*report.failed, *report.pending]
+    progress = make_progress(args, "bulk-cancel")
+    try:
+        # filled in place, so an interrupted run saves what it finished
+        bulk_cancel_bookings(
+            client,
+            ids,
+            silent=args.silent,
+            skip_fee=args.skip_fee,
+            max_workers=args.concurrency,
+            report=report,
+            progress=progress.update,
+        )
+    finally:
+        progress.close()
+        if args.report:
+            report.save(args.report)
+    for _id, error in report.failed.items():
+        print(f"{_id}\t{error}", file=sys.stderr)
+    print(f"{len(report.succeeded)} canceled, {len(report.failed)} failed")
+    return 0 if report.ok else 1
+
+
+COMMANDS = {
+    "sync": sync,
+    "export": export,
+    "availability": availability,
+    "bulk-cancel": bulk_cancel,
+}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    client = make_client(args)
+    try:
+        return COMMANDS[args.command](client, args)
+    finally:
+        client.session.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,657 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone, tzinfo
+from typing import TYPE_CHECKING, Any, Iterable, MutableMapping, Optional
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+from officerndapilib.cache import SWRCache
+from officerndapilib.dates import is_naive
+from officerndapilib.exceptions import (
+    CircuitOpenException,
+    HttpException,
+    ValidationException,
+)
+from officerndapilib.mutations import (
+    BOOKING_CANCELED,
+    BOOKING_CREATED,
+    BOOKING_DELETED,
+    MEMBER_DELETED,
+    MutationEvent,
+    MutationPublisher,
+)
+from officerndapilib.queries import (
+    ORNDBaseQuery,
+    ORNDResourceQuery,
+    encode_queries,
+)
+from officerndapilib.ratelimit import RateLimiter
+from officerndapilib.resilience import (
+    CircuitBreakers,
+    LatencyTracker,
+    hedged_call,
+)
+from officerndapilib.schema import (
+    ORNDBooking,
+    ORNDMember,
+    ORNDOffice,
+    ORNDResource,
+    ORNDResourceType,
+)
+from officerndapilib.serialization import (
+    Serializer,
+    get_serializer,
+    projected_fields,
+)
+
+if TYPE_CHECKING:
+    from officerndapilib.intervals import BookingIntervalIndex
+    from officerndapilib.quotes import QuoteCache
+    from officerndapilib.reqs import (
+        CreateORNDMemberRequest,
+        CreateORNDMemberBookingRequest,
+        RetrieveORNDBookingOccurencesRequest,
+    )
+    from officerndapilib.warmup import WarmupReport
+
+
+ORND_BASE_URL = "https://app.officernd.com/api/v1/organizations/"
+
+JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+
+# every encoding urllib3 can decode here: gzip and deflate, plus br with
+# brotli installed (the ``compression`` extra) and zstd with zstandard
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+# (connect, read) seconds; requests never times out by default
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+# status codes that count against an endpoint's circuit breaker
+BREAKER_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# path templates, bound to an organization once per client
+ORND_ENDPOINTS = {
+    "offices": "/offices",
+    "office": "/offices/{id}",
+    "resources": "/resources",
+    "resource": "/resources/{id}",
+    "members": "/members",
+    "member": "/members/{id}",
+    "occurrences": "/bookings/occurrences",
+    "checkout_summary": "/bookings/checkout-summary",
+    "checkout": "/bookings/checkout",
+    "summary": "/bookings/summary",
+    "booking": "/bookings/{id}",
+    "cancel": "/bookings/{id}/cancel",
+}
+
+
+def pooled_session(pool_size: int = 10) -> requests.Session:
+    """Returns a session keeping up to ``pool_size`` connections per host"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class ORNDClient:
+    """Prepared OfficeRnD API client for one organization.
+
+    Endpoint URLs are built once per client and requests share a pooled
+    ``requests.Session``, so each call only formats path IDs and encodes its
+    queries. The bearer token is sent with each request rather than kept on
+    the session. Every request waits on ``rate_limiter`` if given.
+    Bodies are encoded and decoded with ``serializer``, the fastest installed
+    JSON backend by default.
+
+    With ``circuit_breakers`` each endpoint fails fast with a
+    CircuitOpenException while its circuit is open, or serves the last good
+    response from ``stale_cache`` for GETs. With ``hedge`` a GET that has not
+    answered within the endpoint's p95 latency (``hedge_after`` until enough
+    samples exist) is sent again and the first answer wins.
+
+    Office and resource reads go through ``metadata_cache`` if given, e.g. a
+    SQLiteCache that survives restarts and refreshes in the background.
+    Checkout summaries are memoized in ``quote_cache`` if given.
+
+    Bookings created, canceled or deleted and members deleted through the
+    client are published as MutationEvents on ``mutations``, so subscribed
+    interval indexes, series caches, quote caches and idempotency ledgers
+    update in place; ``quote_cache`` is subscribed automatically.
+
+    List and get methods take ``fields`` to keep only those fields (and
+    ``_id``) of each record, dropped while decoding; with ``select_fields``
+    the projection is also sent as a ``$select`` query so the API can leave
+    them out. Responses are always requested compressed.
+
+    ``base_url`` points the client elsewhere, e.g. at a FakeORNDServer.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str],
+        organization: str,
+        session: Optional[requests.Session] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        serializer: Optional[Serializer] = None,
+        timeout: Any = DEFAULT_TIMEOUT,
+        circuit_breakers: Optional[CircuitBreakers] = None,
+        stale_cache: Optional[MutableMapping[str, Any]] = None,
+        hedge: bool = False,
+        hedge_after: float = 1.0,
+        metadata_cache: Optional[SWRCache] = None,
+        quote_cache: Optional[QuoteCache] = None,
+        select_fields: bool = False,
+        base_url: str = ORND_BASE_URL,
+        mutations: Optional[MutationPublisher] = None,
+    ):
+        self.organization = organization
+        self.rate_limiter = rate_limiter
+        self.serializer = serializer or get_serializer()
+        self.timeout = timeout
+        self.circuit_breakers = circuit_breakers
+        self.stale_cache = stale_cache
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.metadata_cache = metadata_cache
+        self.quote_cache = quote_cache
+        self.select_fields = select_fields
+        self.mutations = mutations or MutationPublisher()
+        if quote_cache is not None:
+            self.mutations.register_quotes(quote_cache)
+        self.latencies: dict[str, LatencyTracker] = {}
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        self.base_url = base_url + organization
+        self.urls = {
+            name: self.base_url + path for name, path in ORND_ENDPOINTS.items()
+        }
+        self.session = session or requests.Session()
+        self.session.headers["accept"] = "application/json"
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        self.token = token
+
+    def auth_headers(self) -> dict[str, str]:
+        """Headers authenticating one request, read as it is sent"""
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    def close(self):
+        """Closes the session's connections and the hedging pool"""
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False)
+            self._hedge_pool = None
+        self.session.close()
+
+    def url(
+        self,
+        endpoint: str,
+        queries: Iterable[ORNDBaseQuery] = (),
+        **params: str,
+    ) -> str:
+        url = self.urls[endpoint]
+        if params:
+            url = url.format(
+                **{k: quote(v, safe="") for k, v in params.items()}
+            )
+        query = encode_queries(queries)
+        return f"{url}?{query}" if query else url
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        queries: Iterable[ORNDBaseQuery] = (),
+        json: Any = None,
+        fields: Optional[Iterable[str]] = None,
+        **params: str,
+    ) -> Any:
+        options: dict[str, Any] = {}
+        if fields is not None:
+            fields = options["fields"] = projected_fields(fields)
+            if self.select_fields:
+                queries = [*queries, ("$select", ",".join(fields))]
+        url = self.url(endpoint, queries, **params)
+        key = cache_key(url, fields)
+        breaker = None
+        if self.circuit_breakers is not None:
+            breaker = self.circuit_breakers.get(endpoint)
+            if not breaker.allow():
+                if (
+                    method == "GET"
+                    and self.stale_cache is not None
+                    and key in self.stale_cache
+                ):
+                    return self.stale_cache[key]
+                raise CircuitOpenException(f"Circuit open for '{endpoint}'")
+
+        latencies = self.latencies.setdefault(endpoint, LatencyTracker())
+        started = time.monotonic()
+        try:
+            if method == "GET" and self.hedge:
+                data = self._send_hedged(url, latencies, options)
+            else:
+                data = self.send(method, url, json, **options)
+        except HttpException as e:
+            if breaker is not None:
+                if e.status_code in BREAKER_STATUS_CODES:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()  # the endpoint is responsive
+            raise
+        except BaseException:
+            # network and decode errors alike; a half-open circuit must get
+            # its trial call back whatever was raised
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+        latency = time.monotonic() - started
+        latencies.record(latency)
+        if breaker is not None:
+            breaker.record_success(latency)
+        if method == "GET" and self.stale_cache is not None:
+            self.stale_cache[key] = data
+        return data
+
+    def cached_get(
+        self,
+        endpoint: str,
+        queries: Iterable[ORNDBaseQuery] = (),
+        fields: Optional[Iterable[str]] = None,
+        **params: str,
+    ) -> Any:
+        """GETs through ``metadata_cache`` (stale-while-revalidate) if set"""
+        queries = list(queries)
+        if fields is not None:
+            fields = projected_fields(fields)
+
+        def load():
+            return self.request(
+                "GET", endpoint, queries, fields=fields, **params
+            )
+
+        if self.metadata_cache is None:
+            return load()
+        key = cache_key(self.url(endpoint, queries, **params), fields)
+        return self.metadata_cache.get_or_load(key, load)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        json: Any = None,
+        fields: Optional[tuple[str, ...]] = None,
+    ) -> Any:
+        """Sends one request and decodes the response, or only ``fields``"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return self._send(method, url, json, fields)
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        json: Any,
+        fields: Optional[tuple[str, ...]],
+    ) -> Any:
+        headers = self.auth_headers()
+        if json is None:
+            response = self.session.request(
+                method, url, headers=headers, timeout=self.timeout
+            )
+        else:
+            response = self.session.request(
+                method,
+                url,
+                data=self.serializer.dumps(json),
+                headers={**headers, **JSON_CONTENT_TYPE},
+                timeout=self.timeout,
+            )
+        if response.ok:
+            if fields is not None:
+                return self.serializer.loads_fields(response.content, fields)
+            return self.serializer.loads(response.content)
+        errors: tuple[type[Exception], ...] = (
+            *self.serializer.decode_errors,
+            KeyError,
+            TypeError,
+        )
+        try:
+            message = self.serializer.loads(response.content)["message"]
+        except errors:
+            message = response.text or response.reason
+        raise HttpException(message, response.status_code)
+
+    def _send_hedged(
+        self, url: str, latencies: LatencyTracker, options: dict[str, Any]
+    ) -> Any:
+        if self._hedge_pool is None:
+            self._hedge_pool = ThreadPoolExecutor(
+                max_workers=8, thread_name_prefix="ornd-hedge"
+            )
+        p95 = latencies.percentile(95) if len(latencies) >= 20 else None
+        return hedged_call(
+            self._hedge_pool,
+            lambda: self.send("GET", url, **options),
+            p95 if p95 is not None else self.hedge_after,
+        )
+
+    def warmup(
+        self,
+        offices: Optional[Iterable[str]] = None,
+        days: Optional[int] = None,
+        **options: Any,
+    ) -> WarmupReport:
+        """Prefetches resources, bookings and members, see warmup.warmup
+
+        Bookings need an ``index`` and members a ``members`` mapping to be
+        loaded into; ``days`` without an ``index`` is rejected.
+        """
+        from officerndapilib.warmup import warmup
+
+        return warmup(self, offices, days, **options)
+
+    # OFFICES
+
+    def get_all_offices(
+        self, fields: Optional[Iterable[str]] = None
+    ) -> list[ORNDOffice]:
+        """Retrieves all office locations"""
+        return self.cached_get("offices", fields=fields)
+
+    def get_office_by_id(
+        self, id: str, fields: Optional[Iterable[str]] = None
+    ) -> ORNDOffice:
+        """Retrieves a specific office location by ID"""
+        return self.cached_get("office", fields=fields, id=id)
+
+    # RESOURCES
+
+    def get_all_resources(
+        self,
+        office: str,
+        type: ORNDResourceType,
+        queries: Iterable[ORNDResourceQuery] = (),
+        fields: Optional[Iterable[str]] = None,
+    ) -> list[ORNDResource]:
+        """Retrieves resources for a given office location"""
+        return self.cached_get(
+            "resources",
+            [*queries, ("office", office), ("type", type)],
+            fields=fields,
+        )
+
+    def get_resource_by_id(
+        self, id: str, fields: Optional[Iterable[str]] = None
+    ) -> ORNDResource:
+        """Retrieves a specific resource by ID"""
+        return self.cached_get("resource", fields=fields, id=id)
+
+    def get_resources_by_ids(
+        self, ids: Iterable[str], fields: Optional[Iterable[str]] = None
+    ) -> list[ORNDResource]:
+        """Retrieves resources by ID with one ``_id.$in`` query"""
+        return self.request(
+            "GET", "resources", [("_id.$in", ",".join(ids))], fields=fields
+        )
+
+    # MEMBERS
+
+    def get_all_members(
+        self, office: str, fields: Optional[Iterable[str]] = None
+    ) -> list[ORNDMember]:
+        """Retrieves all members of an office"""
+        return self.request(
+            "GET", "members", [("office", office)], fields=fields
+        )
+
+    def get_member_by_id(
+        self, id: str, fields: Optional[Iterable[str]] = None
+    ) -> ORNDMember:
+        """Retrieves a specific member by ID"""
+        return self.request("GET", "member", fields=fields, id=id)
+
+    def get_members_by_ids(
+        self, ids: Iterable[str], fields: Optional[Iterable[str]] = None
+    ) -> list[ORNDMember]:
+        """Retrieves members by ID with one ``_id.$in`` query"""
+        return self.request(
+            "GET", "members", [("_id.$in", ",".join(ids))], fields=fields
+        )
+
+    def get_member_by_email(self, office: str, email: str) -> ORNDMember:
+        """Retrieves a specific member by email"""
+        try:
+            return next(
+                member
+                for member in self.get_all_members(office)
+                if member["email"] == email
+            )
+        except StopIteration:
+            raise StopIteration(f"Member with email '{email}' not found")
+
+    def create_member(
+        self, member_request: CreateORNDMemberRequest
+    ) -> list[ORNDMember]:
+        """Creates a member"""
+        return self.request("POST", "members", json=member_request.data)
+
+    def delete_members(self, ids: list[str]) -> list[ORNDMember]:
+        """Deletes members by ID"""
+        data = self.request("DELETE", "members", json=ids)
+        for member_id in ids:
+            self.mutations.publish(MutationEvent(MEMBER_DELETED, member_id))
+        return data
+
+    # BOOKINGS
+
+    def get_all_bookings(
+        self,
+        booking_occurence: RetrieveORNDBookingOccurencesRequest,
+        fields: Optional[Iterable[str]] = None,
+    ) -> list[ORNDBooking]:
+        """Retrieves booking occurrences of a resource"""
+        queries: list[ORNDBaseQuery] = [
+            (name, value)
+            for name, value in [
+                ("$limit", str(booking_occurence.limit)),
+                ("start", booking_occurence.start),
+                ("end", booking_occurence.end),
+                ("resourceId", booking_occurence.resource_id),
+                ("office", booking_occurence.office),
+            ]
+            if value is not None
+        ]
+        return self.request("GET", "occurrences", queries, fields=fields)
+
+    def validate_booking_request(
+        self,
+        booking_request: CreateORNDMemberBookingRequest,
+        cached: bool = True,
+    ) -> list[ORNDBooking]:
+        """Validates a booking request (checkout summary)
+
+        Served from ``quote_cache`` when set, unless ``cached`` is False.
+        """
+        data = booking_request.data
+
+        def quote():
+            return self.request("POST", "checkout_summary", json=data)
+
+        if self.quote_cache is None or not cached:
+            return quote()
+        return self.quote_cache.get_or_quote(
+            booking_request.resource_id, data, quote
+        )
+
+    def create_booking(
+        self, booking_request: CreateORNDMemberBookingRequest
+    ) -> list[ORNDBooking]:
+        """Creates a booking"""
+        data = self.request("POST", "checkout", json=booking_request.data)
+        zone = request_zone(booking_request)
+        for booking in data if isinstance(data, list) else [data]:
+            self.mutations.publish(
+                MutationEvent(
+                    BOOKING_CREATED,
+                    booking.get("_id", ""),
+                    booking.get("resourceId", booking_request.resource_id),
+                    booking,
+                    zone,
+                )
+            )
+        return data
+
+    def validate_booking_creation(
+        self, booking_request: CreateORNDMemberBookingRequest
+    ) -> list[ORNDBooking]:
+        """Validates a booking request made has been created"""
+        payload = {
+            "booking": {
+                "resourceId": booking_request.resource_id,
+                "start": {"dateTime": booking_request.start},
+                "end": {"dateTime": booking_request.end},
+            },
+            "target": {"member": booking_request.member},
+        }
+        return self.request("POST", "summary", json=payload)
+
+    def delete_booking(
+        self,
+        booking_id: str,
+        index: Optional[BookingIntervalIndex] = None,
+    ):
+        """Deletes a booking, removing it from ``index`` if given"""
+        data = self.request("DELETE", "booking", id=booking_id)
+        if index is not None:
+            index.remove(booking_id)
+        self._publish_removal(BOOKING_DELETED, booking_id, data)
+        return data
+
+    def cancel_booking(
+        self,
+        booking_id: str,
+        silent=False,
+        skip_fee=False,
+        index: Optional[BookingIntervalIndex] = None,
+    ) -> ORNDBooking:
+        """Cancels a booking, removing it from ``index`` if given"""
+        data: ORNDBooking = self.request(
+            "POST",
+            "cancel",
+            [("silent", silent), ("skipFee", skip_fee)],
+            id=booking_id,
+        )
+        if index is not None:
+            index.remove(booking_id)
+        self._publish_removal(BOOKING_CANCELED, booking_id, data)
+        return data
+
+    def _publish_removal(self, type: str, booking_id: str, booking: Any):
+        # without the resource in the response, subscribers assume any
+        resource_id = (
+            booking.get("resourceId") if isinstance(booking, dict) else None
+        )
+        self.mutations.publish(
+            MutationEvent(type, booking_id, resource_id, booking)
+        )
+
+    def booking_checkout(
+        self,
+        booking_request: CreateORNDMemberBookingRequest,
+        index: Optional[BookingIntervalIndex] = None,
+    ) -> list[ORNDBooking]:
+        """Validates and creates a booking
+
+        If an ``index`` of existing occurrences is given, requests that clash
+        with it are rejected before any network call and the created booking
+        is added. Naive start and end times are read in the office's
+        timezone, as the booking validations read them.
+        """
+        zone = request_zone(booking_request)
+        if index is not None and index.conflicts(
+            booking_request.resource_id,
+            booking_request.start,
+            booking_request.end,
+            zone,
+        ):
+            raise ValidationException(
+                "Booking conflicts with an existing booking", 409
+            )
+        self.validate_booking_request(booking_request, cached=False)
+        self.validate_booking_creation(booking_request)
+        booking = self.create_booking(booking_request)
+        if index is not None:
+            index.add_all(booking, zone)
+        return booking
+
+
+def request_zone(booking_request: CreateORNDMemberBookingRequest) -> tzinfo:
+    """Zone naive booking times are read in, looked up only when needed"""
+    if is_naive(booking_request.start) or is_naive(booking_request.end):
+        return booking_request.office_calendar().zone
+    return timezone.utc
+
+
+def cache_key(url: str, fields: Optional[tuple[str, ...]]) -> str:
+    """Cache key of a GET, apart for each field projection"""
+    return f"{url}#{','.join(fields)}" if fields is not None else url
+
+
+MAX_SHARED_CLIENTS = 32
+
+_clients: OrderedDict[
+    tuple[str, str, Optional[str]], ORNDClient
+] = OrderedDict()
+_clients_lock = threading.Lock()
+_metadata_cache: Optional[SWRCache] = None
+
+
+def set_metadata_cache(cache: Optional[SWRCache]):
+    """Sets the metadata cache of shared clients, None to disable it
+
+    Office and resource reads of the ``api`` functions and the booking
+    validations go through it once set; by default they are not cached.
+    Its entries are only evicted by an attached RefreshScheduler.
+    """
+    global _metadata_cache
+    with _clients_lock:
+        _metadata_cache = cache
+        for client in _clients.values():
+            client.metadata_cache = cache
+
+
+def get_client(
+    token: Optional[str], organization: str, base_url: str = ORND_BASE_URL
+) -> ORNDClient:
+    """Returns the shared client of an organization and token
+
+    Clients are kept per base URL, organization and token, so callers with
+    different tokens never send each other's, and share one metadata cache
+    (see set_metadata_cache). The least recently used client is closed once
+    more than MAX_SHARED_CLIENTS are kept, e.g. after tokens are refreshed.
+    """
+    key = (base_url, organization, token)
+    evicted = []
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = ORNDClient(
+                token,
+                organization,
+                metadata_cache=_metadata_cache,
+                base_url=base_url,
+            )
+        else:
+            _clients.move_to_end(key)
+        while len(_clients) > MAX_SHARED_CLIENTS:
+            evicted.append(_clients.popitem(last=False)[1])
+    for old in evicted:
+        old.close()
+    return client
@@ -0,0 +1,38 @@
+from datetime import datetime, timezone, tzinfo
+from functools import lru_cache
+from typing import Union
+
+# DATES
+
+
+@lru_cache(maxsize=4096)
+def parse_datetime(value: str) -> datetime:
+    """Parses an ISO 8601 datetime string, caching the result.
+
+    A trailing ``Z`` is accepted on every supported Python version. Raises
+    ValueError if the string is not a valid datetime.
+    """
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def to_timestamp(
+    value: Union[str, datetime], zone: tzinfo = timezone.utc
+) -> int:
+    """Converts an ISO 8601 string or datetime to epoch seconds.
+
+    Naive datetimes are read in ``zone``, UTC by default. Booking
+    validations read naive booking times in the office's timezone, so pass
+    the office calendar's ``zone`` to agree with them.
+    """
+    dt = parse_datetime(value) if isinstance(value, str) else value
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=zone)
+    return int(dt.timestamp())
+
+
+def is_naive(value: Union[str, datetime]) -> bool:
+    """True if a datetime has no UTC offset"""
+    dt = parse_datetime(value) if isinstance(value, str) else value
+    return dt.tzinfo is None
@@ -14,3 +14,11 @@ class ValidationException(Exception):
         """Initialize the exception."""
         super().__init__(message)
         self.status_code = status_code
+
+
+class CircuitOpenException(HttpException):
+    """Raised when a circuit breaker rejects a call without sending it."""
+
+    def __init__(self, message, status_code=503):
+        """Initialize the exception."""
+        super().__init__(message, status_code)
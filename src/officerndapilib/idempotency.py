@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import requests
+from attrs import define
+
+from officerndapilib.client import ORNDClient, request_zone
+from officerndapilib.dates import to_timestamp
+from officerndapilib.exceptions import HttpException
+from officerndapilib.quotes import quote_key
+from officerndapilib.reqs import RetrieveORNDBookingOccurencesRequest
+from officerndapilib.schema import ORNDBooking, ORNDMember
+from officerndapilib.serialization import Serializer, get_serializer
+
+if TYPE_CHECKING:
+    from officerndapilib.reqs import (
+        CreateORNDMemberBookingRequest,
+        CreateORNDMemberRequest,
+    )
+
+# IDEMPOTENCY
+
+PENDING = "pending"  # sent, no answer yet
+UNKNOWN = "unknown"  # the write may or may not have landed
+DONE = "done"
+
+# seconds a completed key keeps answering with its result
+DEFAULT_TTL = 24 * 60 * 60
+
+# failures after which a write may still have been applied
+AMBIGUOUS_STATUS_CODES = {500, 502, 503, 504}
+AMBIGUOUS_ERRORS = (requests.Timeout, requests.ConnectionError)
+
+
+def idempotency_key(request: Any) -> str:
+    """Deterministic key of a request object, e.g. a booking request
+
+    Equal requests share a key however their datetimes are formatted.
+    """
+    canonical = f"{type(request).__name__}:{quote_key(request.data)}"
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@define
+class LedgerEntry:
+    key: str
+    state: str
+    result: Any = None
+    updated_at: float = 0.0
+
+
+def record_ids(result: Any) -> list[str]:
+    """``_id`` of each record in a create's result"""
+    records = result if isinstance(result, list) else [result]
+    return [r["_id"] for r in records if isinstance(r, dict) and "_id" in r]
+
+
+class IdempotencyLedger:
+    """Write keys with their state and result, in SQLite.
+
+    The default in-memory database covers retries within a process; a file
+    path also covers restarts, so a write interrupted by a crash is
+    reconciled instead of repeated. Completed keys expire after ``ttl``
+    seconds (never if None), and ``forget_record`` drops the key that
+    created a record once it is canceled or deleted.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        serializer: Optional[Serializer] = None,
+        ttl: Optional[float] = DEFAULT_TTL,
+    ):
+        self.path = path
+        self.serializer = serializer or get_serializer()
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS ledger ("
+                "key TEXT PRIMARY KEY, state TEXT, result BLOB, "
+                "updated_at REAL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "record_id TEXT PRIMARY KEY, key TEXT)"
+            )
+
+    def get(self, key: str) -> Optional[LedgerEntry]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT state, result, updated_at FROM ledger WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        if (
+            row[0] == DONE
+            and self.ttl is not None
+            and time.time() - row[2] >= self.ttl
+        ):
+            self.forget(key)
+            return None
+        result = self.serializer.loads(row[1]) if row[1] else None
+        return LedgerEntry(key, row[0], result, row[2])
+
+    def set(self, key: str, state: str, result: Any = None):
+        blob = self.serializer.dumps(result) if result is not None else None
+        ids = record_ids(result) if state == DONE else []
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO ledger VALUES (?, ?, ?, ?)",
+                (key, state, blob, time.time()),
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO records VALUES (?, ?)",
+                [(record_id, key) for record_id in ids],
+            )
+
+    def forget(self, key: str):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM ledger WHERE key = ?", (key,))
+            self._db.execute("DELETE FROM records WHERE key = ?", (key,))
+
+    def forget_record(self, record_id: str):
+        """Forgets the key whose write created ``record_id``, if any"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT key FROM records WHERE record_id = ?", (record_id,)
+            ).fetchone()
+        if row is not None:
+            self.forget(row[0])
+
+    def unresolved(self) -> list[str]:
+        """Keys whose writes were sent but never confirmed"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key FROM ledger WHERE state != ?", (DONE,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def find_booking(
+    client: ORNDClient, booking_request: CreateORNDMemberBookingRequest
+) -> Optional[list[ORNDBooking]]:
+    """Looks up the booking a request would have created, if it exists
+
+    Naive request times are read in the office's timezone, as the booking
+    validations read them, and the lookup covers their local days.
+    """
+    zone = request_zone(booking_request)
+    start = to_timestamp(booking_request.start, zone)
+    end = to_timestamp(booking_request.end, zone)
+    first_day = datetime.fromtimestamp(start, zone).date()
+    last_day = datetime.fromtimestamp(end, zone).date()
+    bookings = client.get_all_bookings(
+        RetrieveORNDBookingOccurencesRequest(
+            office=booking_request.office,
+            resource_id=booking_request.resource_id,
+            start=first_day.isoformat(),
+            end=(last_day + timedelta(days=1)).isoformat(),
+        )
+    )
+    data = booking_request.data
+    for booking in bookings:
+        if (
+            not booking.get("canceled")
+            and booking["resourceId"] == booking_request.resource_id
+            and to_timestamp(booking["start"]["dateTime"]) == start
+            and to_timestamp(booking["end"]["dateTime"]) == end
+            and (
+                data.get("member") in (None, booking.get("member"))
+                or data.get("member") in booking.get("members", [])
+            )
+            and data.get("team") in (None, booking.get("team"))
+        ):
+            return [booking]
+    return None
+
+
+def find_member(
+    client: ORNDClient, member_request: CreateORNDMemberRequest
+) -> Optional[list[ORNDMember]]:
+    """Looks up the member a request would have created, by email"""
+    email = member_request.email.lower()
+    for member in client.get_all_members(member_request.office):
+        if member.get("email", "").lower() == email:
+            return [member]
+    return None
+
+
+class IdempotentWriter:
+    """Retries creates quickly and in parallel without duplicating them.
+
+    Every request gets an ``idempotency_key`` recorded in ``ledger``. A
+    completed key returns its stored result. When a write fails in a way
+    that may still have applied it (timeout, dropped connection, 5xx), the
+    writer looks for the record it would have created (``find_booking`` /
+    ``find_member``) before retrying, and a key left unresolved by an
+    earlier run is reconciled the same way first. The ledger subscribes to
+    the client's mutations, so a canceled booking or deleted member can be
+    created again.
+    """
+
+    def __init__(
+        self,
+        client: ORNDClient,
+        ledger: Optional[IdempotencyLedger] = None,
+        retries: int = 3,
+        backoff: float = 0.2,
+    ):
+        self.client = client
+        self.ledger = ledger or IdempotencyLedger()
+        self.client.mutations.register_ledger(self.ledger)
+        self.retries = retries
+        self.backoff = backoff
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def create_booking(
+        self, booking_request: CreateORNDMemberBookingRequest
+    ) -> list[ORNDBooking]:
+        return self.write(
+            booking_request,
+            self.client.create_booking,
+            lambda: find_booking(self.client, booking_request),
+        )
+
+    def create_member(
+        self, member_request: CreateORNDMemberRequest
+    ) -> list[ORNDMember]:
+        return self.write(
+            member_request,
+            self.client.create_member,
+            lambda: find_member(self.client, member_request),
+        )
+
+    def write(
+        self,
+        request: Any,
+        send: Callable[[Any], Any],
+        find: Callable[[], Any],
+    ) -> Any:
+        key = idempotency_key(request)
+        with self._key_lock(key):  # one attempt per key at a time
+            entry = self.ledger.get(key)
+            if entry is not None and entry.state == DONE:
+                return entry.result
+            if entry is not None:
+                found = find()
+                if found is not None:
+                    self.ledger.set(key, DONE, found)
+                    return found
+
+            error: Optional[Exception] = None
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    time.sleep(self.backoff * 2 ** (attempt - 1))
+                self.ledger.set(key, PENDING)
+                try:
+                    result = send(request)
+                except AMBIGUOUS_ERRORS as e:
+                    error = e
+                except HttpException as e:
+                    if e.status_code not in AMBIGUOUS_STATUS_CODES:
+                        # rejected, or throttled before being applied
+                        self.ledger.forget(key)
+                        if e.status_code != 429 or attempt == self.retries:
+                            raise
+                        continue
+                    error = e
+                else:
+                    self.ledger.set(key, DONE, result)
+                    return result
+
+                self.ledger.set(key, UNKNOWN)
+                found = find()
+                if found is not None:
+                    self.ledger.set(key, DONE, found)
+                    return found
+            assert error is not None
+            raise error
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
@@ -0,0 +1,180 @@
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone, tzinfo
+from typing import Iterable, Union
+
+from officerndapilib.dates import to_timestamp
+from officerndapilib.schema import ORNDBooking
+
+# INTERVAL INDEX
+
+Interval = tuple[int, int]  # [start, end) in epoch seconds
+
+
+class ResourceIntervals:
+    """Booked intervals of a single resource.
+
+    Occurrences are kept per booking ID so they can be removed again, and a
+    merged, sorted list of busy intervals answers conflict queries by bisection.
+    """
+
+    def __init__(self):
+        self.bookings: dict[str, set[Interval]] = {}
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        self._dirty = False
+
+    def add(self, booking_id: str, start: int, end: int):
+        occurrences = self.bookings.setdefault(booking_id, set())
+        if (start, end) in occurrences:
+            return
+        occurrences.add((start, end))
+        if self._dirty:
+            return
+        # merge [start, end) into the busy list in place
+        lo = bisect_left(self._ends, start)
+        hi = bisect_right(self._starts, end)
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+
+    def remove(self, booking_id: str) -> bool:
+        if self.bookings.pop(booking_id, None) is None:
+            return False
+        self._dirty = True  # rebuilt on the next query
+        return True
+
+    def busy(self) -> list[Interval]:
+        self._rebuild()
+        return list(zip(self._starts, self._ends))
+
+    def conflicts(self, start: int, end: int) -> bool:
+        self._rebuild()
+        i = bisect_left(self._starts, end) - 1
+        return i >= 0 and self._ends[i] > start
+
+    def _rebuild(self):
+        if not self._dirty:
+            return
+        intervals = sorted(
+            interval
+            for occurrences in self.bookings.values()
+            for interval in occurrences
+        )
+        self._starts, self._ends = [], []
+        for start, end in intervals:
+            if self._ends and start <= self._ends[-1]:
+                self._ends[-1] = max(self._ends[-1], end)
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+        self._dirty = False
+
+
+class BookingIntervalIndex:
+    """In-memory index of booked intervals per resource.
+
+    Build it from ``get_all_bookings`` occurrences and pass it to
+    ``booking_checkout``/``cancel_booking`` to keep it current; conflict
+    queries are answered in O(log n) without a network call.
+    """
+
+    def __init__(self, bookings: Iterable[ORNDBooking] = ()):
+        self._resources: dict[str, ResourceIntervals] = {}
+        self._booking_resources: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.add_all(bookings)
+
+    def __contains__(self, booking_id: str) -> bool:
+        return booking_id in self._booking_resources
+
+    def add(self, booking: ORNDBooking, zone: tzinfo = timezone.utc):
+        """Indexes a booking occurrence, ignoring canceled bookings
+
+        Naive times are read in ``zone``, e.g. an OfficeCalendar's.
+        """
+        if booking.get("canceled"):
+            return
+        self.add_interval(
+            booking["resourceId"],
+            booking["start"]["dateTime"],
+            booking["end"]["dateTime"],
+            booking["_id"],
+            zone,
+        )
+
+    def add_all(
+        self, bookings: Iterable[ORNDBooking], zone: tzinfo = timezone.utc
+    ):
+        for booking in bookings:
+            self.add(booking, zone)
+
+    def add_interval(
+        self,
+        resource_id: str,
+        start: Union[str, datetime],
+        end: Union[str, datetime],
+        booking_id: str,
+        zone: tzinfo = timezone.utc,
+    ):
+        """Indexes [start, end), reading naive times in ``zone``"""
+        start_ts, end_ts = to_timestamp(start, zone), to_timestamp(end, zone)
+        with self._lock:
+            intervals = self._resources.setdefault(
+                resource_id, ResourceIntervals()
+            )
+            intervals.add(booking_id, start_ts, end_ts)
+            self._booking_resources[booking_id] = resource_id
+
+    def remove(self, booking_id: str) -> bool:
+        """Removes every indexed occurrence of a booking"""
+        with self._lock:
+            resource_id = self._booking_resources.pop(booking_id, None)
+            if resource_id is None:
+                return False
+            return self._resources[resource_id].remove(booking_id)
+
+    def conflicts(
+        self,
+        resource_id: str,
+        start: Union[str, datetime],
+        end: Union[str, datetime],
+        zone: tzinfo = timezone.utc,
+    ) -> bool:
+        """Returns True if [start, end) overlaps a booking on the resource
+
+        Naive times are read in ``zone``, e.g. an OfficeCalendar's.
+        """
+        start_ts, end_ts = to_timestamp(start, zone), to_timestamp(end, zone)
+        with self._lock:
+            intervals = self._resources.get(resource_id)
+            if intervals is None:
+                return False
+            return intervals.conflicts(start_ts, end_ts)
+
+    def busy_intervals(self, resource_id: str) -> list[Interval]:
+        """Returns the merged busy intervals of a resource in epoch seconds"""
+        with self._lock:
+            intervals = self._resources.get(resource_id)
+            return intervals.busy() if intervals else []
+
+
+def free_intervals(
+    busy: Iterable[Interval], start: int, end: int
+) -> list[Interval]:
+    """Returns the gaps in [start, end) not covered by sorted busy intervals"""
+    gaps = []
+    cursor = start
+    for busy_start, busy_end in busy:
+        if busy_end <= cursor:
+            continue
+        if busy_start >= end:
+            break
+        if busy_start > cursor:
+            gaps.append((cursor, busy_start))
+        cursor = max(cursor, busy_end)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
@@ -0,0 +1,202 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from attrs import define
+
+from officerndapilib.client import ORNDClient
+from officerndapilib.exceptions import HttpException
+
+# LOADERS
+
+# IDs per ``_id.$in`` query, keeping URLs well under common length limits
+MAX_IDS_PER_QUERY = 100
+
+BatchFunction = Callable[[list[str]], Mapping[str, Any]]
+
+
+@define
+class LoaderStats:
+    loads: int = 0
+    hits: int = 0
+    batches: int = 0
+
+
+class DataLoader:
+    """Batches and memoizes lookups by ID.
+
+    IDs passed to ``load`` within ``batch_delay`` seconds of each other (one
+    "tick") are de-duplicated and fetched together with ``batch_fn``, in
+    batches of at most ``max_batch_size``. Results, including in-flight
+    ones, are memoized in an LRU of ``cache_size`` entries; failures are
+    not. ``load`` returns a concurrent Future, so asyncio code can await it
+    with ``asyncio.wrap_future``.
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFunction,
+        max_batch_size: int = MAX_IDS_PER_QUERY,
+        batch_delay: float = 0.002,
+        cache_size: int = 1024,
+        max_workers: int = 4,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.batch_delay = batch_delay
+        self.cache_size = cache_size
+        self.stats = LoaderStats()
+        self._cache: OrderedDict[str, Future] = OrderedDict()
+        self._queue: dict[str, Future] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ornd-loader"
+        )
+
+    def load(self, key: str) -> Future:
+        """Queues a key for the next batch, or returns its memoized Future"""
+        with self._lock:
+            future = self._cache.get(key)
+            if future is not None:
+                self._cache.move_to_end(key)
+                self.stats.hits += 1
+                return future
+            self.stats.loads += 1
+            future = Future()
+            self._remember(key, future)
+            self._queue[key] = future
+            full = len(self._queue) >= self.max_batch_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.batch_delay, self.dispatch)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.dispatch()
+        return future
+
+    def get(self, key: str) -> Any:
+        return self.load(key).result()
+
+    def load_many(self, keys: Iterable[str]) -> list[Any]:
+        """Loads keys in as few batches as possible without waiting a tick"""
+        futures = [self.load(key) for key in keys]
+        self.dispatch()
+        return [future.result() for future in futures]
+
+    def dispatch(self):
+        """Sends every queued key now"""
+        with self._lock:
+            queue, self._queue = self._queue, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        keys = list(queue)
+        for i in range(0, len(keys), self.max_batch_size):
+            chunk = keys[i : i + self.max_batch_size]
+            batch = {key: queue[key] for key in chunk}
+            self.stats.batches += 1
+            self._pool.submit(self._run, batch)
+
+    def prime(self, key: str, value: Any):
+        future: Future = Future()
+        future.set_result(value)
+        with self._lock:
+            self._remember(key, future)
+
+    def clear(self, key: Optional[str] = None):
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(key, None)
+
+    def close(self):
+        self.dispatch()
+        self._pool.shutdown(wait=True)
+
+    def _remember(self, key: str, future: Future):
+        self._cache[key] = future
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _forget(self, key: str, future: Future):
+        with self._lock:
+            if self._cache.get(key) is future:
+                del self._cache[key]
+
+    def _run(self, batch: dict[str, Future]):
+        try:
+            results = self.batch_fn(list(batch))
+        except Exception as e:
+            for key, future in batch.items():
+                self._forget(key, future)
+                future.set_exception(e)
+            return
+        for key, future in batch.items():
+            if key in results:
+                future.set_result(results[key])
+            else:
+                self._forget(key, future)
+                future.set_exception(
+                    HttpException(f"'{key}' was not found", 404)
+                )
+
+
+def fetch_by_ids(
+    ids: list[str],
+    list_fn: Callable[[list[str]], Iterable[Mapping[str, Any]]],
+    get_fn: Callable[[str], Mapping[str, Any]],
+    max_workers: int = 8,
+) -> dict[str, Any]:
+    """Fetches records with one ``_id`` filtered list query, then any the
+    query did not return (or all, if the filter is rejected) concurrently
+    one by one. IDs that do not exist are left out.
+    """
+    found: dict[str, Any] = {}
+    try:
+        for record in list_fn(ids):
+            found[record["_id"]] = record
+    except HttpException as e:
+        if e.status_code >= 500:
+            raise
+    missing = [_id for _id in ids if _id not in found]
+    if not missing:
+        return found
+
+    def get(_id: str) -> Optional[Mapping[str, Any]]:
+        try:
+            return get_fn(_id)
+        except HttpException as e:
+            if e.status_code == 404:
+                return None
+            raise
+
+    workers = min(max_workers, len(missing))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _id, fetched in zip(missing, pool.map(get, missing)):
+            if fetched is not None:
+                found[_id] = fetched
+    return found
+
+
+def member_loader(client: ORNDClient, **options: Any) -> DataLoader:
+    """DataLoader for members by ID, e.g. a booking's ``members``"""
+    return DataLoader(
+        lambda ids: fetch_by_ids(
+            ids, client.get_members_by_ids, client.get_member_by_id
+        ),
+        **options,
+    )
+
+
+def resource_loader(client: ORNDClient, **options: Any) -> DataLoader:
+    """DataLoader for resources by ID, e.g. a booking's ``resourceId``"""
+    return DataLoader(
+        lambda ids: fetch_by_ids(
+            ids, client.get_resources_by_ids, client.get_resource_by_id
+        ),
+        **options,
+    )
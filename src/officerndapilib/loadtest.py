@@ -0,0 +1,504 @@
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterable, Mapping, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from attrs import asdict, define, field
+
+from officerndapilib.client import ORNDClient, pooled_session
+from officerndapilib.exceptions import HttpException, ValidationException
+from officerndapilib.intervals import BookingIntervalIndex, free_intervals
+from officerndapilib.reqs import (
+    CreateORNDMemberBookingRequest,
+    RetrieveORNDBookingOccurencesRequest,
+    resource_lookup,
+)
+from officerndapilib.schema import ORNDResource
+
+# LOAD TESTING
+
+HOST = "127.0.0.1"
+ORGANIZATION = "load-test"
+OFFICE = "0" * 23 + "1"
+MEMBER = "0" * 23 + "2"
+
+# relative weights of the operations each worker picks from
+DEFAULT_MIX = {"resources": 4, "availability": 3, "checkout": 2, "cancel": 1}
+
+DEFAULT_STAGES = (1, 2, 4, 8, 16)
+
+
+def iso(ts: int) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%S.000Z"
+    )
+
+
+class FakeORNDServer:
+    """In-memory OfficeRnD API on localhost for load tests.
+
+    Serves resource listings, occurrences, checkout summaries, checkouts,
+    cancels and deletes for one organization and office, keeping created
+    bookings and rejecting overlapping ones with a 409. Every request
+    sleeps ``latency`` seconds and fails with a 503 at ``error_rate``.
+
+        with FakeORNDServer(resources=20) as server:
+            client = server.client()
+    """
+
+    def __init__(
+        self,
+        organization: str = ORGANIZATION,
+        resources: int = 10,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.organization = organization
+        self.latency = latency
+        self.error_rate = error_rate
+        self.resources = [
+            {
+                "_id": f"{i + 1:024x}",
+                "name": f"Room {i + 1}",
+                "type": "meeting_room",
+                "office": OFFICE,
+                "size": 8,
+                "timezone": "UTC",
+            }
+            for i in range(resources)
+        ]
+        self.bookings: dict[str, dict[str, Any]] = {}
+        self._index = BookingIntervalIndex()
+        self._ids = iter(range(1, 1 << 62))
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Value for ORNDClient's ``base_url``"""
+        assert self._server is not None, "server is not running"
+        port = self._server.server_port
+        return f"http://{HOST}:{port}/api/v1/organizations/"
+
+    def start(self) -> "FakeORNDServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server._handle(self, "GET")
+
+            def do_POST(self):
+                server._handle(self, "POST")
+
+            def do_DELETE(self):
+                server._handle(self, "DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((HOST, 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeORNDServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def client(self, **options: Any) -> ORNDClient:
+        """A client for this server, sized for ``pool_size`` workers"""
+        pool_size = options.pop("pool_size", 32)
+        options.setdefault("session", pooled_session(pool_size))
+        return ORNDClient(
+            "token", self.organization, base_url=self.base_url, **options
+        )
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str):
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = json.loads(handler.rfile.read(length)) if length else None
+        url = urlsplit(handler.path)
+        prefix = f"/api/v1/organizations/{self.organization}"
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and self._random.random() < self.error_rate:
+            status, payload = 503, {"message": "Service Unavailable"}
+        elif not url.path.startswith(prefix):
+            status, payload = 404, {"message": "Organization not found"}
+        else:
+            path = url.path[len(prefix) :]
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            try:
+                status, payload = 200, self._route(method, path, query, body)
+            except HttpException as e:
+                status, payload = e.status_code, {"message": str(e)}
+            except (KeyError, TypeError, ValueError) as e:
+                status, payload = 400, {"message": f"Bad request: {e}"}
+        content = json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(content)))
+        handler.end_headers()
+        handler.wfile.write(content)
+
+    def _route(
+        self, method: str, path: str, query: dict[str, str], body: Any
+    ) -> Any:
+        parts = path.strip("/").split("/")
+        if method == "GET" and parts == ["resources"]:
+            return [
+                r for r in self.resources if r["type"] == query.get("type")
+            ]
+        if method == "GET" and parts[0] == "resources" and len(parts) == 2:
+            for resource in self.resources:
+                if resource["_id"] == parts[1]:
+                    return resource
+            raise HttpException("Resource not found", 404)
+        if method == "GET" and parts == ["bookings", "occurrences"]:
+            return self._occurrences(query)
+        if method == "POST" and parts == ["bookings", "checkout-summary"]:
+            self._check_free(body)
+            return [{"resourceId": body["resource_id"], "fees": []}]
+        if method == "POST" and parts == ["bookings", "summary"]:
+            return [{"resourceId": body["booking"]["resourceId"]}]
+        if method == "POST" and parts == ["bookings", "checkout"]:
+            return [self._checkout(body)]
+        if parts[0] == "bookings" and len(parts) >= 2:
+            cancel = method == "POST" and parts[2:] == ["cancel"]
+            if cancel or (method == "DELETE" and len(parts) == 2):
+                return self._cancel(parts[1])
+        raise HttpException(f"Cannot {method} {path}", 404)
+
+    def _occurrences(self, query: dict[str, str]) -> list[dict[str, Any]]:
+        start, end = query.get("start", ""), query.get("end", "~")
+        with self._lock:
+            return [
+                booking
+                for booking in self.bookings.values()
+                if booking["resourceId"] == query.get("resourceId")
+                and start <= booking["start"]["dateTime"][:10] < end
+            ]
+
+    def _check_free(self, body: Any):
+        resource_id = body["resource_id"]
+        if self._index.conflicts(resource_id, body["start"], body["end"]):
+            raise HttpException("Resource is already booked", 409)
+
+    def _checkout(self, body: Any) -> dict[str, Any]:
+        with self._lock:
+            self._check_free(body)
+            booking = {
+                "_id": f"{next(self._ids):024x}",
+                "resourceId": body["resource_id"],
+                "office": body["office"],
+                "member": body.get("member"),
+                "start": {"dateTime": body["start"]},
+                "end": {"dateTime": body["end"]},
+                "canceled": False,
+            }
+            self.bookings[booking["_id"]] = booking
+            self._index.add_interval(
+                body["resource_id"], body["start"], body["end"], booking["_id"]
+            )
+        return booking
+
+    def _cancel(self, booking_id: str) -> dict[str, Any]:
+        with self._lock:
+            booking = self.bookings.pop(booking_id, None)
+            if booking is None:
+                raise HttpException("Booking not found", 404)
+            self._index.remove(booking_id)
+        return {**booking, "canceled": True}
+
+
+@define
+class LoadContext:
+    """What one worker's operations share: the client, the office's
+    resources and the IDs of bookings made during the run
+    """
+
+    client: ORNDClient
+    office: str
+    resources: list[ORNDResource]
+    rng: random.Random
+    booked: deque = field(factory=deque)
+    days: int = 14
+
+    def pick_resource(self) -> ORNDResource:
+        return self.rng.choice(self.resources)
+
+    def pick_day(self) -> date:
+        day = date.today() + timedelta(days=self.rng.randint(1, self.days))
+        while day.weekday() >= 5:
+            day += timedelta(days=1)
+        return day
+
+
+Operation = Callable[[LoadContext], Any]
+
+
+def list_resources(ctx: LoadContext) -> Any:
+    return ctx.client.get_all_resources(ctx.office, "meeting_room")
+
+
+def compute_availability(ctx: LoadContext) -> Any:
+    """Fetches a day of occurrences and computes the resource's free gaps"""
+    resource = ctx.pick_resource()
+    day = ctx.pick_day()
+    bookings = ctx.client.get_all_bookings(
+        RetrieveORNDBookingOccurencesRequest(
+            office=ctx.office,
+            resource_id=resource["_id"],
+            start=day.isoformat(),
+            end=(day + timedelta(days=1)).isoformat(),
+        )
+    )
+    index = BookingIntervalIndex(bookings)
+    opens = datetime(day.year, day.month, day.day, 9, tzinfo=timezone.utc)
+    opens_ts = int(opens.timestamp())
+    return free_intervals(
+        index.busy_intervals(resource["_id"]), opens_ts, opens_ts + 9 * 3600
+    )
+
+
+def checkout(ctx: LoadContext) -> Any:
+    """Builds, validates and books a random hour like an application
+    would; the request's resource lookups go through the context's client
+    """
+    day = ctx.pick_day()
+    hour = ctx.rng.randint(9, 17)
+    start = datetime(day.year, day.month, day.day, hour, tzinfo=timezone.utc)
+    request = CreateORNDMemberBookingRequest(
+        organization=ctx.client.organization,
+        office=ctx.office,
+        resource_id=ctx.pick_resource()["_id"],
+        start=iso(int(start.timestamp())),
+        end=iso(int((start + timedelta(hours=1)).timestamp())),
+        summary="Load test",
+        member=MEMBER,
+    )
+    booking = ctx.client.booking_checkout(request)
+    ctx.booked.extend(b["_id"] for b in booking)
+    return booking
+
+
+def cancel(ctx: LoadContext) -> Any:
+    """Cancels a booking made earlier in the run, making one if none is
+    left to cancel
+    """
+    try:
+        booking_id = ctx.booked.popleft()
+    except IndexError:
+        checkout(ctx)
+        booking_id = ctx.booked.popleft()
+    return ctx.client.cancel_booking(booking_id)
+
+
+OPERATIONS: dict[str, Operation] = {
+    "resources": list_resources,
+    "availability": compute_availability,
+    "checkout": checkout,
+    "cancel": cancel,
+}
+
+
+# failures counted per kind instead of stopping a worker
+LOAD_ERRORS = (HttpException, ValidationException, requests.RequestException)
+
+
+def error_kind(error: Exception) -> str:
+    if isinstance(error, (HttpException, ValidationException)):
+        return f"{type(error).__name__} {error.status_code}"
+    return type(error).__name__
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+@define
+class StageResult:
+    """One concurrency level of a load run; latencies in milliseconds and
+    client CPU (the workers' thread time) in milliseconds per operation
+    """
+
+    concurrency: int
+    operations: int = 0
+    elapsed: float = 0.0
+    throughput: float = 0.0
+    latency: dict[str, float] = field(factory=dict)
+    errors: dict[str, int] = field(factory=dict)
+    mix: dict[str, int] = field(factory=dict)
+    cpu_per_operation: float = 0.0
+
+    @property
+    def error_rate(self) -> float:
+        if not self.operations:
+            return 0.0
+        return sum(self.errors.values()) / self.operations
+
+
+@define
+class LoadReport:
+    stages: list[StageResult] = field(factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def format(self) -> str:
+        """Plain-text table, one row per stage"""
+        lines = [
+            "workers\tops/s\tp50ms\tp95ms\tp99ms\terrors\tcpu ms/op"
+        ]
+        for stage in self.stages:
+            lines.append(
+                f"{stage.concurrency}\t{stage.throughput:.1f}"
+                f"\t{stage.latency.get('p50', 0):.1f}"
+                f"\t{stage.latency.get('p95', 0):.1f}"
+                f"\t{stage.latency.get('p99', 0):.1f}"
+                f"\t{stage.error_rate:.1%}"
+                f"\t{stage.cpu_per_operation:.2f}"
+            )
+        return "\n".join(lines)
+
+
+def run_stage(
+    client: ORNDClient,
+    office: str,
+    resources: list[ORNDResource],
+    concurrency: int,
+    duration: float,
+    mix: Mapping[str, float] = DEFAULT_MIX,
+    operations: Mapping[str, Operation] = OPERATIONS,
+    seed: int = 0,
+) -> StageResult:
+    """Runs ``concurrency`` workers for ``duration`` seconds, each picking
+    operations at random by their ``mix`` weight
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    booked: deque = deque()
+    latencies: list[float] = []
+    errors: Counter = Counter()
+    counts: Counter = Counter()
+    cpu = [0.0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def fetch_resource(organization: str, resource_id: str) -> ORNDResource:
+        return client.get_resource_by_id(resource_id)
+
+    def work(worker: int):
+        ctx = LoadContext(
+            client, office, resources, random.Random(seed + worker), booked
+        )
+        mine: list[float] = []
+        my_errors: Counter = Counter()
+        my_counts: Counter = Counter()
+        cpu_started = time.thread_time()
+        # request validations look resources up on the client's API
+        with resource_lookup(fetch_resource):
+            while time.monotonic() < deadline:
+                name = ctx.rng.choices(names, weights)[0]
+                started = time.perf_counter()
+                try:
+                    operations[name](ctx)
+                except LOAD_ERRORS as e:
+                    my_errors[error_kind(e)] += 1
+                mine.append(time.perf_counter() - started)
+                my_counts[name] += 1
+        used = time.thread_time() - cpu_started
+        with lock:
+            latencies.extend(mine)
+            errors.update(my_errors)
+            counts.update(my_counts)
+            cpu[0] += used
+
+    started = time.monotonic()
+    threads = [
+        threading.Thread(target=work, args=(i,), name=f"ornd-load-{i}")
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+    total = len(latencies)
+    return StageResult(
+        concurrency=concurrency,
+        operations=total,
+        elapsed=elapsed,
+        throughput=total / elapsed if elapsed else 0.0,
+        latency={
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": percentile(latencies, 100) * 1000,
+        },
+        errors=dict(errors),
+        mix=dict(counts),
+        cpu_per_operation=cpu[0] / total * 1000 if total else 0.0,
+    )
+
+
+def run_load(
+    client: ORNDClient,
+    office: str = OFFICE,
+    stages: Iterable[int] = DEFAULT_STAGES,
+    duration: float = 10.0,
+    mix: Mapping[str, float] = DEFAULT_MIX,
+    operations: Mapping[str, Operation] = OPERATIONS,
+    seed: int = 0,
+) -> LoadReport:
+    """Ramps concurrency through ``stages``, ``duration`` seconds each
+
+    Runs against whatever ``client`` targets: a FakeORNDServer, or a
+    sandbox organization. Checkouts create real bookings, so never point
+    it at a production organization.
+    """
+    resources = client.get_all_resources(office, "meeting_room")
+    if not resources:
+        raise HttpException(f"Office '{office}' has no meeting rooms", 404)
+    report = LoadReport()
+    for concurrency in stages:
+        report.stages.append(
+            run_stage(
+                client,
+                office,
+                resources,
+                concurrency,
+                duration,
+                mix,
+                operations,
+                seed,
+            )
+        )
+    return report
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from datetime import timezone, tzinfo
+from typing import TYPE_CHECKING, Any, Callable, Optional, cast
+
+from attrs import define
+
+from officerndapilib.schema import ORNDBooking
+
+if TYPE_CHECKING:
+    from officerndapilib.idempotency import IdempotencyLedger
+    from officerndapilib.intervals import BookingIntervalIndex
+    from officerndapilib.quotes import QuoteCache
+    from officerndapilib.recurrence import SeriesCache
+
+# MUTATIONS
+
+BOOKING_CREATED = "booking.created"
+BOOKING_CANCELED = "booking.canceled"
+BOOKING_DELETED = "booking.deleted"
+MEMBER_DELETED = "member.deleted"
+
+MutationHandler = Callable[["MutationEvent"], None]
+
+
+@define(frozen=True)
+class MutationEvent:
+    """A write made through the client, e.g. ``booking.created``
+
+    ``id`` is the written record's, ``object`` the record the API returned
+    when it returned one; naive times in it are read in ``zone``.
+    """
+
+    type: str
+    id: str
+    resource_id: Optional[str] = None
+    object: Any = None
+    zone: tzinfo = timezone.utc
+
+    @property
+    def kind(self) -> str:
+        return self.type.partition(".")[0]
+
+    @property
+    def action(self) -> str:
+        return self.type.partition(".")[2]
+
+
+class MutationPublisher:
+    """Delivers the client's successful writes to subscribed caches.
+
+    Handlers are registered by event kind (``"booking"``) or type
+    (``"booking.canceled"``) and run synchronously once the API has
+    accepted a write, so a read made after the write returns sees it. A
+    failing handler does not fail the write or the other handlers; its
+    event and exception are kept in ``failures``.
+    """
+
+    def __init__(self, max_failures: int = 100):
+        self.failures: deque[tuple[MutationEvent, Exception]] = deque(
+            maxlen=max_failures
+        )
+        self._handlers: dict[str, list[MutationHandler]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, event: str, handler: MutationHandler):
+        with self._lock:
+            self._handlers.setdefault(event, []).append(handler)
+
+    def unregister(self, event: str, handler: MutationHandler):
+        with self._lock:
+            handlers = self._handlers.get(event, [])
+            if handler in handlers:
+                handlers.remove(handler)
+
+    def register_index(self, index: BookingIntervalIndex) -> MutationHandler:
+        """Inserts created bookings into an interval index and removes
+        canceled or deleted ones
+        """
+
+        def apply(event: MutationEvent):
+            if event.action == "created":
+                if isinstance(event.object, dict):
+                    index.add(cast(ORNDBooking, event.object), event.zone)
+            else:
+                index.remove(event.id)
+
+        self.register("booking", apply)
+        return apply
+
+    def register_series(self, series: SeriesCache) -> MutationHandler:
+        """Compiles created recurring bookings into a SeriesCache and drops
+        canceled or deleted ones
+        """
+
+        def apply(event: MutationEvent):
+            if event.action == "created":
+                if isinstance(event.object, dict):
+                    series.add(cast(ORNDBooking, event.object))
+            else:
+                series.remove(event.id)
+
+        self.register("booking", apply)
+        return apply
+
+    def register_quotes(self, quotes: QuoteCache) -> MutationHandler:
+        """Drops the quotes of the resource a booking write touched, or
+        every quote when the resource is unknown
+        """
+
+        def apply(event: MutationEvent):
+            quotes.invalidate(event.resource_id)
+
+        self.register("booking", apply)
+        return apply
+
+    def register_ledger(self, ledger: IdempotencyLedger) -> MutationHandler:
+        """Forgets the idempotency keys of canceled or deleted bookings and
+        deleted members, so creating them again is not answered from the
+        ledger
+        """
+
+        def apply(event: MutationEvent):
+            ledger.forget_record(event.id)
+
+        for event in (BOOKING_CANCELED, BOOKING_DELETED, MEMBER_DELETED):
+            self.register(event, apply)
+        return apply
+
+    def publish(self, event: MutationEvent):
+        with self._lock:
+            handlers = [
+                *self._handlers.get(event.kind, ()),
+                *self._handlers.get(event.type, ()),
+            ]
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                self.failures.append((event, e))
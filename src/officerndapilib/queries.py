@@ -1,4 +1,5 @@
-from typing import Literal, TypeVar, Union
+from typing import Iterable, Literal, TypeVar, Union
+from urllib.parse import quote
 
 # QUERIES
 
@@ -29,11 +30,17 @@ ORNDTimingQueryParams = Literal[
     "modifiedAt.$lt",
 ]
 
+ORNDIdQueryParams = Literal[
+    "_id",
+    "_id.$in",  # comma-separated IDs
+]
+
 ORNDBaseQueryParams = Union[
+    ORNDIdQueryParams,
     ORNDNameQueryParams,
     ORNDPagingQueryParams,
     ORNDTimingQueryParams,
-    Literal["$sort"],
+    Literal["$sort", "$select"],
 ]
 
 ## specific query types
@@ -41,8 +48,9 @@ ORNDBaseQueryParams = Union[
 Q = TypeVar("Q")
 
 ORNDResourceQueryParams = Union[
+    ORNDIdQueryParams,
     ORNDNameQueryParams,
-    Literal["type", "availableFrom", "availableTo", "office"],
+    Literal["type", "availableFrom", "availableTo", "office", "$select"],
 ]
 ORNDCompanyQueryParams = Union[
     ORNDNameQueryParams, ORNDBaseQueryParams, Literal["office"]
@@ -57,14 +65,24 @@ ORNDCompanyQuery = ORNDBaseQuery[ORNDBaseQueryParams, ORNDCompanyQueryParams]
 ORNDMemberQuery = ORNDBaseQuery[ORNDBaseQueryParams, ORNDMemberQueryParams]
 
 
+def encode_query_value(value: Union[str, int, bool]) -> str:
+    """URL-encodes a query value, writing booleans as ``true``/``false``"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return quote(str(value), safe=":,")
+
+
+def encode_queries(queries: Iterable[ORNDBaseQuery]) -> str:
+    """Encodes query tuples into a query string, keeping ``$`` in keys"""
+    return "&".join(
+        f"{quote(q, safe='$.')}={encode_query_value(v)}" for q, v in queries
+    )
+
+
 def append_queries_to_url(url: str, queries: list[ORNDBaseQuery]):
-    if url[-1] != "?":
+    query = encode_queries(queries)
+    if "?" not in url:
         url += "?"
-    for i, qv in enumerate(queries):
-        q = qv[0]
-        v = qv[1]
-        if i == 0:
-            url += f"{q}={v}"
-        else:
-            url += f"&{q}={v}"
-    return url
+    elif query and url[-1] not in "?&":
+        url += "&"
+    return url + query
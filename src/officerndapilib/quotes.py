@@ -0,0 +1,104 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Mapping, Optional
+
+from attrs import define
+
+from officerndapilib.dates import to_timestamp
+
+# QUOTES
+
+# fields holding datetimes, compared as instants rather than strings
+DATETIME_FIELDS = ("start", "end")
+
+
+@define
+class QuoteStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def quote_key(data: Mapping[str, Any]) -> str:
+    """Canonicalizes booking request data into a cache key.
+
+    Keys are sorted and start/end become epoch seconds, so
+    ``2024-03-04T09:00:00Z`` and ``2024-03-04T09:00:00+00:00`` share a quote.
+    """
+    canonical = dict(data)
+    for name in DATETIME_FIELDS:
+        value = canonical.get(name)
+        if isinstance(value, str):
+            try:
+                canonical[name] = to_timestamp(value)
+            except ValueError:
+                pass
+    return json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+
+
+class QuoteCache:
+    """Short-lived checkout-summary quotes keyed by booking request data.
+
+    Quotes expire after ``ttl`` seconds and are dropped early when a booking
+    on the same resource is created or canceled through the client. At most
+    ``max_size`` quotes are kept, least recently used first out.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.stats = QuoteStats()
+        self._quotes: OrderedDict[str, tuple[Any, str, float]]
+        self._quotes = OrderedDict()
+        self._generation = 0  # bumped by invalidate
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    def get_or_quote(
+        self,
+        resource_id: str,
+        data: Mapping[str, Any],
+        loader: Callable[[], Any],
+    ) -> Any:
+        key = quote_key(data)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._quotes.get(key)
+            if entry is not None and now - entry[2] <= self.ttl:
+                self._quotes.move_to_end(key)
+                self.stats.hits += 1
+                return entry[0]
+            self.stats.misses += 1
+            generation = self._generation
+        quote = loader()
+        with self._lock:
+            if generation != self._generation:
+                return quote  # a booking changed while quoting
+            self._quotes[key] = (quote, resource_id, now)
+            self._quotes.move_to_end(key)
+            while len(self._quotes) > self.max_size:
+                self._quotes.popitem(last=False)
+        return quote
+
+    def invalidate(self, resource_id: Optional[str] = None) -> int:
+        """Drops the quotes of a resource, or every quote, returning how many"""
+        with self._lock:
+            keys = [
+                key
+                for key, (_, resource, _) in self._quotes.items()
+                if resource_id is None or resource == resource_id
+            ]
+            for key in keys:
+                del self._quotes[key]
+            self._generation += 1
+            self.stats.invalidations += len(keys)
+        return len(keys)
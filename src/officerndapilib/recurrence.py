@@ -0,0 +1,397 @@
+import calendar
+import heapq
+import threading
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, Union
+
+from attrs import define
+
+from officerndapilib.calendars import calendar_for
+from officerndapilib.dates import parse_datetime
+from officerndapilib.exceptions import ValidationException
+from officerndapilib.intervals import BookingIntervalIndex
+from officerndapilib.schema import ORNDBooking
+
+# RECURRENCE
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+# stop expanding rules that can never match, e.g. BYMONTH=2;BYMONTHDAY=30
+MAX_EMPTY_PERIODS = 1000
+
+Weekday = tuple[int, Optional[int]]  # (weekday, ordinal), Monday = 0
+Occurrence = tuple[datetime, datetime]
+
+
+@define(frozen=True)
+class RecurrenceRule:
+    """A compiled RFC 5545 RRULE.
+
+    Supports FREQ, INTERVAL, COUNT, UNTIL, BYDAY (with ordinals for monthly
+    and yearly rules), BYMONTHDAY and BYMONTH, which covers the recurrences
+    OfficeRnD creates.
+    """
+
+    freq: str
+    interval: int = 1
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    by_weekday: tuple[Weekday, ...] = ()
+    by_month_day: tuple[int, ...] = ()
+    by_month: tuple[int, ...] = ()
+
+    def occurrences(
+        self,
+        dtstart: datetime,
+        window_start: Optional[datetime] = None,
+        window_end: Optional[datetime] = None,
+    ) -> Iterator[datetime]:
+        """Lazily yields occurrence starts in [window_start, window_end)
+
+        Occurrences repeat the wall-clock time and weekdays of ``dtstart`` in
+        its timezone, so pass it in the office's zone for a series to keep
+        its local time across DST changes. Without COUNT, periods before the
+        window are skipped arithmetically instead of being generated.
+        """
+        until = self.until
+        if until is not None and until.tzinfo is None:
+            until = until.replace(tzinfo=dtstart.tzinfo)
+        first_period = 0
+        if window_start is not None and self.count is None:
+            first_period = self._period_index(dtstart, window_start)
+            first_period -= first_period % self.interval
+
+        emitted = 0
+        empty = 0
+        k = first_period
+        while empty < MAX_EMPTY_PERIODS:
+            days = self._period_days(dtstart, k)
+            k += self.interval
+            empty = 0 if days else empty + 1
+            for day in days:
+                start = datetime.combine(day, dtstart.timetz())
+                if start < dtstart:
+                    continue
+                if until is not None and start > until:
+                    return
+                if window_end is not None and start >= window_end:
+                    return
+                emitted += 1
+                if window_start is None or start >= window_start:
+                    yield start
+                if self.count is not None and emitted >= self.count:
+                    return
+
+    def _period_index(self, dtstart: datetime, when: datetime) -> int:
+        if when.tzinfo is not None and dtstart.tzinfo is not None:
+            when = when.astimezone(dtstart.tzinfo)
+        first, day = dtstart.date(), when.date()
+        if self.freq == "DAILY":
+            k = (day - first).days
+        elif self.freq == "WEEKLY":
+            k = (day - week_start(first)).days // 7
+        elif self.freq == "MONTHLY":
+            k = (day.year - first.year) * 12 + day.month - first.month
+        else:
+            k = day.year - first.year
+        return max(k, 0)
+
+    def _period_days(self, dtstart: datetime, k: int) -> list[date]:
+        first = dtstart.date()
+        if self.freq == "DAILY":
+            day = first + timedelta(days=k)
+            return [day] if self._matches(day) else []
+        if self.freq == "WEEKLY":
+            monday = week_start(first) + timedelta(days=7 * k)
+            weekdays = sorted(
+                {weekday for weekday, _ in self.by_weekday}
+                or {first.weekday()}
+            )
+            days = [monday + timedelta(days=w) for w in weekdays]
+            return [day for day in days if self._matches(day)]
+        if self.freq == "MONTHLY":
+            month = first.month - 1 + k
+            year, month = first.year + month // 12, month % 12 + 1
+            if self.by_month and month not in self.by_month:
+                return []
+            return self._month_days(year, month, first.day)
+        year = first.year + k
+        return [
+            day
+            for month in self.by_month or (first.month,)
+            for day in self._month_days(year, month, first.day)
+        ]
+
+    def _month_days(self, year: int, month: int, default: int) -> list[date]:
+        length = calendar.monthrange(year, month)[1]
+        days: Optional[set[int]] = None
+        if self.by_month_day:
+            days = {d if d > 0 else length + d + 1 for d in self.by_month_day}
+        if self.by_weekday:
+            first_weekday = date(year, month, 1).weekday()
+            matching = set()
+            for weekday, ordinal in self.by_weekday:
+                candidates = list(
+                    range(1 + (weekday - first_weekday) % 7, length + 1, 7)
+                )
+                if ordinal is None:
+                    matching.update(candidates)
+                elif 0 < abs(ordinal) <= len(candidates):
+                    i = ordinal - 1 if ordinal > 0 else ordinal
+                    matching.add(candidates[i])
+            days = matching if days is None else days & matching
+        if days is None:
+            days = {default}
+        return [date(year, month, d) for d in sorted(days) if 1 <= d <= length]
+
+    def _matches(self, day: date) -> bool:
+        if self.by_month and day.month not in self.by_month:
+            return False
+        if self.by_month_day:
+            length = calendar.monthrange(day.year, day.month)[1]
+            if not any(
+                day.day == (d if d > 0 else length + d + 1)
+                for d in self.by_month_day
+            ):
+                return False
+        if self.by_weekday and day.weekday() not in {
+            weekday for weekday, _ in self.by_weekday
+        }:
+            return False
+        return True
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def parse_until(value: str) -> datetime:
+    """Parses an RRULE UNTIL value, a date being inclusive of the whole day"""
+    if "T" not in value:
+        return datetime.strptime(value, "%Y%m%d").replace(
+            hour=23, minute=59, second=59
+        )
+    until = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S")
+    return until.replace(tzinfo=timezone.utc) if value.endswith("Z") else until
+
+
+def parse_weekday(value: str) -> Weekday:
+    code, ordinal = value[-2:], value[:-2]
+    if code not in WEEKDAYS or ordinal in ("+", "-"):
+        raise ValueError(f"invalid BYDAY '{value}'")
+    return WEEKDAYS.index(code), int(ordinal) if ordinal else None
+
+
+@lru_cache(maxsize=1024)
+def parse_rrule(rrule: str) -> RecurrenceRule:
+    """Compiles an RRULE string such as ``FREQ=WEEKLY;BYDAY=MO,WE``.
+
+    An ``RRULE:`` prefix and other iCalendar lines (e.g. DTSTART) are
+    ignored; the series start comes from the booking. Compiled rules are
+    cached, so every occurrence of a series shares one rule.
+    """
+    line = next(
+        (
+            line
+            for line in rrule.strip().splitlines()
+            if "FREQ=" in line.upper()
+        ),
+        "",
+    )
+    if line.upper().startswith("RRULE:"):
+        line = line[6:]
+    try:
+        parts = dict(
+            part.split("=", 1) for part in line.upper().split(";") if part
+        )
+        freq = parts.pop("FREQ")
+        if freq not in FREQUENCIES:
+            raise ValueError(f"unsupported FREQ '{freq}'")
+        parts.pop("WKST", None)  # weeks always start on Monday
+        rule = RecurrenceRule(
+            freq=freq,
+            interval=int(parts.pop("INTERVAL", 1)),
+            count=int(parts["COUNT"]) if "COUNT" in parts else None,
+            until=parse_until(parts["UNTIL"]) if "UNTIL" in parts else None,
+            by_weekday=tuple(
+                parse_weekday(day)
+                for day in parts.pop("BYDAY", "").split(",")
+                if day
+            ),
+            by_month_day=tuple(
+                int(d) for d in parts.pop("BYMONTHDAY", "").split(",") if d
+            ),
+            by_month=tuple(
+                int(m) for m in parts.pop("BYMONTH", "").split(",") if m
+            ),
+        )
+        parts.pop("COUNT", None)
+        parts.pop("UNTIL", None)
+        if parts:
+            raise ValueError(f"unsupported parts {sorted(parts)}")
+        if rule.interval < 1:
+            raise ValueError("INTERVAL must be positive")
+    except (KeyError, ValueError) as e:
+        raise ValidationException(f"Invalid rrule '{rrule}': {e}")
+    return rule
+
+
+@define(frozen=True)
+class RecurringSeries:
+    """A recurring booking: its compiled rule, first start and duration
+
+    ``start`` is local to the booking's timezone; occurrences are expanded
+    there and returned in UTC.
+    """
+
+    booking_id: str
+    resource_id: str
+    rule: RecurrenceRule
+    start: datetime
+    duration: timedelta
+
+    def occurrences(
+        self,
+        window_start: Optional[datetime] = None,
+        window_end: Optional[datetime] = None,
+    ) -> Iterator[Occurrence]:
+        """Lazily yields (start, end) of occurrences overlapping the window"""
+        if window_start is not None:
+            window_start = window_start - self.duration + timedelta(
+                microseconds=1
+            )
+        for start in self.rule.occurrences(
+            self.start, window_start, window_end
+        ):
+            start = start.astimezone(timezone.utc)
+            yield start, start + self.duration
+
+
+def compile_series(
+    booking: ORNDBooking, timezone: Optional[str] = None
+) -> Optional[RecurringSeries]:
+    """Compiles a booking's recurrence, None if it does not recur
+
+    The rule is expanded in the booking's ``timezone``, else ``timezone``
+    (e.g. its resource's or office's), else UTC; naive times are read in it.
+    """
+    recurrence = booking.get("recurrence") or {}
+    rrule = recurrence.get("rrule")
+    if not rrule:
+        return None
+    zone = calendar_for(None, booking.get("timezone") or timezone).zone
+    start = as_zone(booking["start"]["dateTime"], zone)
+    end = as_zone(booking["end"]["dateTime"], zone)
+    return RecurringSeries(
+        booking_id=booking["_id"],
+        resource_id=booking["resourceId"],
+        rule=parse_rrule(rrule),
+        start=start,
+        duration=as_utc(end) - as_utc(start),
+    )
+
+
+def as_zone(value: Union[str, datetime], zone: tzinfo) -> datetime:
+    """A datetime in ``zone``, reading a naive one as local to it"""
+    dt = parse_datetime(value) if isinstance(value, str) else value
+    return dt.astimezone(zone) if dt.tzinfo else dt.replace(tzinfo=zone)
+
+
+def as_utc(value: Union[str, datetime]) -> datetime:
+    return as_zone(value, timezone.utc)
+
+
+def tag_occurrences(
+    series: RecurringSeries, window_start: datetime, window_end: datetime
+) -> Iterator[tuple[RecurringSeries, datetime, datetime]]:
+    for start, end in series.occurrences(window_start, window_end):
+        yield series, start, end
+
+
+class SeriesCache:
+    """Compiled recurring series by booking ID.
+
+    Each series is compiled once when added; occurrences are expanded
+    locally, in any window, instead of being fetched from
+    ``bookings/occurrences``. Bookings without a timezone of their own are
+    expanded in ``timezone``, e.g. their office's.
+    """
+
+    def __init__(
+        self,
+        bookings: Iterable[ORNDBooking] = (),
+        timezone: Optional[str] = None,
+    ):
+        self.timezone = timezone
+        self._series: dict[str, RecurringSeries] = {}
+        self._lock = threading.Lock()
+        self.add_all(bookings)
+
+    def __contains__(self, booking_id: str) -> bool:
+        return booking_id in self._series
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def get(self, booking_id: str) -> Optional[RecurringSeries]:
+        return self._series.get(booking_id)
+
+    def add(self, booking: ORNDBooking) -> Optional[RecurringSeries]:
+        """Compiles and caches a recurring booking, ignoring canceled ones"""
+        if booking.get("canceled"):
+            return None
+        series = compile_series(booking, self.timezone)
+        if series is not None:
+            with self._lock:
+                self._series[series.booking_id] = series
+        return series
+
+    def add_all(self, bookings: Iterable[ORNDBooking]):
+        for booking in bookings:
+            self.add(booking)
+
+    def remove(self, booking_id: str) -> bool:
+        with self._lock:
+            return self._series.pop(booking_id, None) is not None
+
+    def occurrences(
+        self,
+        window_start: Union[str, datetime],
+        window_end: Union[str, datetime],
+        resource_id: Optional[str] = None,
+        zone: tzinfo = timezone.utc,
+    ) -> Iterator[tuple[RecurringSeries, datetime, datetime]]:
+        """Lazily yields (series, start, end) in the window, earliest first
+
+        A naive window is read in ``zone``, e.g. an OfficeCalendar's.
+        """
+        start = as_zone(window_start, zone)
+        end = as_zone(window_end, zone)
+        with self._lock:
+            series = [
+                s
+                for s in self._series.values()
+                if resource_id is None or s.resource_id == resource_id
+            ]
+        return heapq.merge(
+            *(tag_occurrences(s, start, end) for s in series),
+            key=lambda occurrence: occurrence[1],
+        )
+
+    def expand_into(
+        self,
+        index: BookingIntervalIndex,
+        window_start: Union[str, datetime],
+        window_end: Union[str, datetime],
+        resource_id: Optional[str] = None,
+        zone: tzinfo = timezone.utc,
+    ):
+        """Adds the occurrences in a window to a booking interval index"""
+        for series, start, end in self.occurrences(
+            window_start, window_end, resource_id, zone
+        ):
+            index.add_interval(
+                series.resource_id, start, end, series.booking_id
+            )
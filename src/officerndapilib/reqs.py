@@ -1,20 +1,43 @@
 import re
-from datetime import datetime, timezone
-from typing import Optional
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 from attrs import define, field, validators, converters, asdict
 
-from officerndapilib import get_resource_by_id
+from officerndapilib.api import get_resource_by_id
+from officerndapilib.calendars import OfficeCalendar, calendar_for
+from officerndapilib.dates import parse_datetime
 from officerndapilib.exceptions import ValidationException
+from officerndapilib.schema import ORNDResource
+
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+ORND_ID_PATTERN = re.compile(r"^[0-9a-fA-F]{24}$")
+ORND_PASSWORD_PATTERN = re.compile(r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d|\W).{8,}$")
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+TIME_PATTERN = re.compile(r"\d{2}:\d{2}(:\d{2})?(Z)?")
+
+# resource lookups shared by every request validated in one batch
+_resource_memo: ContextVar[Optional[dict[tuple[str, str], ORNDResource]]] = (
+    ContextVar("_resource_memo", default=None)
+)
+
+# (organization, resource ID) -> resource, replacing get_resource_by_id
+ResourceLookup = Callable[[str, str], ORNDResource]
+_resource_lookup: ContextVar[Optional[ResourceLookup]] = ContextVar(
+    "_resource_lookup", default=None
+)
 
 
 def attrs_is_email(instance, attribute, value):
-    if not re.match(r"[^@]+@[^@]+\.[^@]+", value):
+    if not EMAIL_PATTERN.match(value):
         raise ValueError(f"{value} is not a valid email address")
 
 
 def attrs_valid_ornd_id(instance, attribute, value):
-    if not re.match(r"^[0-9a-fA-F]{24}$", value):
+    if not ORND_ID_PATTERN.match(value):
         raise ValueError(f"{value} is not a valid ORND ID")
 
 
@@ -23,27 +46,50 @@ def attrs_valid_ornd_password(instance, attribute, value):
     Password must be at least 8 characters long and contain 3 out of the 4 elements:
     uppercase letter, lowercase letter, digit or symbol.
     """
-    if not re.match(r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d|\W).{8,}$", value):
+    if not ORND_PASSWORD_PATTERN.match(value):
         raise ValueError(f"{value} is not a valid password")
 
 
 def attrs_is_ISO8601_datetime(instance, attribute, value):
-    dt_obj = datetime.fromisoformat(value)  # raises ValueError if not valid
-    dt_str = value.split("T")
-    if len(dt_str) != 2:
+    parse_datetime(value)  # raises ValueError if not valid, result is cached
+    date, sep, time = value.partition("T")
+    if not sep or "T" in time:
         raise ValueError(f"{value} is not a valid datetime")
-    date, time = dt_str
-    if not re.match(r"\d{4}-\d{2}-\d{2}", date):
+    if not DATE_PATTERN.match(date):
         raise ValueError(f"{date} is not a valid date")
-    if not re.match(r"\d{2}:\d{2}(:\d{2})?(Z)?", time):
+    if not TIME_PATTERN.match(time):
         raise ValueError(f"{time} is not a valid time")
 
 
 def attrs_is_ISO8601_date(instance, attribute, value):
-    if not re.match(r"\d{4}-\d{2}-\d{2}", value):
+    if not DATE_PATTERN.match(value):
         raise ValueError(f"{value} is not a valid date")
 
 
+def lookup_resource(organization: str, resource_id: str) -> ORNDResource:
+    """Retrieves a resource, reusing lookups made earlier in the same batch"""
+    fetch = _resource_lookup.get() or get_resource_by_id
+    memo = _resource_memo.get()
+    if memo is None:
+        return fetch(organization, resource_id)
+    key = (organization, resource_id)
+    if key not in memo:
+        memo[key] = fetch(organization, resource_id)
+    return memo[key]
+
+
+@contextmanager
+def resource_lookup(fetch: ResourceLookup) -> Iterator[None]:
+    """Fetches the resources booking validations need with ``fetch`` in
+    this context (and thread), e.g. through a client for another base URL
+    """
+    token = _resource_lookup.set(fetch)
+    try:
+        yield
+    finally:
+        _resource_lookup.reset(token)
+
+
 @define(kw_only=True)
 class CreateORNDMemberRequest:
     startDate: str = field(
@@ -122,8 +168,16 @@ class CreateORNDWebBookingRequest:
     def __attrs_post_init__(self):
         self.run_validations()
 
+    @property
+    def start_datetime(self) -> datetime:
+        return parse_datetime(self.start)
+
+    @property
+    def end_datetime(self) -> datetime:
+        return parse_datetime(self.end)
+
     def is_bookable_resource(self) -> bool:
-        resource = get_resource_by_id(self.organization, self.resource_id)
+        resource = lookup_resource(self.organization, self.resource_id)
         if resource["type"] not in [
             "meeting_room",
             "hotdesk",
@@ -134,59 +188,77 @@ class CreateORNDWebBookingRequest:
         return False
 
     def is_start_before_end(self) -> bool:
-        start = datetime.fromisoformat(self.start)
-        end = datetime.fromisoformat(self.end)
-        if start > end:
+        if self.start_datetime > self.end_datetime:
             raise ValidationException("Booking start is after end")
         return True
 
-    def is_weekday(self) -> bool:
-        start = datetime.fromisoformat(self.start)
-        end = datetime.fromisoformat(self.end)
-        if start.weekday() in [5, 6] or end.weekday() in [5, 6]:
+    def office_calendar(self) -> OfficeCalendar:
+        """The office's registered calendar, else the default hours in the
+        resource's timezone
+        """
+        resource = lookup_resource(self.organization, self.resource_id)
+        return calendar_for(self.office, resource.get("timezone"))
+
+    def is_weekday(self, calendar: Optional[OfficeCalendar] = None) -> bool:
+        calendar = calendar or calendar_for(self.office)
+        if calendar.is_weekend(
+            calendar.timestamp(self.start_datetime)
+        ) or calendar.is_weekend(calendar.timestamp(self.end_datetime)):
             raise ValidationException("Booking is on a weekend")
         return True
 
-    def is_not_outside_office_hours(self) -> bool:
-        start = datetime.fromisoformat(self.start)
-        end = datetime.fromisoformat(self.end)
-        if (
-            start.time() < datetime.strptime("09:00", "%H:%M").time()
-            or end.time() > datetime.strptime("18:00", "%H:%M").time()
-        ):
+    def is_not_outside_office_hours(
+        self, calendar: Optional[OfficeCalendar] = None
+    ) -> bool:
+        calendar = calendar or calendar_for(self.office)
+        start = calendar.timestamp(self.start_datetime)
+        end = calendar.timestamp(self.end_datetime)
+        if calendar.window_at(start) is None:
+            day = calendar.local_date(start).isoformat()
+            raise ValidationException(f"Office is closed on {day}")
+        if not calendar.is_open(start, end):
             raise ValidationException("Booking is outside office hours")
         return True
 
     def is_not_longer_than_8_hours(self) -> bool:
-        start = datetime.fromisoformat(self.start)
-        end = datetime.fromisoformat(self.end)
-        if (end - start).seconds / 3600 > 8:
+        if (self.end_datetime - self.start_datetime).seconds / 3600 > 8:
             raise ValidationException("Booking is longer than 8 hours")
         return True
 
-    def is_not_in_the_past(self) -> bool:
-        start = datetime.fromisoformat(self.start)
-        start = start.replace(tzinfo=timezone.utc)
-        if start < datetime.now(timezone.utc):
+    def is_not_in_the_past(
+        self, calendar: Optional[OfficeCalendar] = None
+    ) -> bool:
+        calendar = calendar or calendar_for(self.office)
+        if calendar.timestamp(self.start_datetime) < time.time():
             raise ValidationException("Booking is in the past")
         return True
 
-    def is_not_greater_than_30_days_in_future(self) -> bool:
-        now = datetime.now(timezone.utc)
-        booking_start = datetime.fromisoformat(self.start)
-        booking_start = booking_start.replace(tzinfo=timezone.utc)
-        if (booking_start - now).days > 30:
+    def is_not_greater_than_30_days_in_future(
+        self, calendar: Optional[OfficeCalendar] = None
+    ) -> bool:
+        calendar = calendar or calendar_for(self.office)
+        ahead = calendar.timestamp(self.start_datetime) - time.time()
+        if ahead >= 31 * 86400:
             raise ValidationException("Booking is greater than 30 days")
         return True
 
     def run_validations(self):
-        self.is_bookable_resource()
+        # one resource lookup for the type and timezone checks
+        token = None
+        if _resource_memo.get() is None:
+            token = _resource_memo.set({})
+        try:
+            self.is_bookable_resource()
+            calendar = self.office_calendar()
+        finally:
+            if token is not None:
+                _resource_memo.reset(token)
         self.is_start_before_end()
-        self.is_weekday()
-        self.is_not_in_the_past()
-        self.is_not_outside_office_hours()
+        self.is_weekday(calendar)
+        self.is_not_in_the_past(calendar)
+        self.is_not_outside_office_hours(calendar)
         self.is_not_longer_than_8_hours()
-        self.is_not_greater_than_30_days_in_future()
+        self.is_not_greater_than_30_days_in_future(calendar)
 
 
 @define(kw_only=True)
@@ -222,3 +294,37 @@ class RetrieveORNDBookingOccurencesRequest:
     @property
     def data(self):
         return asdict(self)
+
+
+@define
+class BatchValidationResult:
+    """Outcome of validating a list of request payloads in one call"""
+
+    valid: dict[int, Any] = field(factory=dict)
+    errors: dict[int, Exception] = field(factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def validate_requests(
+    request_cls: type, payloads: Iterable[dict[str, Any]]
+) -> BatchValidationResult:
+    """Builds and validates a request model for every payload.
+
+    Invalid payloads do not stop the batch; their exceptions are returned in
+    ``errors`` keyed by payload index. Resource lookups made by booking
+    validations are shared across the batch, so each resource is fetched once.
+    """
+    result = BatchValidationResult()
+    token = _resource_memo.set({})
+    try:
+        for i, payload in enumerate(payloads):
+            try:
+                result.valid[i] = request_cls(**payload)
+            except (ValueError, TypeError, ValidationException) as e:
+                result.errors[i] = e
+    finally:
+        _resource_memo.reset(token)
+    return result
@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Callable, Optional, TypeVar
+
+from attrs import define
+
+# RESILIENCE
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fails fast after repeated errors or slow calls on an endpoint.
+
+    After ``failure_threshold`` consecutive failures (calls slower than
+    ``latency_threshold`` seconds count as failures) the circuit opens and
+    calls are rejected for ``recovery_time`` seconds. A single trial call is
+    then let through; it closes the circuit on success or re-opens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_time: float = 30.0,
+        latency_threshold: Optional[float] = None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.latency_threshold = latency_threshold
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Returns True if a call may be made now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and (
+                time.monotonic() - self._opened_at >= self.recovery_time
+            ):
+                self.state = HALF_OPEN  # this caller makes the trial call
+                return True
+            return False
+
+    def record_success(self, latency: float = 0.0):
+        if self.latency_threshold and latency > self.latency_threshold:
+            self.record_failure()
+            return
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if (
+                self.state == HALF_OPEN
+                or self.failures >= self.failure_threshold
+            ):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+
+@define(frozen=True)
+class BreakerSettings:
+    failure_threshold: int = 5
+    recovery_time: float = 30.0
+    latency_threshold: Optional[float] = None
+
+
+class CircuitBreakers:
+    """Creates one CircuitBreaker per endpoint with shared settings"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_time: float = 30.0,
+        latency_threshold: Optional[float] = None,
+    ):
+        self.settings = BreakerSettings(
+            failure_threshold, recovery_time, latency_threshold
+        )
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(
+                    self.settings.failure_threshold,
+                    self.settings.recovery_time,
+                    self.settings.latency_threshold,
+                )
+            return self._breakers[endpoint]
+
+    def states(self) -> dict[str, str]:
+        return {name: b.state for name, b in self._breakers.items()}
+
+
+class LatencyTracker:
+    """Rolling window of call latencies with a percentile estimate"""
+
+    def __init__(self, size: int = 200):
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def record(self, latency: float):
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def hedged_call(
+    pool: ThreadPoolExecutor, fn: Callable[[], T], delay: float
+) -> T:
+    """Calls ``fn``, starting a second attempt if the first has not
+    finished after ``delay`` seconds, and returns the first success.
+
+    If both attempts fail, the first attempt's exception is raised.
+    """
+    first = pool.submit(fn)
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+    attempts: list[Future] = [first, pool.submit(fn)]
+    pending = set(attempts)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+    return first.result()  # both failed
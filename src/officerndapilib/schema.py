@@ -159,6 +159,13 @@ class ORNDLocation(TypedDict):
     image: Optional[str]
 
 
+class ORNDOffice(ORNDLocation):
+    _id: str
+    organization: str
+    createdAt: str
+    modifiedAt: str
+
+
 class ORNDCompany(TypedDict):
     name: str
     office: ORNDLocation
@@ -0,0 +1,188 @@
+import json
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Optional,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+# SERIALIZATION
+
+# fastest first; the first importable backend is the default
+BACKENDS = ("msgspec", "orjson", "json")
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+class Serializer:
+    """JSON encoder/decoder backed by msgspec, orjson or the stdlib.
+
+    ``loads`` always returns plain dicts and lists so callers can keep
+    indexing responses like the schema TypedDicts; ``loads_as`` decodes into
+    typed msgspec structs generated from those TypedDicts.
+    """
+
+    # the backend's own functions, called without a wrapper
+    loads: Callable[[Union[bytes, str]], Any]
+    dumps: Callable[[Any], bytes]
+    decode_errors: tuple[type[Exception], ...]
+
+    def __init__(self, backend: Optional[str] = None):
+        self.backend = backend or available_backends()[0]
+        self.decode_errors = (ValueError,)
+        if self.backend == "msgspec":
+            import msgspec
+
+            self.decode_errors = (ValueError, msgspec.DecodeError)
+            self._decoder = msgspec.json.Decoder()
+            self._encoder = msgspec.json.Encoder()
+            self.loads = self._decoder.decode
+            self.dumps = self._encoder.encode
+        elif self.backend == "orjson":
+            import orjson
+
+            self.loads = orjson.loads
+            self.dumps = orjson.dumps
+        elif self.backend == "json":
+            self.loads = json_loads
+            self.dumps = json_dumps
+        else:
+            raise ValueError(f"Unknown JSON backend '{self.backend}'")
+
+    def __repr__(self):
+        return f"Serializer(backend={self.backend!r})"
+
+    def loads_as(self, data: Union[bytes, str], type: Any) -> Any:
+        """Decodes into msgspec structs for ``type``, e.g. list[ORNDMember]
+
+        Requires msgspec. Struct fields default to None, so sparse API
+        payloads still decode.
+        """
+        import msgspec
+
+        return msgspec.json.decode(data, type=msgspec_type(type))
+
+    def loads_fields(
+        self, data: Union[bytes, str], fields: tuple[str, ...]
+    ) -> Any:
+        """Decodes a record or list of records keeping only ``fields``
+
+        With msgspec the other fields are skipped while parsing rather than
+        built and then dropped.
+        """
+        if self.backend == "msgspec":
+            import msgspec
+
+            decoded = msgspec.json.decode(data, type=projection_type(fields))
+            return msgspec.to_builtins(decoded)
+        return project(self.loads(data), fields)
+
+
+@lru_cache(maxsize=None)
+def available_backends() -> tuple[str, ...]:
+    """Returns the importable JSON backends, fastest first"""
+    found = []
+    for backend in BACKENDS[:-1]:
+        try:
+            __import__(backend)
+        except ImportError:
+            continue
+        found.append(backend)
+    return (*found, "json")
+
+
+@lru_cache(maxsize=None)
+def get_serializer(backend: Optional[str] = None) -> Serializer:
+    """Returns a shared serializer for a backend, the fastest by default"""
+    return Serializer(backend)
+
+
+@lru_cache(maxsize=None)
+def msgspec_struct(typed_dict: type) -> type:
+    """Generates a msgspec struct mirroring a schema TypedDict
+
+    Keys starting with an underscore (``_id``) become fields without it that
+    keep the original name on the wire.
+    """
+    import msgspec
+
+    fields = []
+    for name, hint in get_type_hints(typed_dict).items():
+        attr = name.lstrip("_") or name
+        default = msgspec.field(
+            default=None, name=name if attr != name else None
+        )
+        fields.append((attr, Optional[msgspec_type(hint)], default))
+    return msgspec.defstruct(typed_dict.__name__, fields, kw_only=True)
+
+
+def is_typeddict(hint: Any) -> bool:
+    return (
+        isinstance(hint, type)
+        and issubclass(hint, dict)
+        and hasattr(hint, "__total__")
+    )
+
+
+def msgspec_type(hint: Any) -> Any:
+    """Replaces TypedDicts nested in a type hint with msgspec structs"""
+    if is_typeddict(hint):
+        return msgspec_struct(hint)
+    args = get_args(hint)
+    origin = get_origin(hint)
+    if not args or origin is None:
+        return hint
+    converted = tuple(msgspec_type(arg) for arg in args)
+    if origin is Union:
+        return Union[converted]  # type: ignore[return-value]
+    if origin in (list, dict, tuple, set):
+        return origin[converted]
+    return hint
+
+
+def projected_fields(fields: Iterable[str]) -> tuple[str, ...]:
+    """Normalizes a field projection, always keeping ``_id``"""
+    return tuple(dict.fromkeys(("_id", *fields)))
+
+
+def project(data: Any, fields: Iterable[str]) -> Any:
+    """Drops all but ``fields`` from a decoded record or list of records"""
+    keep = frozenset(fields)
+
+    def pick(record: Any) -> Any:
+        if not isinstance(record, dict):
+            return record
+        return {k: v for k, v in record.items() if k in keep}
+
+    if isinstance(data, list):
+        return [pick(record) for record in data]
+    return pick(data)
+
+
+@lru_cache(maxsize=256)
+def projection_type(fields: tuple[str, ...]) -> Any:
+    """msgspec type decoding only ``fields`` of a record or list of records
+
+    Missing fields are left out of the result rather than set to None.
+    """
+    import msgspec
+
+    struct = msgspec.defstruct(
+        "Projection",
+        [
+            (f"f{i}", Any, msgspec.field(default=msgspec.UNSET, name=name))
+            for i, name in enumerate(fields)
+        ],
+    )
+    return Union[list[struct], struct]  # type: ignore[valid-type]
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+from typing import Callable, Iterable, Iterator, Optional, TypeVar, get_args
+
+from officerndapilib.client import ORNDClient
+from officerndapilib.reqs import RetrieveORNDBookingOccurencesRequest
+from officerndapilib.schema import (
+    ORNDBooking,
+    ORNDMember,
+    ORNDResource,
+    ORNDResourceType,
+)
+
+# STREAMS
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+RESOURCE_TYPES: tuple[ORNDResourceType, ...] = get_args(ORNDResourceType)
+
+# days per occurrences request, keeping each response under its $limit
+BOOKING_WINDOW_DAYS = 7
+
+
+def fan_out(
+    fn: Callable[[T], Iterable[R]],
+    items: Iterable[T],
+    max_workers: int = 8,
+) -> Iterator[R]:
+    """Calls ``fn`` for every item concurrently, yielding results as they
+    complete.
+
+    At most ``max_workers`` calls are in flight, so items are consumed
+    lazily and memory stays bounded however many there are.
+    """
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = set()
+        for item in items:
+            pending.add(pool.submit(fn, item))
+            if len(pending) < max_workers:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def office_ids(
+    client: ORNDClient, offices: Optional[Iterable[str]] = None
+) -> list[str]:
+    if offices:
+        return list(offices)
+    return [office["_id"] for office in client.get_all_offices()]
+
+
+def iter_members(
+    client: ORNDClient,
+    offices: Optional[Iterable[str]] = None,
+    max_workers: int = 8,
+) -> Iterator[ORNDMember]:
+    """Streams the members of every office (all offices by default)"""
+    return fan_out(
+        client.get_all_members, office_ids(client, offices), max_workers
+    )
+
+
+def iter_resources(
+    client: ORNDClient,
+    offices: Optional[Iterable[str]] = None,
+    types: Iterable[ORNDResourceType] = RESOURCE_TYPES,
+    max_workers: int = 8,
+) -> Iterator[ORNDResource]:
+    """Streams the resources of every office and type"""
+    pairs = [
+        (office, type)
+        for office in office_ids(client, offices)
+        for type in types
+    ]
+    return fan_out(
+        lambda pair: client.get_all_resources(*pair), pairs, max_workers
+    )
+
+
+def date_windows(
+    start: date, end: date, days: int = BOOKING_WINDOW_DAYS
+) -> Iterator[tuple[date, date]]:
+    """Splits [start, end) into consecutive windows of at most ``days``"""
+    while start < end:
+        window_end = min(start + timedelta(days=days), end)
+        yield start, window_end
+        start = window_end
+
+
+def iter_bookings(
+    client: ORNDClient,
+    resources: Iterable[ORNDResource],
+    start: date,
+    end: date,
+    max_workers: int = 8,
+) -> Iterator[ORNDBooking]:
+    """Streams booking occurrences of resources between two dates
+
+    Each resource is fetched one window of BOOKING_WINDOW_DAYS at a time.
+    Occurrences spanning two windows are only yielded from the first.
+    """
+    first_day = start.isoformat()
+
+    def requests() -> Iterator[RetrieveORNDBookingOccurencesRequest]:
+        for resource in resources:
+            for window_start, window_end in date_windows(start, end):
+                yield RetrieveORNDBookingOccurencesRequest(
+                    office=resource["office"],
+                    resource_id=resource["_id"],
+                    start=window_start.isoformat(),
+                    end=window_end.isoformat(),
+                )
+
+    def fetch(request: RetrieveORNDBookingOccurencesRequest):
+        return [
+            booking
+            for booking in client.get_all_bookings(request)
+            if request.start == first_day
+            or booking["start"]["dateTime"][:10] >= (request.start or "")
+        ]
+
+    return fan_out(fetch, requests(), max_workers)
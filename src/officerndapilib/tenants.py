@@ -0,0 +1,211 @@
+import threading
+import time
+from typing import Any, Iterator, Optional
+
+from officerndapilib import api
+from officerndapilib.client import ORNDClient, pooled_session
+from officerndapilib.exceptions import HttpException, ValidationException
+from officerndapilib.ratelimit import RateLimiter
+from officerndapilib.schema import ORNDAuth
+
+# TENANTS
+
+# refresh tokens this many seconds before they expire
+TOKEN_REFRESH_MARGIN = 60.0
+DEFAULT_TOKEN_TTL = 3600.0
+
+
+class TokenCache:
+    """Caches an organization's access token until shortly before expiry"""
+
+    def __init__(
+        self, auth: ORNDAuth, refresh_margin: float = TOKEN_REFRESH_MARGIN
+    ):
+        self.auth = auth
+        self.refresh_margin = refresh_margin
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> str:
+        """Returns a valid token, requesting a new one if needed"""
+        with self._lock:
+            if self._token is None or time.monotonic() >= self._expires_at:
+                data = api.request_ornd_token(self.auth)
+                ttl = float(data.get("expires_in") or DEFAULT_TOKEN_TTL)
+                self._token = data["access_token"]
+                self._expires_at = (
+                    time.monotonic() + max(ttl - self.refresh_margin, 0.0)
+                )
+            return self._token
+
+    def invalidate(self):
+        with self._lock:
+            self._token = None
+
+
+class TenantClient(ORNDClient):
+    """ORNDClient for one organization of a ClientRegistry.
+
+    Tokens come from the tenant's TokenCache (a 401 refreshes it and retries
+    once), and every request holds a tenant slot and a global slot, so one
+    busy organization cannot take every connection of the registry. The
+    tenant's rate limit is waited on before taking either slot, so a
+    throttled tenant does not hold slots while it sleeps.
+    """
+
+    def __init__(
+        self,
+        organization: str,
+        tokens: Optional[TokenCache] = None,
+        token: Optional[str] = None,
+        slots: Optional[threading.BoundedSemaphore] = None,
+        global_slots: Optional[threading.BoundedSemaphore] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(token, organization, **kwargs)
+        self.tokens = tokens
+        self.slots = slots
+        self.global_slots = global_slots
+
+    def auth_headers(self) -> dict[str, str]:
+        if self.tokens is not None:
+            return {"Authorization": f"Bearer {self.tokens.get()}"}
+        return super().auth_headers()
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        json: Any = None,
+        fields: Optional[tuple[str, ...]] = None,
+    ) -> Any:
+        try:
+            return self._send_in_slot(method, url, json, fields)
+        except HttpException as e:
+            if e.status_code != 401 or self.tokens is None:
+                raise
+            self.tokens.invalidate()
+            return self._send_in_slot(method, url, json, fields)
+
+    def _send_in_slot(
+        self,
+        method: str,
+        url: str,
+        json: Any,
+        fields: Optional[tuple[str, ...]],
+    ) -> Any:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        # tenant slot first: waiting tenants do not hold global slots
+        with self.slots or _no_slot, self.global_slots or _no_slot:
+            return self._send(method, url, json, fields)
+
+
+class _NoSlot:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_no_slot = _NoSlot()
+
+
+class ClientRegistry:
+    """Clients for several organizations, keyed by organization slug.
+
+    Each organization gets its own token cache, connection pool and rate
+    limiter (``rate`` requests per second). ``max_concurrency`` caps requests
+    in flight across all organizations and ``tenant_concurrency`` per
+    organization, half of the global cap by default.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        tenant_concurrency: Optional[int] = None,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        pool_size: int = 10,
+        **client_options: Any,
+    ):
+        self.max_concurrency = max_concurrency
+        self.tenant_concurrency = tenant_concurrency or max(
+            1, max_concurrency // 2
+        )
+        self.rate = rate
+        self.burst = burst
+        self.pool_size = pool_size
+        self.client_options = client_options
+        self._global_slots = threading.BoundedSemaphore(max_concurrency)
+        self._clients: dict[str, TenantClient] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, organization: str) -> bool:
+        return organization in self._clients
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._clients))
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __getitem__(self, organization: str) -> TenantClient:
+        return self.get(organization)
+
+    def register(
+        self,
+        organization: Optional[str] = None,
+        auth: Optional[ORNDAuth] = None,
+        token: Optional[str] = None,
+        rate: Optional[float] = None,
+        **client_options: Any,
+    ) -> TenantClient:
+        """Adds an organization, authenticated by ``auth`` or a fixed token
+
+        ``organization`` defaults to ``auth["organization_slug"]``; ``rate``
+        overrides the registry rate for this organization.
+        """
+        if organization is None:
+            if auth is None:
+                raise ValidationException("organization or auth is required")
+            organization = auth["organization_slug"]
+        rate = rate if rate is not None else self.rate
+        client = TenantClient(
+            organization,
+            tokens=TokenCache(auth) if auth is not None else None,
+            token=token,
+            slots=threading.BoundedSemaphore(self.tenant_concurrency),
+            global_slots=self._global_slots,
+            session=pooled_session(self.pool_size),
+            rate_limiter=RateLimiter(rate, self.burst) if rate else None,
+            **{**self.client_options, **client_options},
+        )
+        with self._lock:
+            previous = self._clients.get(organization)
+            self._clients[organization] = client
+        if previous is not None:
+            previous.close()
+        return client
+
+    def get(self, organization: str) -> TenantClient:
+        try:
+            return self._clients[organization]
+        except KeyError:
+            raise ValidationException(
+                f"Organization '{organization}' is not registered", 404
+            )
+
+    def remove(self, organization: str) -> bool:
+        with self._lock:
+            client = self._clients.pop(organization, None)
+        if client is None:
+            return False
+        client.close()
+        return True
+
+    def close(self):
+        for organization in list(self._clients):
+            self.remove(organization)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from datetime import date, timedelta
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    MutableMapping,
+    Optional,
+)
+
+from attrs import asdict, define, field
+
+from officerndapilib.bulk import BULK_ERRORS
+from officerndapilib.client import ORNDClient
+from officerndapilib.exceptions import ValidationException
+from officerndapilib.reqs import RetrieveORNDBookingOccurencesRequest
+from officerndapilib.schema import ORNDBooking, ORNDResourceType
+from officerndapilib.streams import RESOURCE_TYPES, date_windows, office_ids
+
+if TYPE_CHECKING:
+    from officerndapilib.intervals import BookingIntervalIndex
+
+# WARMUP
+
+
+@define
+class WarmupReport:
+    """What a warmup loaded, what failed and how long it took"""
+
+    offices: int = 0
+    resources: int = 0
+    bookings: int = 0
+    members: int = 0
+    errors: dict[str, str] = field(factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def as_dict(self) -> dict[str, Any]:
+        """JSON-ready summary, e.g. for a readiness probe"""
+        return {**asdict(self), "ok": self.ok}
+
+
+def warmup(
+    client: ORNDClient,
+    offices: Optional[Iterable[str]] = None,
+    days: Optional[int] = None,
+    types: Iterable[ORNDResourceType] = RESOURCE_TYPES,
+    index: Optional[BookingIntervalIndex] = None,
+    members: Optional[MutableMapping[str, Any]] = None,
+    max_workers: int = 8,
+) -> WarmupReport:
+    """Concurrently prefetches the datasets first requests need.
+
+    Per office (all offices by default): resources, which land in the
+    client's ``metadata_cache``; with ``index``, booking occurrences for
+    today and the next ``days - 1`` days (1 by default), added to it; and
+    with ``members``, members stored by ``_id``. Bookings and members are
+    only fetched into those, as the client does not keep them, so ``days``
+    without an ``index`` raises a ValidationException rather than reporting
+    bookings it never loaded. Every GET also primes the client's
+    ``stale_cache`` if set. All requests share one pool of ``max_workers``
+    threads. Failures are recorded per dataset and office rather than
+    raised.
+    """
+    if days is not None and index is None:
+        raise ValidationException("days needs an index to load bookings into")
+    days = 1 if days is None else days
+    started = time.monotonic()
+    report = WarmupReport()
+    try:
+        offices = office_ids(client, offices)
+    except BULK_ERRORS as e:
+        report.errors["offices"] = str(e)
+        report.elapsed = time.monotonic() - started
+        return report
+    report.offices = len(offices)
+    types = list(types)
+    first_day = date.today()
+    last_day = first_day + timedelta(days=days)
+
+    def load_bookings(
+        request: RetrieveORNDBookingOccurencesRequest,
+    ) -> list[ORNDBooking]:
+        # occurrences spanning two windows are kept from the first only
+        return [
+            booking
+            for booking in client.get_all_bookings(request)
+            if request.start == first_day.isoformat()
+            or booking["start"]["dateTime"][:10] >= (request.start or "")
+        ]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # future -> (dataset, office)
+        pending: dict[Future[Any], tuple[str, str]] = {}
+
+        def submit(
+            dataset: str, office: str, fn: Callable[..., Any], *args: Any
+        ):
+            pending[pool.submit(fn, *args)] = (dataset, office)
+
+        for office in offices:
+            for type in types:
+                submit(
+                    "resources", office, client.get_all_resources, office, type
+                )
+            if members is not None:
+                submit("members", office, client.get_all_members, office)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                dataset, office = pending.pop(future)
+                try:
+                    loaded = future.result()
+                except BULK_ERRORS as e:
+                    report.errors[f"{dataset}:{office}"] = str(e)
+                    continue
+                if dataset == "resources":
+                    report.resources += len(loaded)
+                    if index is None:
+                        continue
+                    for resource in loaded:
+                        for start, end in date_windows(first_day, last_day):
+                            request = RetrieveORNDBookingOccurencesRequest(
+                                office=resource["office"],
+                                resource_id=resource["_id"],
+                                start=start.isoformat(),
+                                end=end.isoformat(),
+                            )
+                            submit("bookings", office, load_bookings, request)
+                elif dataset == "members" and members is not None:
+                    report.members += len(loaded)
+                    for member in loaded:
+                        members[member["_id"]] = member
+                elif index is not None:
+                    report.bookings += len(loaded)
+                    for booking in loaded:
+                        index.add(booking)
+    report.elapsed = time.monotonic() - started
+    return report
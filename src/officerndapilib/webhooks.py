@@ -0,0 +1,196 @@
+import hashlib
+import hmac
+import json
+import time
+from typing import Any, Callable, MutableMapping, Optional, Union
+
+from attrs import define, field
+
+from officerndapilib.exceptions import ValidationException
+from officerndapilib.intervals import BookingIntervalIndex
+from officerndapilib.schema import ORNDBooking, ORNDMember, ORNDResource
+
+# WEBHOOKS
+
+SIGNATURE_HEADER = "officernd-signature"
+
+UPSERT_ACTIONS = {"created", "updated"}
+REMOVE_ACTIONS = {"removed", "deleted", "canceled"}
+
+ORNDWebhookObject = Union[ORNDBooking, ORNDMember, ORNDResource]
+WebhookHandler = Callable[["ORNDWebhookEvent"], None]
+
+
+@define(frozen=True)
+class ORNDWebhookEvent:
+    """A parsed OfficeRnD webhook delivery, e.g. ``booking.created``"""
+
+    id: str
+    type: str
+    object: ORNDWebhookObject
+    created_at: Optional[str] = None
+    previous: dict[str, Any] = field(factory=dict)
+
+    @property
+    def kind(self) -> str:
+        return self.type.partition(".")[0]
+
+    @property
+    def action(self) -> str:
+        return self.type.partition(".")[2]
+
+
+def verify_signature(
+    body: bytes, header: str, secret: str, tolerance: int = 300
+) -> bool:
+    """Verifies an ``officernd-signature`` header of the form
+    ``t=<timestamp>,signature=<hex>``, where the signature is the
+    HMAC-SHA256 of ``<body>.<timestamp>`` keyed with the webhook secret.
+    """
+    try:
+        parts = dict(part.split("=", 1) for part in header.split(","))
+        timestamp = parts["t"]
+        signature = parts["signature"]
+        if tolerance and abs(time.time() - int(timestamp)) > tolerance:
+            return False
+    except (KeyError, ValueError):
+        return False
+    expected = hmac.new(
+        secret.encode(), body + b"." + timestamp.encode(), hashlib.sha256
+    ).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def parse_event(body: Union[bytes, str]) -> ORNDWebhookEvent:
+    """Parses a webhook body into an ORNDWebhookEvent"""
+    try:
+        payload = json.loads(body)
+        data = payload["data"]
+        return ORNDWebhookEvent(
+            id=payload.get("event", ""),
+            type=payload["eventType"],
+            object=data["object"],
+            created_at=payload.get("createdAt"),
+            previous=data.get("previousAttributes") or {},
+        )
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValidationException(f"Malformed webhook payload: {e}")
+
+
+class WebhookDispatcher:
+    """Routes webhook events to handlers registered by event kind or type.
+
+    A handler registered for ``"booking"`` receives every booking event; one
+    registered for ``"booking.created"`` only that type.
+    """
+
+    def __init__(self):
+        self._handlers: dict[str, list[WebhookHandler]] = {}
+
+    def register(self, event: str, handler: WebhookHandler):
+        self._handlers.setdefault(event, []).append(handler)
+
+    def register_cache(self, kind: str, cache: MutableMapping[str, Any]):
+        """Keeps a mapping of ``_id`` to object in sync with ``kind`` events"""
+
+        def apply(event: ORNDWebhookEvent):
+            _id = event.object["_id"]
+            if event.action in REMOVE_ACTIONS:
+                cache.pop(_id, None)
+            elif event.action in UPSERT_ACTIONS:
+                cache[_id] = event.object
+
+        self.register(kind, apply)
+
+    def register_index(self, index: BookingIntervalIndex):
+        """Keeps a booking interval index in sync with booking events"""
+
+        def apply(event: ORNDWebhookEvent):
+            booking: ORNDBooking = event.object  # type: ignore[assignment]
+            index.remove(booking["_id"])
+            if event.action in UPSERT_ACTIONS:
+                index.add(booking)  # canceled bookings are skipped
+
+        self.register("booking", apply)
+
+    def dispatch(self, event: ORNDWebhookEvent):
+        for key in (event.kind, event.type):
+            for handler in self._handlers.get(key, []):
+                handler(event)
+
+
+class WebhookReceiver:
+    """Framework-agnostic webhook endpoint.
+
+    ``wsgi`` and ``asgi`` are ready-made applications; ``handle`` can be
+    called directly from any framework with the raw body and headers.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        dispatcher: Optional[WebhookDispatcher] = None,
+        tolerance: int = 300,
+    ):
+        self.secret = secret
+        self.dispatcher = dispatcher or WebhookDispatcher()
+        self.tolerance = tolerance
+
+    def handle(
+        self, body: bytes, headers: MutableMapping[str, str]
+    ) -> ORNDWebhookEvent:
+        """Verifies, parses and dispatches a delivery"""
+        header = next(
+            (v for k, v in headers.items() if k.lower() == SIGNATURE_HEADER),
+            "",
+        )
+        if not verify_signature(body, header, self.secret, self.tolerance):
+            raise ValidationException("Invalid webhook signature", 401)
+        event = parse_event(body)
+        self.dispatcher.dispatch(event)
+        return event
+
+    def _respond(
+        self, body: bytes, headers: dict[str, str]
+    ) -> tuple[int, bytes]:
+        try:
+            self.handle(body, headers)
+        except ValidationException as e:
+            return e.status_code, json.dumps({"message": str(e)}).encode()
+        return 200, b'{"received": true}'
+
+    def wsgi(self, environ, start_response):
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        body = environ["wsgi.input"].read(length)
+        headers = {
+            key[5:].replace("_", "-").lower(): value
+            for key, value in environ.items()
+            if key.startswith("HTTP_")
+        }
+        status, payload = self._respond(body, headers)
+        reason = {200: "OK", 400: "Bad Request", 401: "Unauthorized"}
+        start_response(
+            f"{status} {reason.get(status, '')}",
+            [("Content-Type", "application/json")],
+        )
+        return [payload]
+
+    async def asgi(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        headers = {k.decode(): v.decode() for k, v in scope["headers"]}
+        status, payload = self._respond(b"".join(chunks), headers)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": payload})
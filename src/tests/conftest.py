@@ -0,0 +1,41 @@
+import json
+from typing import Any, Callable
+
+import pytest
+
+from officerndapilib.client import ORNDClient
+
+Stub = Callable[[ORNDClient, Callable[..., Any]], None]
+
+
+class FakeResponse:
+    """Stands in for a requests.Response"""
+
+    def __init__(
+        self, status_code: int = 200, payload: Any = None, text: str = ""
+    ):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.text = text if payload is None else json.dumps(payload)
+        self.content = self.text.encode()
+        self.reason = "Error"
+
+
+@pytest.fixture
+def stub_send(monkeypatch: pytest.MonkeyPatch) -> Stub:
+    """Replaces a client's ``send``, which returns decoded bodies"""
+
+    def stub(client: ORNDClient, send: Callable[..., Any]):
+        monkeypatch.setattr(client, "send", send)
+
+    return stub
+
+
+@pytest.fixture
+def stub_request(monkeypatch: pytest.MonkeyPatch) -> Stub:
+    """Replaces a client's ``session.request``, which returns responses"""
+
+    def stub(client: ORNDClient, request: Callable[..., FakeResponse]):
+        monkeypatch.setattr(client.session, "request", request)
+
+    return stub
@@ -0,0 +1,94 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from officerndapilib.analytics import (
+    booked_minutes,
+    cancel_rates,
+    load_occurrences,
+    parse_epoch_minutes,
+    peak_hour_histogram,
+    utilization_heatmap,
+)
+
+ROOM_A = "65c38ead5e6d7bd36ed6a540"
+ROOM_B = "65c38ead5e6d7bd36ed6a541"
+MONDAY_9AM = 9  # hour-of-week slot
+
+
+def booking(resource, start, end, canceled=False):
+    return {
+        "resourceId": resource,
+        "start": {"dateTime": start},
+        "end": {"dateTime": end},
+        "canceled": canceled,
+    }
+
+
+@pytest.fixture
+def occurrences():
+    return load_occurrences(
+        [
+            # Monday 4 March 2024
+            booking(ROOM_A, "2024-03-04T09:30:00Z", "2024-03-04T11:15:00Z"),
+            booking(
+                ROOM_A, "2024-03-04T14:00:00Z", "2024-03-04T15:00:00Z", True
+            ),
+            booking(ROOM_B, "2024-03-05T09:00:00Z", "2024-03-05T10:00:00Z"),
+        ]
+    )
+
+
+def test_parse_epoch_minutes():
+    fast = parse_epoch_minutes(["2024-03-04T09:30:00.000Z"])
+    slow = parse_epoch_minutes(["2024-03-04T10:30:00+01:00"])
+    assert fast[0] == slow[0] == 28492410
+
+
+def test_booked_minutes_split_at_hour_boundaries(occurrences):
+    minutes = booked_minutes(occurrences)
+    assert occurrences.resource_ids == [ROOM_A, ROOM_B]
+    assert minutes.shape == (2, 168)
+    assert list(minutes[0, MONDAY_9AM : MONDAY_9AM + 3]) == [30, 60, 15]
+    assert minutes[0].sum() == 105  # the canceled booking is ignored
+    assert minutes[1, 24 + 9] == 60
+
+
+def test_utilization_heatmap(occurrences):
+    heatmap = utilization_heatmap(
+        occurrences, "2024-03-04T00:00:00Z", "2024-03-18T00:00:00Z"
+    )
+    assert heatmap[0, MONDAY_9AM] == pytest.approx(30 / 120)  # two Mondays
+    assert heatmap[0, MONDAY_9AM + 1] == pytest.approx(0.5)
+    assert np.isnan(heatmap[0, 0])  # closed at midnight
+
+
+def test_utilization_heatmap_ignores_bookings_outside_range():
+    weekly = load_occurrences(
+        [
+            booking(ROOM_A, f"{day}T09:00:00Z", f"{day}T10:00:00Z")
+            for day in ("2024-03-04", "2024-03-11", "2024-03-18")
+        ]
+        # Sunday 23:00 to Monday 01:00, half inside the range
+        + [booking(ROOM_B, "2024-03-10T23:00:00Z", "2024-03-11T01:00:00Z")]
+    )
+    heatmap = utilization_heatmap(
+        weekly,
+        "2024-03-11T00:00:00Z",
+        "2024-03-18T00:00:00Z",
+        open_mask=np.ones(168, dtype=bool),
+    )
+    assert heatmap[0, MONDAY_9AM] == pytest.approx(1.0)
+    assert heatmap[1, 0] == pytest.approx(1.0)
+    assert heatmap[1, 167] == 0  # the Sunday hour before the range
+
+
+def test_peak_hours_and_cancel_rates(occurrences):
+    histogram = peak_hour_histogram(occurrences)
+    assert list(histogram[9:12]) == [90, 60, 15]
+    assert list(cancel_rates(occurrences)) == [0.5, 0.0]
+
+
+def test_utc_offset_shifts_slots(occurrences):
+    minutes = booked_minutes(occurrences, utc_offset=60)
+    assert minutes[1, 24 + 10] == 60
@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from officerndapilib import availability
+from officerndapilib.intervals import free_intervals
+
+OFFICE = "65416bf72db05a7176b467ac"
+ROOM_A = "65c38ead5e6d7bd36ed6a540"
+ROOM_B = "65c38ead5e6d7bd36ed6a541"
+ROOM_C = "65c38ead5e6d7bd36ed6a542"
+
+RESOURCES = [
+    {"_id": ROOM_A, "amenities": ["screen"], "size": 8},
+    {"_id": ROOM_B, "amenities": ["screen", "whiteboard"], "size": 4},
+    {"_id": ROOM_C, "amenities": [], "size": 12},
+]
+
+BOOKINGS = {
+    ROOM_A: [("13:00", "15:00")],
+    ROOM_B: [("12:00", "13:30")],
+}
+
+
+def booking(resource_id, start, end):
+    return {
+        "_id": f"{resource_id}-{start}",
+        "resourceId": resource_id,
+        "start": {"dateTime": f"2024-03-01T{start}:00Z"},
+        "end": {"dateTime": f"2024-03-01T{end}:00Z"},
+    }
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = []
+
+    def get_all_bookings(token, organization, request):
+        calls.append(request.resource_id)
+        return [
+            booking(request.resource_id, *times)
+            for times in BOOKINGS.get(request.resource_id, [])
+        ]
+
+    monkeypatch.setattr(
+        availability, "get_all_resources", lambda *args: RESOURCES
+    )
+    monkeypatch.setattr(availability, "get_all_bookings", get_all_bookings)
+    return calls
+
+
+def utc(hour, minute=0):
+    return datetime(2024, 3, 1, hour, minute, tzinfo=timezone.utc)
+
+
+def test_free_intervals():
+    busy = [(0, 10), (20, 30), (50, 70)]
+    assert free_intervals(busy, 5, 60) == [(10, 20), (30, 50)]
+    assert free_intervals([], 0, 10) == [(0, 10)]
+
+
+def test_finds_earliest_slots_across_resources(fetches):
+    slots = availability.find_available_slots(
+        "token",
+        "org",
+        OFFICE,
+        "meeting_room",
+        duration=timedelta(minutes=90),
+        window_start=utc(12),
+        window_end=utc(17),
+        amenities=["screen"],
+        limit=3,
+    )
+    assert sorted(fetches) == [ROOM_A, ROOM_B]  # ROOM_C filtered before fetch
+    assert [(s.resource["_id"], s.start) for s in slots] == [
+        (ROOM_B, utc(13, 30)),
+        (ROOM_B, utc(13, 45)),
+        (ROOM_B, utc(14)),
+    ]
+    assert slots[0].end == utc(15)
+
+
+def test_filters_by_size(fetches):
+    slots = availability.find_available_slots(
+        "token",
+        "org",
+        OFFICE,
+        "meeting_room",
+        duration=timedelta(hours=1),
+        window_start=utc(13),
+        window_end=utc(17),
+        size=6,
+        limit=1,
+    )
+    assert sorted(fetches) == [ROOM_A, ROOM_C]
+    assert (slots[0].resource["_id"], slots[0].start) == (ROOM_C, utc(13))
+
+
+def test_naive_times_are_read_in_the_resource_timezone(monkeypatch):
+    resource = {"_id": ROOM_A, "timezone": "America/New_York"}
+    monkeypatch.setattr(
+        availability, "get_all_resources", lambda *args: [resource]
+    )
+    monkeypatch.setattr(
+        availability,
+        "get_all_bookings",
+        lambda *args: [
+            {
+                "_id": "b1",
+                "resourceId": ROOM_A,
+                "start": {"dateTime": "2024-03-01T09:00:00"},
+                "end": {"dateTime": "2024-03-01T10:00:00"},
+            }
+        ],
+    )
+    slots = availability.find_available_slots(
+        "token",
+        "org",
+        OFFICE,
+        "meeting_room",
+        duration=timedelta(hours=1),
+        window_start=datetime(2024, 3, 1, 9),  # 14:00 UTC
+        window_end=datetime(2024, 3, 1, 12),
+        step=timedelta(hours=1),
+    )
+    assert [s.start for s in slots] == [utc(15), utc(16)]
@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from officerndapilib.bulk import (
+    BulkReport,
+    bulk_cancel_bookings,
+    bulk_delete_members,
+)
+from officerndapilib.client import ORNDClient
+from officerndapilib.exceptions import HttpException
+from officerndapilib.ratelimit import RateLimiter
+
+MEMBER_IDS = [f"member_{i}" for i in range(7)]
+
+
+class FakeClient(ORNDClient):
+    def __init__(self, fail_ids=()):
+        super().__init__("token", "org")
+        self.fail_ids = set(fail_ids)
+        self.chunks = []
+        self.cancels = []
+
+    def delete_members(self, ids):
+        self.chunks.append(list(ids))
+        if self.fail_ids & set(ids):
+            raise HttpException("Bad gateway", 502)
+        return [{"_id": _id} for _id in ids]
+
+    def cancel_booking(
+        self, booking_id, silent=False, skip_fee=False, index=None
+    ):
+        self.cancels.append((booking_id, silent, skip_fee))
+        if booking_id in self.fail_ids:
+            raise HttpException("Booking not found", 404)
+        return {"_id": booking_id, "canceled": True}
+
+
+def test_delete_members_in_chunks():
+    client = FakeClient()
+    report = bulk_delete_members(client, MEMBER_IDS, chunk_size=3)
+    assert report.ok
+    assert sorted(len(chunk) for chunk in client.chunks) == [1, 3, 3]
+    assert set(report.succeeded) == set(MEMBER_IDS)
+
+
+def test_delete_members_resumes_after_partial_failure(tmp_path):
+    client = FakeClient(fail_ids=["member_4"])
+    report = bulk_delete_members(client, MEMBER_IDS, chunk_size=3)
+    assert not report.ok
+    assert sorted(report.failed) == ["member_3", "member_4", "member_5"]
+
+    path = str(tmp_path / "report.json")
+    report.save(path)
+    client = FakeClient()
+    report = bulk_delete_members(
+        client, MEMBER_IDS, chunk_size=3, report=BulkReport.load(path)
+    )
+    assert report.ok
+    assert client.chunks == [["member_3", "member_4", "member_5"]]
+
+
+def test_cancel_bookings_reports_per_id():
+    client = FakeClient(fail_ids=["b2"])
+    report = bulk_cancel_bookings(
+        client, ["b1", "b2", "b3", "b1"], silent=True, skip_fee=True
+    )
+    assert sorted(report.succeeded) == ["b1", "b3"]
+    assert report.failed == {"b2": "Booking not found"}
+    assert report.pending == []
+    assert all(silent and skip for _, silent, skip in client.cancels)
+    assert len(client.cancels) == 3
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=100, burst=1)
+    started = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - started >= 0.04
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
@@ -0,0 +1,153 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from officerndapilib import client as client_module
+from officerndapilib.cache import MemoryCache, RefreshScheduler, SQLiteCache
+from officerndapilib.client import ORNDClient, get_client, set_metadata_cache
+from officerndapilib.reqs import lookup_resource
+
+RESOURCE = {"_id": "65c38ead5e6d7bd36ed6a540", "name": "LGC"}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "ornd-cache.sqlite")
+
+
+def test_missing_keys_load_synchronously():
+    cache = MemoryCache(ttl=60)
+    assert cache.get_or_load("resources", lambda: [RESOURCE]) == [RESOURCE]
+    assert cache.get_or_load("resources", lambda: pytest.fail()) == [RESOURCE]
+    assert "resources" in cache
+    del cache["resources"]
+    assert len(cache) == 0
+
+
+def test_stale_entries_are_served_while_refreshing():
+    cache = MemoryCache(ttl=0)
+    cache["resource"] = {"name": "old"}
+    release = threading.Event()
+    calls: list[None] = []
+
+    def loader():
+        calls.append(None)
+        release.wait(1)
+        return {"name": "new"}
+
+    assert cache.get_or_load("resource", loader) == {"name": "old"}
+    assert cache.get_or_load("resource", loader) == {"name": "old"}
+    release.set()
+    cache.refresh("resource", loader).result()
+    assert cache["resource"] == {"name": "new"}
+    assert len(calls) <= 2  # one refresh per key at a time
+    cache.close()
+
+
+def test_sqlite_cache_survives_restart_and_revalidates(db_path):
+    cache = SQLiteCache(db_path, ttl=3600)
+    cache["resource"] = RESOURCE
+    cache.close()
+
+    time.sleep(0.01)
+    refreshed = threading.Event()
+
+    def loader():
+        refreshed.set()
+        return {**RESOURCE, "name": "Renamed"}
+
+    warm = SQLiteCache(db_path, ttl=3600)
+    assert warm.get_or_load("resource", loader) == RESOURCE  # no waiting
+    assert refreshed.wait(1)
+    warm.refresh("resource", loader).result()
+    assert warm["resource"]["name"] == "Renamed"
+    assert warm.get_or_load("resource", pytest.fail)["name"] == "Renamed"
+    warm.close()
+
+
+def test_client_reads_metadata_through_the_cache(db_path, stub_send):
+    cache = SQLiteCache(db_path, revalidate_on_start=False)
+    client = ORNDClient("token", "org", metadata_cache=cache)
+    urls: list[str] = []
+
+    def send(method, url, json=None):
+        urls.append(url)
+        return RESOURCE
+
+    stub_send(client, send)
+    client.get_resource_by_id(RESOURCE["_id"])
+    client.get_resource_by_id(RESOURCE["_id"])
+    assert len(urls) == 1
+    assert list(cache) == urls
+    cache.close()
+
+
+def test_validator_lookups_share_the_metadata_cache(monkeypatch, stub_send):
+    assert client_module._metadata_cache is None  # opt-in
+    monkeypatch.setattr(client_module, "_clients", client_module.OrderedDict())
+    monkeypatch.setattr(client_module, "_metadata_cache", None)
+    urls: list[str] = []
+
+    def send(method, url, json=None):
+        urls.append(url)
+        return RESOURCE
+
+    stub_send(get_client(None, "org"), send)
+    cache = MemoryCache(ttl=60)
+    set_metadata_cache(cache)
+    assert lookup_resource("org", RESOURCE["_id"]) == RESOURCE
+    assert lookup_resource("org", RESOURCE["_id"]) == RESOURCE
+    assert len(urls) == 1 and len(cache) == 1
+    assert get_client("token", "org").metadata_cache is cache
+    cache.close()
+
+
+def test_scheduler_refreshes_hot_keys_and_evicts_cold_ones():
+    cache = MemoryCache(ttl=10)
+    scheduler = RefreshScheduler(cache, min_hits=1, cold_after=60)
+    versions = iter(range(100))
+
+    def loader():
+        return next(versions)
+
+    for _ in range(3):
+        cache.get_or_load("hot", loader)
+    cache.get_or_load("cold", loader)
+    assert scheduler.tick().refreshed == []  # fresh entries are left alone
+
+    cache.write("hot", cache["hot"], time.time() - 9)  # near expiry
+    cache.write("cold", cache["cold"], time.time() - 9)
+    result = scheduler.tick()
+    assert result.refreshed == ["hot"]  # "cold" was read only once
+    cache.refresh("hot", loader).result()
+    assert cache["hot"] == 2 and cache["cold"] == 1
+    assert scheduler.hits("hot") == 0.75  # halved every tick
+
+    scheduler.cold_after = 0
+    time.sleep(0.01)
+    assert sorted(scheduler.tick().evicted) == ["cold", "hot"]
+    assert len(cache) == 0
+    cache.close()
+
+
+def test_concurrent_misses_share_one_load():
+    cache = MemoryCache(ttl=60)
+    release = threading.Event()
+    calls: list[None] = []
+
+    def loader():
+        calls.append(None)
+        release.wait(1)
+        return [RESOURCE]
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        futures = [
+            pool.submit(cache.get_or_load, "resources", loader)
+            for _ in range(20)
+        ]
+        time.sleep(0.05)
+        release.set()
+        assert all(f.result() == [RESOURCE] for f in futures)
+    assert len(calls) == 1
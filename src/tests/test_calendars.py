@@ -0,0 +1,188 @@
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from officerndapilib import reqs
+from officerndapilib.api import get_booking_times_available_on_date
+from officerndapilib.calendars import (
+    OfficeCalendar,
+    calendar_for,
+    register_calendar,
+    unregister_calendar,
+)
+from officerndapilib.client import ORNDClient
+from officerndapilib.dates import to_timestamp
+from officerndapilib.exceptions import ValidationException
+from officerndapilib.intervals import BookingIntervalIndex
+from officerndapilib.schema import ORNDBookingDateTime
+
+OFFICE = "65416bf72db05a7176b467ac"
+ROOM = "65c38ead5e6d7bd36ed6a540"
+MEMBER = "65caaa8d836bde4655bca4de"
+LONDON = ZoneInfo("Europe/London")
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def ts(
+    year: int,
+    month: int,
+    day: int,
+    hour: int = 0,
+    minute: int = 0,
+    tz: tzinfo = timezone.utc,
+) -> int:
+    return int(datetime(year, month, day, hour, minute, tzinfo=tz).timestamp())
+
+
+@pytest.fixture
+def london():
+    # clocks go forward on Sunday 31 March 2024
+    return OfficeCalendar(
+        "Europe/London",
+        holidays=[date(2024, 4, 1)],
+        start=date(2024, 3, 25),
+        horizon=14,
+    )
+
+
+def test_windows_follow_local_time_across_dst(london):
+    assert london.window(date(2024, 3, 29)) == (
+        ts(2024, 3, 29, 9),
+        ts(2024, 3, 29, 18),
+    )
+    assert london.window(date(2024, 4, 2)) == (
+        ts(2024, 4, 2, 8),
+        ts(2024, 4, 2, 17),
+    )
+    assert london.window(date(2024, 3, 30)) is None  # weekend
+    assert london.window(date(2024, 4, 1)) is None  # holiday
+    # beyond the horizon windows are computed on demand
+    assert london.window(date(2024, 7, 1)) == (
+        ts(2024, 7, 1, 8),
+        ts(2024, 7, 1, 17),
+    )
+
+
+def test_lookups_use_local_days(london):
+    sunday_night = ts(2024, 3, 31, 23, 30)  # 00:30 on Monday in London
+    assert london.local_date(sunday_night) == date(2024, 4, 1)
+    assert not london.is_weekend(sunday_night)
+    assert london.is_open(ts(2024, 4, 2, 8), ts(2024, 4, 2, 17))
+    assert not london.is_open(ts(2024, 4, 2, 16), ts(2024, 4, 2, 18))
+    assert london.timestamp("2024-04-02T09:00:00") == ts(2024, 4, 2, 8)
+
+
+def test_free_slot_times_are_local(london):
+    bookings: list[dict[str, ORNDBookingDateTime]] = [
+        {
+            "start": {"dateTime": "2024-04-02T09:30:00Z"},
+            "end": {"dateTime": "2024-04-02T11:00:00Z"},
+        }
+    ]
+    times = get_booking_times_available_on_date(
+        bookings, "2024-04-02", calendar=london
+    )
+    # 10:30 to 12:00 in London blocks the 10:00 and 11:00 slots
+    assert times == ["09:00", *(f"{hour}:00" for hour in range(12, 18))]
+    assert london.slots(date(2024, 3, 30), 3600) == []
+
+
+def test_booking_validations_use_the_office_calendar(monkeypatch):
+    monkeypatch.setattr(
+        reqs,
+        "get_resource_by_id",
+        lambda organization, id: {
+            "type": "meeting_room",
+            "name": "LGC",
+            "timezone": "America/New_York",
+        },
+    )
+    day = date.today() + timedelta(days=7)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+
+    def request(start_hour, end_hour):
+        start = datetime.combine(day, time(start_hour), tzinfo=NEW_YORK)
+        end = datetime.combine(day, time(end_hour), tzinfo=NEW_YORK)
+        return reqs.CreateORNDMemberBookingRequest(
+            organization="org",
+            office=OFFICE,
+            resource_id=ROOM,
+            start=start.astimezone(timezone.utc).isoformat(),
+            end=end.astimezone(timezone.utc).isoformat(),
+            summary="Standup",
+            member=MEMBER,
+        )
+
+    request(17, 18)  # 17:00 New York is after 18:00 in UTC
+    with pytest.raises(ValidationException, match="outside office hours"):
+        request(8, 10)
+
+    register_calendar(
+        OFFICE, OfficeCalendar("America/New_York", holidays=[day])
+    )
+    try:
+        with pytest.raises(ValidationException, match="closed"):
+            request(10, 11)
+    finally:
+        unregister_calendar(OFFICE)
+    assert calendar_for(OFFICE, "Not/AZone").timezone == "UTC"
+
+
+def test_naive_times_are_office_local_everywhere(monkeypatch, stub_send):
+    monkeypatch.setattr(
+        reqs,
+        "get_resource_by_id",
+        lambda organization, id: {
+            "type": "meeting_room",
+            "name": "LGC",
+            "timezone": "America/New_York",
+        },
+    )
+    day = date.today() + timedelta(days=7)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    request = reqs.CreateORNDMemberBookingRequest(
+        organization="org",
+        office=OFFICE,
+        resource_id=ROOM,
+        start=f"{day}T09:30:00",  # New York time, 13:30 or 14:30 in UTC
+        end=f"{day}T10:00:00",
+        summary="Standup",
+        member=MEMBER,
+    )
+    calendar = request.office_calendar()
+    start = calendar.timestamp(request.start)
+    assert start == to_timestamp(request.start, NEW_YORK)
+    assert start == ts(day.year, day.month, day.day, 9, 30, tz=NEW_YORK)
+
+    index = BookingIntervalIndex()
+    index.add_interval(
+        ROOM, f"{day}T09:00:00", f"{day}T10:00:00", "b1", NEW_YORK
+    )
+    client = ORNDClient("token", "org")
+    stub_send(client, lambda *args, **kwargs: pytest.fail("network call made"))
+    with pytest.raises(ValidationException) as e:
+        client.booking_checkout(request, index=index)
+    assert e.value.status_code == 409
+
+    # the API echoes naive times; the created booking is indexed locally too
+    index = BookingIntervalIndex()
+    created = {
+        "_id": "b2",
+        "resourceId": ROOM,
+        "start": {"dateTime": request.start},
+        "end": {"dateTime": request.end},
+    }
+    stub_send(
+        client,
+        lambda method, url, json=None, fields=None: (
+            [created] if url.endswith("/checkout") else []
+        ),
+    )
+    client.booking_checkout(request, index=index)
+    assert index.busy_intervals(ROOM) == [(start, start + 1800)]
+    with pytest.raises(ValidationException) as e:
+        client.booking_checkout(request, index=index)
+    assert e.value.status_code == 409
@@ -0,0 +1,80 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+from officerndapilib.cassettes import (
+    RECORD,
+    Cassette,
+    Interaction,
+    use_cassette,
+)
+from officerndapilib.client import ORNDClient
+from officerndapilib.exceptions import HttpException
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status = 404 if self.path == "/missing" else 200
+        body = f'{{"path": "{self.path}"}}'.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_record_then_replay_without_network(server, tmp_path):
+    path = str(tmp_path / "cassette.json")
+    session = requests.Session()
+    cassette = Cassette(path)
+    use_cassette(session, cassette, RECORD)
+    assert session.get(f"{server}/offices").json() == {"path": "/offices"}
+    assert session.get(f"{server}/missing").status_code == 404
+    cassette.save()
+
+    replayed = Cassette.load(path)
+    assert len(replayed) == 2 and replayed.interactions[0].elapsed > 0
+    session = requests.Session()
+    use_cassette(session, replayed, latency_scale=0)
+    response = session.get(f"{server}/offices")
+    assert response.ok and response.json() == {"path": "/offices"}
+    assert response.headers["content-type"] == "application/json"
+    assert session.get(f"{server}/missing").status_code == 404
+    with pytest.raises(requests.ConnectionError):
+        session.get(f"{server}/unrecorded")
+
+
+def test_client_replays_at_scaled_latency():
+    client = ORNDClient("token", "org")
+    url = client.url("offices")
+    cassette = Cassette(
+        interactions=[
+            Interaction("GET", url, None, 200, '[{"_id": "1"}]', elapsed=0.2),
+            Interaction("GET", url, None, 503, '{"message": "busy"}'),
+        ]
+    )
+    use_cassette(client.session, cassette, latency_scale=0.25)
+    started = time.perf_counter()
+    assert client.get_all_offices() == [{"_id": "1"}]
+    assert 0.05 <= time.perf_counter() - started < 0.2
+    with pytest.raises(HttpException) as e:
+        client.get_all_offices()
+    assert e.value.status_code == 503
+    # identical requests cycle through their recorded responses
+    assert client.get_all_offices() == [{"_id": "1"}]
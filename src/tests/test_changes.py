@@ -0,0 +1,48 @@
+from officerndapilib.changes import ChangeFeed, record_hash
+
+
+def member(_id, name, modified="2024-01-01"):
+    return {"_id": _id, "name": name, "modifiedAt": modified}
+
+
+def test_record_hash_ignores_key_order():
+    a = {"a": 1, "b": [1, 2]}
+    assert record_hash(a) == record_hash({"b": [1, 2], "a": 1})
+    assert record_hash({"a": 1}) != record_hash({"a": 2})
+    assert len(record_hash({"a": 1})) == 16
+
+
+def test_diff_reports_only_changed_records():
+    feed = ChangeFeed(ignore=["modifiedAt"])
+    first = feed.diff([member("1", "Ada"), member("2", "Bob")])
+    assert [m["_id"] for m in first.added] == ["1", "2"] and len(first) == 2
+
+    second = feed.diff(
+        [
+            member("1", "Ada", modified="2024-02-01"),  # ignored field only
+            member("3", "Cy"),
+            member("2", "Bobby"),
+        ]
+    )
+    assert [m["_id"] for m in second.added] == ["3"]
+    assert [m["name"] for m in second.modified] == ["Bobby"]
+    assert second.removed == []
+
+    third = feed.diff([member("3", "Cy")])
+    assert third.removed == ["1", "2"] and not third.added
+    assert not feed.diff([member("3", "Cy")])
+
+
+def test_partial_iteration_leaves_feed_unchanged(tmp_path):
+    feed = ChangeFeed()
+    feed.diff([member("1", "Ada")])
+    changes = feed.changes([member("1", "Eve"), member("2", "Bob")])
+    assert next(changes).kind == "modified"
+    changes.close()
+    assert len(feed) == 1
+
+    path = str(tmp_path / "feed.json")
+    feed.save(path)
+    loaded = ChangeFeed.load(path)
+    assert loaded.hashes == feed.hashes
+    assert not loaded.diff([member("1", "Ada")])
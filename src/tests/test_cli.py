@@ -0,0 +1,115 @@
+import json
+from datetime import date
+
+import pytest
+
+from officerndapilib import cli
+from officerndapilib.client import ORNDClient
+from officerndapilib.exceptions import HttpException
+from officerndapilib.streams import date_windows, fan_out
+
+OFFICE = "65416bf72db05a7176b467ac"
+ROOM = "65c38ead5e6d7bd36ed6a540"
+
+
+def fake_send(method, url, json=None):
+    path = url.split("/organizations/org", 1)[1]
+    if path.startswith("/offices"):
+        return [{"_id": OFFICE, "name": "12 Moorgate"}]
+    if path.startswith("/members"):
+        return [{"_id": "m1"}, {"_id": "m2"}]
+    if path.startswith("/resources"):
+        if "type=meeting_room" not in path:
+            return []
+        return [{"_id": ROOM, "office": OFFICE, "name": "Room A"}]
+    if path.startswith("/bookings/occurrences"):
+        if "start=2024-03-04" not in path:
+            return []
+        return [
+            {
+                "_id": "b1",
+                "resourceId": ROOM,
+                "start": {"dateTime": "2024-03-04T09:00:00Z"},
+                "end": {"dateTime": "2024-03-04T12:30:00Z"},
+            }
+        ]
+    if path.endswith("/cancel?silent=false&skipFee=false"):
+        if "/bad/" in path:
+            raise HttpException("Booking not found", 404)
+        return {"_id": path.split("/")[2]}
+    raise AssertionError(path)
+
+
+@pytest.fixture(autouse=True)
+def client(monkeypatch, stub_send):
+    client = ORNDClient("token", "org")
+    stub_send(client, fake_send)
+    monkeypatch.setattr(cli, "make_client", lambda args: client)
+    return client
+
+
+def run(*argv):
+    return cli.main([*argv[:1], "--organization", "org", "--quiet", *argv[1:]])
+
+
+def test_fan_out_is_bounded_and_complete():
+    assert sorted(fan_out(lambda i: [i, -i], range(50), 4)) == sorted(
+        [*range(50), *range(-49, 1)]
+    )
+    windows = date_windows(date(2024, 3, 1), date(2024, 3, 16))
+    assert list(windows) == [
+        (date(2024, 3, 1), date(2024, 3, 8)),
+        (date(2024, 3, 8), date(2024, 3, 15)),
+        (date(2024, 3, 15), date(2024, 3, 16)),
+    ]
+
+
+def test_export_members_as_jsonl(tmp_path):
+    output = tmp_path / "members.jsonl"
+    assert run("export", "members", str(output)) == 0
+    lines = output.read_text().splitlines()
+    assert [json.loads(line)["_id"] for line in lines] == ["m1", "m2"]
+
+
+def test_sync_writes_a_file_per_kind(tmp_path):
+    assert run("sync", str(tmp_path), "--start", "2024-03-04") == 0
+    assert (tmp_path / "resources.jsonl").read_text().count("\n") == 1
+    bookings = (tmp_path / "bookings.jsonl").read_text().splitlines()
+    assert [json.loads(line)["_id"] for line in bookings] == ["b1"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_availability_grid(capsys):
+    run("availability", "--start", "2024-03-04", "--end", "2024-03-06")
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == [
+        "resource\t2024-03-04\t2024-03-05",
+        "Room A\t5.5h\t9h",
+    ]
+
+
+def test_bulk_cancel_resumes_from_report(tmp_path, capsys):
+    report = str(tmp_path / "report.json")
+    assert run("bulk-cancel", "b1", "bad", "--report", report) == 1
+    assert "1 canceled, 1 failed" in capsys.readouterr().out
+
+    saved = json.loads(open(report).read())
+    assert list(saved["succeeded"]) == ["b1"] and "bad" in saved["failed"]
+    assert run("bulk-cancel", "--report", report) == 1
+    assert "1 canceled, 1 failed" in capsys.readouterr().out
+
+
+def test_interrupted_bulk_cancel_saves_its_report(tmp_path, client, stub_send):
+    report = str(tmp_path / "report.json")
+
+    def send(method, url, json=None):
+        if "/b2/" in url:
+            raise KeyboardInterrupt
+        return fake_send(method, url, json)
+
+    stub_send(client, send)
+    with pytest.raises(KeyboardInterrupt):
+        run("bulk-cancel", "b1", "b2", "--concurrency", "1", "--report", report)
+    saved = json.loads(open(report).read())
+    assert list(saved["succeeded"]) == ["b1"]
+    assert saved["requested"] == ["b1", "b2"]
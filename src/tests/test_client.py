@@ -0,0 +1,152 @@
+import json
+from typing import Any
+
+import pytest
+
+from officerndapilib import client as client_module
+from officerndapilib.client import ORND_BASE_URL, ORNDClient, get_client
+from officerndapilib.exceptions import HttpException
+from officerndapilib.queries import (
+    append_queries_to_url,
+    encode_queries,
+    encode_query_value,
+)
+from officerndapilib.reqs import RetrieveORNDBookingOccurencesRequest
+from tests.conftest import FakeResponse
+
+ORGANIZATION = "re-defined-test-account"
+WW_12MOORGATE = "65416bf72db05a7176b467ac"
+WW_12M_MEETING_ROOM = "65c38ead5e6d7bd36ed6a540"
+
+
+class FakeSession:
+    """Records requests, answering from ``responses`` or with ``[]``"""
+
+    def __init__(self):
+        self.calls: list[tuple[str, str, Any]] = []
+        self.responses: list[FakeResponse] = []
+
+    def request(self, method, url, data=None, headers=None, timeout=None):
+        self.calls.append((method, url, data))
+        if self.responses:
+            return self.responses.pop(0)
+        return FakeResponse(payload=[])
+
+
+@pytest.fixture
+def sent():
+    return FakeSession()
+
+
+@pytest.fixture
+def client(sent, stub_request):
+    client = ORNDClient("token", ORGANIZATION)
+    stub_request(client, sent.request)
+    return client
+
+
+def test_encode_queries():
+    assert encode_queries([("name.$sw", "Room A"), ("$limit", "5")]) == (
+        "name.$sw=Room%20A&$limit=5"
+    )
+    assert encode_queries([("start", "09:00+01:00")]) == "start=09:00%2B01:00"
+    assert (encode_query_value(True), encode_query_value(5)) == ("true", "5")
+    assert append_queries_to_url("/members?office=1", [("team", "a&b")]) == (
+        "/members?office=1&team=a%26b"
+    )
+    assert append_queries_to_url("/members", []) == "/members?"
+
+
+def test_token_is_sent_per_request(client, stub_request):
+    seen = []
+
+    def request(method, url, headers=None, **kwargs):
+        seen.append(headers)
+        return FakeResponse(payload=[])
+
+    stub_request(client, request)
+    client.get_all_offices()
+    client.delete_members(["m1"])
+    assert "Authorization" not in client.session.headers
+    assert seen[0] == {"Authorization": "Bearer token"}
+    assert seen[1]["Authorization"] == "Bearer token"
+    assert seen[1]["Content-Type"] == "application/json"
+    assert ORNDClient(None, ORGANIZATION).auth_headers() == {}
+
+
+def test_shared_clients_are_kept_per_organization_and_token(monkeypatch):
+    monkeypatch.setattr(client_module, "MAX_SHARED_CLIENTS", 2)
+    monkeypatch.setattr(client_module, "_clients", client_module.OrderedDict())
+    shared = get_client("old", "org-a")
+    assert get_client("old", "org-a") is shared
+    refreshed = get_client("new", "org-a")
+    assert refreshed is not shared
+    assert (shared.token, refreshed.token) == ("old", "new")
+
+    closed = []
+    monkeypatch.setattr(shared, "close", lambda: closed.append(shared))
+    get_client("token", "org-b")
+    assert closed == [shared]  # least recently used, over the limit
+    assert get_client("old", "org-a") is not shared
+
+
+def test_get_all_bookings_builds_a_clean_url(client, sent):
+    request = RetrieveORNDBookingOccurencesRequest(
+        office=WW_12MOORGATE,
+        resource_id=WW_12M_MEETING_ROOM,
+        start="2024-03-01",
+        end="2024-03-02",
+    )
+    client.get_all_bookings(request)
+    method, url, _ = sent.calls[0]
+    assert method == "GET"
+    assert url == (
+        f"{ORND_BASE_URL}{ORGANIZATION}/bookings/occurrences?$limit=100"
+        f"&start=2024-03-01&end=2024-03-02&resourceId={WW_12M_MEETING_ROOM}"
+        f"&office={WW_12MOORGATE}"
+    )
+    assert " " not in url
+
+
+def test_cancel_booking_url(client, sent):
+    client.cancel_booking("abc/def", silent=True)
+    _, url, _ = sent.calls[0]
+    assert url.endswith(
+        "/bookings/abc%2Fdef/cancel?silent=true&skipFee=false"
+    )
+
+
+def test_errors_raise_http_exception(client, sent):
+    sent.responses = [
+        FakeResponse(404, {"message": "Not found"}),
+        FakeResponse(502, None, text="Bad gateway"),
+    ]
+    with pytest.raises(HttpException) as e:
+        client.get_member_by_id(WW_12MOORGATE)
+    assert (str(e.value), e.value.status_code) == ("Not found", 404)
+    with pytest.raises(HttpException) as e:
+        client.get_member_by_id(WW_12MOORGATE)
+    assert str(e.value) == "Bad gateway"
+
+
+def test_json_bodies_use_the_serializer(client, sent):
+    client.delete_members([WW_12MOORGATE])
+    method, url, body = sent.calls[0]
+    assert method == "DELETE"
+    assert json.loads(body) == [WW_12MOORGATE]
+
+
+def test_field_projection_and_compression(client, sent):
+    member = {"_id": "m1", "name": "Ada", "office": {"_id": WW_12MOORGATE}}
+    client.stale_cache = {}
+    sent.responses = [FakeResponse(payload=[member])]
+    assert client.get_all_members(WW_12MOORGATE, fields=["name"]) == [
+        {"_id": "m1", "name": "Ada"}
+    ]
+    assert client.get_all_members(WW_12MOORGATE) == []
+    assert len(client.stale_cache) == 2  # projections are cached apart
+    assert "gzip" in client.session.headers["Accept-Encoding"]
+
+    client.select_fields = True
+    client.get_member_by_id("m1", fields=["name", "email"])
+    assert sent.calls[-1][1].endswith("/members/m1?$select=_id,name,email")
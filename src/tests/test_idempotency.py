@@ -0,0 +1,175 @@
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+import requests
+
+from officerndapilib.calendars import OfficeCalendar
+from officerndapilib.client import ORNDClient
+from officerndapilib.exceptions import HttpException
+from officerndapilib.idempotency import (
+    DONE,
+    UNKNOWN,
+    IdempotencyLedger,
+    IdempotentWriter,
+    idempotency_key,
+)
+from officerndapilib.mutations import BOOKING_CANCELED, MutationEvent
+
+OFFICE = "65416bf72db05a7176b467ac"
+ROOM = "65c38ead5e6d7bd36ed6a540"
+MEMBER = "65c38ead5e6d7bd36ed6a541"
+
+
+def booking_request(
+    start="2024-03-04T09:00:00Z", end="2024-03-04T10:00:00Z", timezone="UTC"
+) -> Any:
+    data = {
+        "office": OFFICE,
+        "resource_id": ROOM,
+        "start": start,
+        "end": end,
+        "member": MEMBER,
+    }
+    calendar = OfficeCalendar(timezone)
+    return SimpleNamespace(
+        **data, data=data, office_calendar=lambda: calendar
+    )
+
+
+class FakeClient(ORNDClient):
+    """Applies creates, then fails the first ``failures`` answers"""
+
+    def __init__(self, failures=()):
+        super().__init__("token", "org")
+        self.failures = list(failures)
+        self.bookings: list[Any] = []
+        self.creates = 0
+
+    def create_booking(self, request):
+        self.creates += 1
+        error = self.failures.pop(0) if self.failures else None
+        if isinstance(error, HttpException) and error.status_code < 500:
+            raise error  # rejected, nothing applied
+        booking = {
+            "_id": f"b{self.creates}",
+            "resourceId": request.resource_id,
+            "start": {"dateTime": request.start},
+            "end": {"dateTime": request.end},
+            "member": request.member,
+        }
+        self.bookings.append(booking)
+        if error is not None:
+            raise error
+        return [booking]
+
+    def cancel_booking(self, booking_id, *args, **kwargs):
+        for booking in self.bookings:
+            if booking["_id"] == booking_id:
+                booking["canceled"] = True
+        self.mutations.publish(MutationEvent(BOOKING_CANCELED, booking_id))
+
+    def get_all_bookings(self, occurrences, fields=None):
+        assert occurrences.start == "2024-03-04"
+        return list(self.bookings)
+
+
+def test_key_is_deterministic():
+    a = booking_request()
+    b = booking_request(start="2024-03-04T09:00:00+00:00")
+    assert idempotency_key(a) == idempotency_key(b)
+    assert idempotency_key(a) != idempotency_key(
+        booking_request(start="2024-03-04T09:30:00Z")
+    )
+
+
+def test_timed_out_write_that_landed_is_not_repeated():
+    client = FakeClient([requests.Timeout("read timed out")])
+    writer = IdempotentWriter(client, backoff=0)
+    request = booking_request()
+    assert writer.create_booking(request)[0]["_id"] == "b1"
+    assert client.creates == 1 and len(client.bookings) == 1
+    # the completed key answers from the ledger
+    assert writer.create_booking(request)[0]["_id"] == "b1"
+    assert client.creates == 1
+    entry = writer.ledger.get(idempotency_key(request))
+    assert entry is not None and entry.state == DONE
+
+
+def test_throttled_write_is_retried_and_rejection_raises():
+    client = FakeClient([HttpException("Too many requests", 429)])
+    writer = IdempotentWriter(client, backoff=0)
+    assert writer.create_booking(booking_request())[0]["_id"] == "b2"
+
+    client = FakeClient([HttpException("Invalid booking", 400)])
+    writer = IdempotentWriter(client, backoff=0)
+    with pytest.raises(HttpException):
+        writer.create_booking(booking_request())
+    assert writer.ledger.unresolved() == []
+
+
+def test_unresolved_key_is_reconciled_after_restart(tmp_path):
+    path = str(tmp_path / "ledger.db")
+    request = booking_request()
+    client = FakeClient()
+    client.create_booking(request)  # landed, but the process crashed
+    ledger = IdempotencyLedger(path)
+    ledger.set(idempotency_key(request), UNKNOWN)
+    ledger.close()
+
+    writer = IdempotentWriter(client, IdempotencyLedger(path))
+    assert writer.ledger.unresolved() == [idempotency_key(request)]
+    assert writer.create_booking(request)[0]["_id"] == "b1"
+    assert client.creates == 1 and writer.ledger.unresolved() == []
+
+
+def test_naive_request_is_reconciled_in_the_office_timezone():
+    request = booking_request(
+        "2024-03-04T09:30:00", "2024-03-04T10:30:00", "America/New_York"
+    )
+    client = FakeClient()
+    client.create_booking(  # landed, and returned in UTC
+        booking_request("2024-03-04T14:30:00Z", "2024-03-04T15:30:00Z")
+    )
+    writer = IdempotentWriter(client)
+    writer.ledger.set(idempotency_key(request), UNKNOWN)
+    assert writer.create_booking(request)[0]["_id"] == "b1"
+    assert client.creates == 1
+
+
+def test_canceled_booking_can_be_created_again():
+    client = FakeClient()
+    writer = IdempotentWriter(client)
+    request = booking_request()
+    assert writer.create_booking(request)[0]["_id"] == "b1"
+    client.cancel_booking("b1")
+    assert writer.ledger.get(idempotency_key(request)) is None
+    assert writer.create_booking(request)[0]["_id"] == "b2"
+    assert client.creates == 2
+
+
+def test_completed_keys_expire():
+    client = FakeClient()
+    writer = IdempotentWriter(client, IdempotencyLedger(ttl=0))
+    writer.create_booking(booking_request())
+    assert writer.create_booking(booking_request())[0]["_id"] == "b2"
+    assert client.creates == 2
+
+
+def test_deleted_member_can_be_created_again(stub_send):
+    client = ORNDClient("token", "org")
+    stub_send(
+        client,
+        lambda method, url, json=None: (
+            [{"_id": "m1", "email": "ada@example.com"}]
+            if method == "POST"
+            else []
+        ),
+    )
+    writer = IdempotentWriter(client)
+    request: Any = SimpleNamespace(data={"email": "ada@example.com"})
+    writer.create_member(request)
+    entry = writer.ledger.get(idempotency_key(request))
+    assert entry is not None and entry.state == DONE
+    client.delete_members(["m1"])
+    assert writer.ledger.get(idempotency_key(request)) is None
@@ -0,0 +1,94 @@
+from typing import Any
+
+import pytest
+
+from officerndapilib import api
+from officerndapilib.client import get_client
+from officerndapilib.exceptions import ValidationException
+from officerndapilib.intervals import BookingIntervalIndex
+
+ROOM = "65c38ead5e6d7bd36ed6a540"
+OTHER_ROOM = "65c38ead5e6d7b6a9dd6a55c"
+
+
+def booking(_id, start, end, resource=ROOM, canceled=False):
+    return {
+        "_id": _id,
+        "resourceId": resource,
+        "start": {"dateTime": f"2024-03-01T{start}:00.000Z"},
+        "end": {"dateTime": f"2024-03-01T{end}:00.000Z"},
+        "canceled": canceled,
+    }
+
+
+@pytest.fixture
+def index():
+    return BookingIntervalIndex(
+        [
+            booking("a", "09:00", "10:00"),
+            booking("b", "11:00", "12:00"),
+            booking("c", "11:30", "13:00"),
+            booking("d", "14:00", "15:00", canceled=True),
+            booking("e", "09:00", "18:00", resource=OTHER_ROOM),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "start, end, expected",
+    [
+        ("08:00", "09:00", False),  # ends as the first booking starts
+        ("08:30", "09:30", True),
+        ("10:00", "11:00", False),  # the gap between two bookings
+        ("12:30", "13:30", True),  # overlaps the tail of a merged interval
+        ("14:00", "15:00", False),  # canceled bookings are not indexed
+        ("07:00", "19:00", True),
+    ],
+)
+def test_conflicts(index, start, end, expected):
+    assert (
+        index.conflicts(
+            ROOM, f"2024-03-01T{start}:00+00:00", f"2024-03-01T{end}:00+00:00"
+        )
+        is expected
+    )
+
+
+def test_busy_intervals_are_merged(index):
+    busy = index.busy_intervals(ROOM)
+    assert len(busy) == 2
+    assert busy[1][1] - busy[1][0] == 2 * 3600
+
+
+def test_remove_rebuilds_busy_intervals(index):
+    assert index.remove("c")
+    assert not index.remove("c")
+    assert "c" not in index
+    assert not index.conflicts(
+        ROOM, "2024-03-01T12:00:00+00:00", "2024-03-01T13:00:00+00:00"
+    )
+    index.add(booking("f", "12:00", "12:30"))
+    start, end = index.busy_intervals(ROOM)[-1]
+    assert end - start == 5400
+
+
+def test_unknown_resource_never_conflicts(index):
+    assert not index.conflicts(
+        "unknown", "2024-03-01T09:00:00", "2024-03-01T10:00:00"
+    )
+
+
+def test_booking_checkout_rejects_known_conflict(index, stub_request):
+    class Request:
+        resource_id = ROOM
+        start = "2024-03-01T09:30:00+00:00"
+        end = "2024-03-01T10:30:00+00:00"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("network call made")
+
+    stub_request(get_client("token", "org"), fail)
+    request: Any = Request()  # stands in for the attrs request model
+    with pytest.raises(ValidationException) as e:
+        api.booking_checkout("token", "org", request, index=index)
+    assert e.value.status_code == 409
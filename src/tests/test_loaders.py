@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from officerndapilib.client import ORNDClient
+from officerndapilib.exceptions import HttpException
+from officerndapilib.loaders import DataLoader, member_loader
+
+MEMBERS = {f"m{i}": {"_id": f"m{i}", "name": f"Member {i}"} for i in range(5)}
+
+
+def test_ids_within_a_tick_are_batched_and_deduplicated():
+    batches = []
+
+    def batch_fn(ids):
+        batches.append(sorted(ids))
+        return {_id: MEMBERS[_id] for _id in ids if _id in MEMBERS}
+
+    loader = DataLoader(batch_fn, batch_delay=0.05)
+    results = {}
+
+    def resolve(_id):
+        results[_id] = loader.get(_id)
+
+    threads = [
+        threading.Thread(target=resolve, args=(_id,))
+        for _id in ["m1", "m2", "m1", "m3", "m2"]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert batches == [["m1", "m2", "m3"]]
+    assert results["m3"]["name"] == "Member 3"
+
+    # memoized, and missing IDs raise without being memoized
+    assert loader.load_many(["m1", "m4"])[0] is results["m1"]
+    assert batches[-1] == ["m4"]
+    with pytest.raises(HttpException):
+        loader.load_many(["missing"])
+    assert loader.stats.hits == 3
+
+
+def test_batches_respect_size_and_lru_bound():
+    batches: list[list[str]] = []
+
+    def load(ids):
+        batches.append(ids)
+        return {_id: _id for _id in ids}
+
+    loader = DataLoader(
+        load,
+        max_batch_size=2,
+        cache_size=3,
+    )
+    assert loader.load_many(["a", "b", "c", "d", "e"]) == list("abcde")
+    assert sorted(map(len, batches)) == [1, 2, 2]
+    assert len(loader._cache) == 3
+    loader.close()
+
+
+def test_member_loader_falls_back_when_filter_misses(stub_send):
+    client = ORNDClient("token", "org")
+    urls = []
+
+    def send(method, url, json=None):
+        urls.append(url.split("/organizations/org", 1)[1])
+        if "_id.$in" in url:
+            return [MEMBERS["m1"]]  # the filter dropped m2
+        if url.endswith("/members/m2"):
+            return MEMBERS["m2"]
+        raise HttpException("Not found", 404)
+
+    stub_send(client, send)
+    loader = member_loader(client)
+    members = [loader.load(_id) for _id in ["m1", "m2", "gone"]]
+    loader.dispatch()
+    assert [m.result()["name"] for m in members[:2]] == ["Member 1", "Member 2"]
+    with pytest.raises(HttpException):
+        members[2].result()
+    assert urls[0] == "/members?_id.$in=m1,m2,gone"
+    assert sorted(urls[1:]) == ["/members/gone", "/members/m2"]
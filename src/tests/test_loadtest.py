@@ -0,0 +1,48 @@
+from datetime import date, timedelta
+
+import pytest
+
+from officerndapilib.exceptions import HttpException
+from officerndapilib.loadtest import MEMBER, OFFICE, FakeORNDServer, run_load
+from officerndapilib.reqs import CreateORNDMemberBookingRequest, resource_lookup
+
+
+@pytest.fixture
+def server():
+    with FakeORNDServer(resources=3) as server:
+        yield server
+
+
+def test_fake_server_books_and_rejects_overlaps(server):
+    client = server.client()
+    room = client.get_all_resources(OFFICE, "meeting_room")[0]["_id"]
+    day = date.today() + timedelta(days=7)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    # the request's validations look the room up on the fake server
+    with resource_lookup(lambda org, _id: client.get_resource_by_id(_id)):
+        request = CreateORNDMemberBookingRequest(
+            organization=server.organization,
+            office=OFFICE,
+            resource_id=room,
+            start=f"{day}T10:00:00.000Z",
+            end=f"{day}T11:00:00.000Z",
+            summary="Standup",
+            member=MEMBER,
+        )
+    booking = client.booking_checkout(request)[0]
+    with pytest.raises(HttpException) as e:
+        client.booking_checkout(request)
+    assert e.value.status_code == 409
+    assert client.cancel_booking(booking["_id"])["canceled"]
+    assert not server.bookings
+
+
+def test_run_load_reports_each_stage(server):
+    report = run_load(server.client(), stages=(1, 2), duration=0.3)
+    assert [stage.concurrency for stage in report.stages] == [1, 2]
+    for stage in report.stages:
+        assert stage.operations == sum(stage.mix.values()) > 0
+        assert stage.throughput > 0 and stage.cpu_per_operation > 0
+        assert stage.latency["p50"] <= stage.latency["p99"]
+    assert report.format().splitlines()[0].startswith("workers")
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+
+from officerndapilib.client import ORNDClient
+from officerndapilib.intervals import BookingIntervalIndex
+from officerndapilib.mutations import (
+    BOOKING_CANCELED,
+    MutationEvent,
+    MutationPublisher,
+)
+from officerndapilib.quotes import QuoteCache
+from officerndapilib.recurrence import SeriesCache
+
+ROOM_A = "65c38ead5e6d7bd36ed6a540"
+ROOM_B = "65c38ead5e6d7bd36ed6a541"
+
+BOOKING = {
+    "_id": "b1",
+    "resourceId": ROOM_A,
+    "start": {"dateTime": "2024-03-04T09:00:00Z"},
+    "end": {"dateTime": "2024-03-04T10:00:00Z"},
+    "recurrence": {"rrule": "FREQ=WEEKLY;COUNT=4"},
+}
+
+
+def booking_request(resource_id=ROOM_A):
+    # stands in for CreateORNDMemberBookingRequest without its API lookups
+    return SimpleNamespace(
+        resource_id=resource_id,
+        start="2024-03-04T09:00:00Z",
+        end="2024-03-04T10:00:00Z",
+        data={"resource_id": resource_id, "start": "2024-03-04T09:00:00Z"},
+    )
+
+
+@pytest.fixture
+def client(stub_send):
+    client = ORNDClient("token", "org", quote_cache=QuoteCache(ttl=60))
+
+    def send(method, url, json=None):
+        if url.endswith("/checkout"):
+            return [BOOKING]
+        if "/cancel" in url or method == "DELETE":
+            return {**BOOKING, "canceled": True}
+        return [{"price": 10}]
+
+    stub_send(client, send)
+    return client
+
+
+def test_writes_update_subscribed_caches_in_place(client):
+    index = BookingIntervalIndex()
+    series = SeriesCache()
+    client.mutations.register_index(index)
+    client.mutations.register_series(series)
+    client.validate_booking_request(booking_request(ROOM_A))
+    client.validate_booking_request(booking_request(ROOM_B))
+
+    client.create_booking(booking_request())
+    assert index.conflicts(
+        ROOM_A, "2024-03-04T09:30:00Z", "2024-03-04T09:45:00Z"
+    )
+    assert "b1" in series
+    assert len(client.quote_cache) == 1  # only ROOM_A's quote was dropped
+
+    client.cancel_booking("b1")
+    assert "b1" not in index and "b1" not in series
+
+
+def test_failing_handlers_do_not_fail_the_write(stub_send):
+    publisher = MutationPublisher()
+    seen: list[MutationEvent] = []
+
+    def fail(event):
+        raise RuntimeError("boom")
+
+    publisher.register("booking", fail)
+    publisher.register(BOOKING_CANCELED, seen.append)
+    client = ORNDClient("token", "org", mutations=publisher)
+    stub_send(client, lambda method, url, json=None: {"_id": "b1"})
+
+    assert client.delete_booking("b1") == {"_id": "b1"}
+    assert client.cancel_booking("b1") == {"_id": "b1"}
+    assert [event.type for event in seen] == ["booking.canceled"]
+    assert seen[0].resource_id is None
+    assert len(publisher.failures) == 2
+
+    publisher.unregister("booking", fail)
+    client.cancel_booking("b1")
+    assert len(publisher.failures) == 2
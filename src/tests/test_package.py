@@ -0,0 +1,45 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def run_python(code: str) -> str:
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    return out.stdout.strip()
+
+
+def test_import_does_not_load_heavy_modules():
+    loaded = run_python(
+        "import sys, officerndapilib; "
+        "print(','.join(m for m in ('requests', 'attrs', "
+        "'officerndapilib.api', 'officerndapilib.reqs') if m in sys.modules))"
+    )
+    assert loaded == ""
+
+
+def test_reqs_imports_without_cycle():
+    loaded = run_python(
+        "import sys; from officerndapilib.reqs import CreateORNDMemberRequest; "
+        "print('officerndapilib.api' in sys.modules)"
+    )
+    assert loaded == "True"
+
+
+def test_lazy_attributes_resolve():
+    import officerndapilib
+    from officerndapilib import api, exceptions
+
+    assert officerndapilib.get_all_members is api.get_all_members
+    assert officerndapilib.HttpException is exceptions.HttpException
+    assert officerndapilib.reqs.CreateORNDMemberRequest is not None
+    assert "booking_checkout" in dir(officerndapilib)
+
+
+def test_unknown_attribute_raises():
+    import officerndapilib
+
+    with pytest.raises(AttributeError):
+        officerndapilib.does_not_exist
@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import pytest
+
+from officerndapilib.client import ORNDClient
+from officerndapilib.quotes import QuoteCache, quote_key
+
+ROOM_A = "65c38ead5e6d7bd36ed6a540"
+ROOM_B = "65c38ead5e6d7bd36ed6a541"
+
+
+def booking_request(resource_id=ROOM_A, start="2024-03-04T09:00:00Z"):
+    # stands in for CreateORNDMemberBookingRequest without its API lookups
+    return SimpleNamespace(
+        resource_id=resource_id,
+        start=start,
+        end="2024-03-04T10:00:00Z",
+        data={
+            "resource_id": resource_id,
+            "start": start,
+            "end": "2024-03-04T10:00:00Z",
+            "member": "65416bf72db05a7176b467ac",
+        },
+    )
+
+
+@pytest.fixture
+def sent() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def client(sent, stub_send):
+    client = ORNDClient("token", "org", quote_cache=QuoteCache(ttl=60))
+
+    def send(method, url, json=None):
+        sent.append(url.rsplit("/", 1)[-1])
+        if "/cancel" in url:
+            return {"_id": "b1", "resourceId": ROOM_A}
+        return [{"price": len(sent)}]
+
+    stub_send(client, send)
+    return client
+
+
+def test_quote_key_is_canonical():
+    a = {"start": "2024-03-04T09:00:00Z", "member": "m", "resource_id": "r"}
+    b = {"resource_id": "r", "member": "m", "start": "2024-03-04T09:00+00:00"}
+    assert quote_key(a) == quote_key(b)
+    assert quote_key(a) != quote_key({**a, "member": "n"})
+
+
+def test_quotes_are_memoized(client, sent):
+    first = client.validate_booking_request(booking_request())
+    again = client.validate_booking_request(
+        booking_request(start="2024-03-04T09:00:00+00:00")
+    )
+    assert first is again and sent == ["checkout-summary"]
+    client.validate_booking_request(booking_request(ROOM_B))
+    client.validate_booking_request(booking_request(), cached=False)
+    stats = client.quote_cache.stats
+    assert (stats.hits, stats.misses) == (1, 2)
+    assert stats.hit_rate == pytest.approx(1 / 3)
+
+
+def test_bookings_invalidate_their_resource(client):
+    client.validate_booking_request(booking_request())
+    client.validate_booking_request(booking_request(ROOM_B))
+    client.cancel_booking("b1")
+    assert len(client.quote_cache) == 1
+    client.create_booking(booking_request(ROOM_B))
+    assert len(client.quote_cache) == 0
+    assert client.quote_cache.stats.invalidations == 2
+
+
+def test_quote_cache_expires_and_is_bounded(monkeypatch):
+    cache = QuoteCache(ttl=10, max_size=2)
+    now = [0.0]
+    monkeypatch.setattr("officerndapilib.quotes.time.monotonic", lambda: now[0])
+    for i in range(3):
+        cache.get_or_quote(ROOM_A, {"start": i}, lambda: i)
+    assert len(cache) == 2
+    assert cache.get_or_quote(ROOM_A, {"start": 2}, lambda: "new") == 2
+    now[0] = 11.0
+    assert cache.get_or_quote(ROOM_A, {"start": 2}, lambda: "new") == "new"
@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+
+from officerndapilib.exceptions import ValidationException
+from officerndapilib.intervals import BookingIntervalIndex
+from officerndapilib.recurrence import SeriesCache, compile_series, parse_rrule
+
+UTC = timezone.utc
+
+
+def utc(
+    year: int, month: int, day: int, hour: int = 0, minute: int = 0
+) -> datetime:
+    return datetime(year, month, day, hour, minute, tzinfo=UTC)
+
+
+def booking(
+    _id="b1", rrule="FREQ=WEEKLY;BYDAY=MO,WE", resource="r1", **fields
+) -> Any:
+    return {
+        "_id": _id,
+        "resourceId": resource,
+        "start": {"dateTime": "2024-03-04T09:00:00Z"},  # a Monday
+        "end": {"dateTime": "2024-03-04T10:30:00Z"},
+        "recurrence": {"rrule": rrule},
+        **fields,
+    }
+
+
+def test_parse_rrule_is_cached():
+    rule = parse_rrule("RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,-1FR")
+    assert rule is parse_rrule("RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,-1FR")
+    assert rule.interval == 2
+    assert rule.by_weekday == ((0, None), (4, -1))
+
+
+@pytest.mark.parametrize(
+    "rrule", ["", "FREQ=HOURLY", "FREQ=DAILY;BYHOUR=9", "FREQ=WEEKLY;BYDAY=XX"]
+)
+def test_parse_rrule_rejects_unsupported_rules(rrule):
+    with pytest.raises(ValidationException):
+        parse_rrule(rrule)
+
+
+def test_weekly_occurrences():
+    rule = parse_rrule("FREQ=WEEKLY;BYDAY=MO,WE;COUNT=4")
+    starts = list(rule.occurrences(utc(2024, 3, 4, 9)))
+    assert [s.day for s in starts] == [4, 6, 11, 13]
+
+
+def test_monthly_ordinal_weekday_and_until():
+    rule = parse_rrule("FREQ=MONTHLY;BYDAY=-1FR;UNTIL=20240601")
+    starts = list(rule.occurrences(utc(2024, 1, 1, 9)))
+    assert [s.date().isoformat() for s in starts] == [
+        "2024-01-26",
+        "2024-02-23",
+        "2024-03-29",
+        "2024-04-26",
+        "2024-05-31",
+    ]
+
+
+def test_window_skip_matches_full_expansion():
+    rule = parse_rrule("FREQ=DAILY;INTERVAL=3")
+    dtstart = utc(2024, 1, 1, 9)
+    window = (utc(2025, 6, 1), utc(2025, 7, 1))
+    full = [
+        s
+        for s in rule.occurrences(dtstart, window_end=window[1])
+        if s >= window[0]
+    ]
+    assert list(rule.occurrences(dtstart, *window)) == full
+    assert len(full) == 10
+
+
+def test_series_occurrences_overlap_window():
+    series = compile_series(booking())
+    assert series is not None
+    assert series.duration == timedelta(minutes=90)
+    # the Monday occurrence started before the window but is still running
+    occurrences = list(
+        series.occurrences(utc(2024, 3, 11, 10), utc(2024, 3, 14))
+    )
+    assert occurrences == [
+        (utc(2024, 3, 11, 9), utc(2024, 3, 11, 10, 30)),
+        (utc(2024, 3, 13, 9), utc(2024, 3, 13, 10, 30)),
+    ]
+
+
+def test_series_keeps_local_time_across_dst():
+    london = booking(
+        rrule="FREQ=WEEKLY;COUNT=3",
+        start={"dateTime": "2024-03-25T09:00:00Z"},  # 09:00 GMT
+        end={"dateTime": "2024-03-25T10:00:00Z"},
+        timezone="Europe/London",
+    )
+    series = compile_series(london)
+    assert series is not None
+    assert [start for start, _ in series.occurrences()] == [
+        utc(2024, 3, 25, 9),
+        utc(2024, 4, 1, 8),  # 09:00 BST after the 31 March change
+        utc(2024, 4, 8, 8),
+    ]
+
+    # Monday 21:00 in New York is Tuesday in UTC
+    evening = booking(
+        rrule="FREQ=WEEKLY;BYDAY=MO;COUNT=2",
+        start={"dateTime": "2024-03-05T02:00:00Z"},
+        end={"dateTime": "2024-03-05T03:00:00Z"},
+    )
+    series = SeriesCache([evening], "America/New_York").get("b1")
+    assert series is not None
+    assert [start for start, _ in series.occurrences()] == [
+        utc(2024, 3, 5, 2),
+        utc(2024, 3, 12, 1),  # 21:00 EDT from 10 March
+    ]
+
+
+def test_series_cache_expands_into_index():
+    cache = SeriesCache(
+        [
+            booking(),
+            booking("b2", "FREQ=DAILY", "r2"),
+            booking("b3", recurrence=None),
+            booking("b4", canceled=True),
+        ]
+    )
+    assert len(cache) == 2 and "b3" not in cache and "b4" not in cache
+
+    window = ("2024-03-18T00:00:00Z", "2024-03-20T00:00:00Z")
+    assert [
+        (s.booking_id, start.day) for s, start, _ in cache.occurrences(*window)
+    ] == [("b1", 18), ("b2", 18), ("b2", 19)]
+
+    index = BookingIntervalIndex()
+    cache.expand_into(index, *window, resource_id="r1")
+    assert index.conflicts("r1", "2024-03-18T10:00:00Z", "2024-03-18T11:00Z")
+    assert not index.conflicts("r2", "2024-03-18T09:00Z", "2024-03-18T10:00Z")
+
+    assert cache.remove("b1") and not cache.remove("b1")
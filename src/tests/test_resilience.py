@@ -0,0 +1,121 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+import requests
+
+from officerndapilib.client import ORNDClient
+from officerndapilib.exceptions import CircuitOpenException, HttpException
+from officerndapilib.resilience import (
+    CircuitBreaker,
+    CircuitBreakers,
+    LatencyTracker,
+    hedged_call,
+)
+
+WW_12MOORGATE = "65416bf72db05a7176b467ac"
+
+
+def test_breaker_opens_and_recovers():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()  # the trial call
+    assert not breaker.allow()  # others wait for the trial
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker(failure_threshold=1, latency_threshold=0.5)
+    breaker.record_success(latency=0.1)
+    assert breaker.state == "closed"
+    breaker.record_success(latency=1.0)
+    assert breaker.state == "open"
+
+
+def test_latency_percentile():
+    tracker = LatencyTracker()
+    assert tracker.percentile(95) is None
+    for i in range(100):
+        tracker.record(i / 100)
+    assert tracker.percentile(95) == 0.95
+
+
+def test_hedged_call_takes_the_first_answer():
+    calls: list[None] = []
+    lock = threading.Lock()
+
+    def fn():
+        with lock:
+            calls.append(None)
+            attempt = len(calls)
+        time.sleep(0.5 if attempt == 1 else 0.01)
+        return attempt
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        started = time.monotonic()
+        assert hedged_call(pool, fn, delay=0.02) == 2
+        assert time.monotonic() - started < 0.4
+
+
+def test_client_fails_fast_or_serves_stale_while_open(stub_send):
+    breakers = CircuitBreakers(failure_threshold=1)
+    stale: dict[str, Any] = {}
+    client = ORNDClient(
+        "token", "org", circuit_breakers=breakers, stale_cache=stale
+    )
+    responses = iter([[{"_id": "1"}], requests.ConnectionError("down")])
+
+    def send(method, url, json=None):
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    stub_send(client, send)
+    assert client.get_all_members(WW_12MOORGATE) == [{"_id": "1"}]
+    with pytest.raises(requests.ConnectionError):
+        client.get_all_members(WW_12MOORGATE)
+    assert breakers.states() == {"members": "open"}
+    assert client.get_all_members(WW_12MOORGATE) == [{"_id": "1"}]
+    with pytest.raises(CircuitOpenException) as e:
+        client.get_all_members("another office")  # nothing cached
+    assert e.value.status_code == 503
+
+
+def test_client_errors_do_not_open_the_circuit(stub_send):
+    breakers = CircuitBreakers(failure_threshold=1)
+    client = ORNDClient("token", "org", circuit_breakers=breakers)
+
+    def send(method, url, json=None):
+        raise HttpException("Not found", 404)
+
+    stub_send(client, send)
+    with pytest.raises(HttpException):
+        client.get_member_by_id(WW_12MOORGATE)
+    assert breakers.states() == {"member": "closed"}
+
+
+def test_trial_call_raising_any_error_reopens_the_circuit(stub_send):
+    breakers = CircuitBreakers(failure_threshold=1, recovery_time=0.01)
+    client = ORNDClient("token", "org", circuit_breakers=breakers)
+
+    def send(method, url, json=None):
+        raise ValueError("invalid JSON")  # e.g. a garbled 200 response
+
+    stub_send(client, send)
+    with pytest.raises(ValueError):
+        client.get_member_by_id(WW_12MOORGATE)
+    time.sleep(0.02)
+    with pytest.raises(ValueError):
+        client.get_member_by_id(WW_12MOORGATE)  # the half-open trial
+    assert breakers.states() == {"member": "open"}
+    time.sleep(0.02)
+    assert breakers.get("member").allow()  # not stuck half-open
@@ -0,0 +1,61 @@
+import pytest
+
+from officerndapilib.schema import ORNDBooking, ORNDMember
+from officerndapilib.serialization import (
+    Serializer,
+    available_backends,
+    get_serializer,
+    is_typeddict,
+    projected_fields,
+)
+
+BOOKINGS = b"""[{"_id": "65c38ead5e6d7bd36ed6a540",
+  "start": {"dateTime": "2024-03-01T09:00:00Z"},
+  "end": {"dateTime": "2024-03-01T10:00:00Z"},
+  "fees": [{"fee": {"price": 12.5, "quantity": 1}}],
+  "canceled": false}]"""
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_round_trip(backend):
+    serializer = Serializer(backend)
+    bookings = serializer.loads(BOOKINGS)
+    assert bookings[0]["start"]["dateTime"] == "2024-03-01T09:00:00Z"
+    assert serializer.loads(serializer.dumps(bookings)) == bookings
+
+
+def test_stdlib_is_always_available():
+    assert available_backends()[-1] == "json"
+    assert get_serializer().backend == available_backends()[0]
+    with pytest.raises(ValueError):
+        Serializer("yaml")
+
+
+def test_is_typeddict():
+    assert is_typeddict(ORNDMember)
+    assert not is_typeddict(dict)
+
+
+def test_loads_as_generates_typed_structs():
+    pytest.importorskip("msgspec")
+    serializer = Serializer("msgspec")
+    bookings = serializer.loads_as(BOOKINGS, list[ORNDBooking])
+    assert bookings[0].id == "65c38ead5e6d7bd36ed6a540"
+    assert bookings[0].fees[0].fee.price == 12.5
+    assert bookings[0].members is None  # missing keys default to None
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_loads_fields_keeps_only_the_projection(backend):
+    fields = projected_fields(["start", "canceled", "members"])
+    assert fields == ("_id", "start", "canceled", "members")
+    bookings = Serializer(backend).loads_fields(BOOKINGS, fields)
+    assert bookings == [
+        {
+            "_id": "65c38ead5e6d7bd36ed6a540",
+            "start": {"dateTime": "2024-03-01T09:00:00Z"},
+            "canceled": False,
+        }
+    ]
+    single = Serializer(backend).loads_fields(b'{"_id": "1", "x": 2}', fields)
+    assert single == {"_id": "1"}
@@ -0,0 +1,138 @@
+import threading
+import time
+
+import pytest
+
+from officerndapilib import api
+from officerndapilib.exceptions import HttpException, ValidationException
+from officerndapilib.schema import ORNDAuth
+from officerndapilib.tenants import ClientRegistry, TokenCache
+from tests.conftest import FakeResponse
+
+AUTH = ORNDAuth(
+    client_id="id",
+    client_secret="secret",
+    grant_type="client_credentials",
+    scope="flex.community.members.read",
+    organization_slug="org-a",
+)
+
+
+@pytest.fixture
+def tokens(monkeypatch):
+    issued = []
+
+    def request_ornd_token(auth):
+        issued.append(auth["organization_slug"])
+        return {"access_token": f"token-{len(issued)}", "expires_in": 3600}
+
+    monkeypatch.setattr(api, "request_ornd_token", request_ornd_token)
+    return issued
+
+
+def test_token_cache_reuses_tokens_until_invalidated(tokens):
+    cache = TokenCache(AUTH)
+    assert cache.get() == cache.get() == "token-1"
+    cache.invalidate()
+    assert cache.get() == "token-2"
+    assert tokens == ["org-a", "org-a"]
+
+
+def test_tenants_are_isolated(monkeypatch):
+    registry = ClientRegistry(rate=5)
+    a = registry.register("org-a", token="a")
+    b = registry.register("org-b", token="b", rate=1)
+    assert registry["org-a"] is a and "org-b" in registry
+    assert sorted(registry) == ["org-a", "org-b"]
+    assert a.session is not b.session
+    assert a.rate_limiter is not None and a.rate_limiter.rate == 5
+    assert b.rate_limiter is not None and b.rate_limiter.rate == 1
+    assert a.urls["offices"].endswith("/org-a/offices")
+    with pytest.raises(ValidationException):
+        registry.get("org-c")
+    closed = []
+    monkeypatch.setattr(b, "close", lambda: closed.append(b))
+    assert registry.remove("org-b") and "org-b" not in registry
+    assert closed == [b]  # sessions and hedging pools alike
+
+
+def test_expired_token_is_refreshed_and_retried(tokens, stub_request):
+    registry = ClientRegistry()
+    client = registry.register(auth=AUTH)
+    seen = []
+
+    def request(method, url, headers=None, **kwargs):
+        seen.append(headers["Authorization"])
+        if seen[-1] == "Bearer token-1":
+            return FakeResponse(401, {"message": "Unauthorized"})
+        return FakeResponse(payload=[])
+
+    stub_request(client, request)
+    assert client.urls["members"].endswith("/org-a/members")
+    assert client.get_all_members("office") == []
+    assert seen == ["Bearer token-1", "Bearer token-2"]
+
+
+def test_global_concurrency_is_capped(stub_request):
+    registry = ClientRegistry(max_concurrency=3, tenant_concurrency=2)
+    clients = [registry.register(f"org-{i}", token="t") for i in range(3)]
+    active: list[str] = []
+    peak = {"global": 0, "org-0": 0}
+    lock = threading.Lock()
+
+    def request(method, url, **kwargs):
+        with lock:
+            active.append(url)
+            peak["global"] = max(peak["global"], len(active))
+            peak["org-0"] = max(
+                peak["org-0"], sum("/org-0/" in u for u in active)
+            )
+        time.sleep(0.02)
+        with lock:
+            active.remove(url)
+        return FakeResponse(500, {"message": "done"})
+
+    for client in clients:
+        stub_request(client, request)
+
+    def call(client):
+        with pytest.raises(HttpException):
+            client.get_member_by_id("m")
+
+    threads = [
+        threading.Thread(target=call, args=(client,))
+        for client in clients * 4
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak["global"] <= 3
+    assert peak["org-0"] <= 2
+
+
+def test_throttled_tenant_does_not_hold_global_slots(
+    monkeypatch, stub_request
+):
+    registry = ClientRegistry(max_concurrency=2, tenant_concurrency=2)
+    throttled = registry.register("org-a", token="a", rate=1)
+    other = registry.register("org-b", token="b")
+    release = threading.Event()
+
+    monkeypatch.setattr(
+        throttled.rate_limiter, "acquire", lambda: release.wait(5)
+    )
+    for client in (throttled, other):
+        stub_request(client, lambda *args, **kwargs: FakeResponse(payload=[]))
+    waiting = [
+        threading.Thread(target=throttled.get_all_offices) for _ in range(2)
+    ]
+    for thread in waiting:
+        thread.start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    assert other.get_all_offices() == []
+    assert time.monotonic() - started < 1
+    release.set()
+    for thread in waiting:
+        thread.join()
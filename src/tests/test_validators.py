@@ -0,0 +1,66 @@
+import pytest
+
+from officerndapilib.dates import parse_datetime
+from officerndapilib.reqs import (
+    CreateORNDMemberRequest,
+    attrs_is_ISO8601_datetime,
+    attrs_is_email,
+    attrs_valid_ornd_id,
+    validate_requests,
+)
+
+WW_12MOORGATE = "65416bf72db05a7176b467ac"
+
+MEMBER_PAYLOAD = {
+    "startDate": "2024-01-01T00:00:00Z",
+    "office": WW_12MOORGATE,
+    "name": "Test Member 1",
+    "email": "testmember1@gmail.com",
+}
+
+
+@pytest.mark.parametrize(
+    "value", ["2024-01-01T09:00:00", "2024-01-01T09:00", "2024-01-01T09:00:00Z"]
+)
+def test_accepts_iso8601_datetimes(value):
+    attrs_is_ISO8601_datetime(None, None, value)
+
+
+@pytest.mark.parametrize(
+    "value", ["2024-01-01", "not a date", "2024-13-01T09:00"]
+)
+def test_rejects_invalid_datetimes(value):
+    with pytest.raises(ValueError):
+        attrs_is_ISO8601_datetime(None, None, value)
+
+
+def test_datetime_is_parsed_once():
+    parse_datetime.cache_clear()
+    value = "2024-02-01T10:00:00+00:00"
+    attrs_is_ISO8601_datetime(None, None, value)
+    parse_datetime(value)
+    info = parse_datetime.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
+def test_id_and_email_validators():
+    attrs_valid_ornd_id(None, None, WW_12MOORGATE)
+    attrs_is_email(None, None, "a@b.co")
+    with pytest.raises(ValueError):
+        attrs_valid_ornd_id(None, None, "123")
+    with pytest.raises(ValueError):
+        attrs_is_email(None, None, "not-an-email")
+
+
+def test_validate_requests_collects_errors_by_index():
+    payloads = [
+        MEMBER_PAYLOAD,
+        {**MEMBER_PAYLOAD, "email": "invalid"},
+        {**MEMBER_PAYLOAD, "office": "123"},
+    ]
+    result = validate_requests(CreateORNDMemberRequest, payloads)
+    assert not result.ok
+    assert list(result.valid) == [0]
+    assert isinstance(result.valid[0], CreateORNDMemberRequest)
+    assert sorted(result.errors) == [1, 2]
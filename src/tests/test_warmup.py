@@ -0,0 +1,74 @@
+from datetime import date
+from typing import Any
+
+import pytest
+
+from officerndapilib.cache import MemoryCache
+from officerndapilib.client import ORNDClient
+from officerndapilib.exceptions import HttpException, ValidationException
+from officerndapilib.intervals import BookingIntervalIndex
+
+OFFICES = ["65416bf72db05a7176b467ac", "65416bf72db05a7176b467ad"]
+ROOM = "65c38ead5e6d7bd36ed6a540"
+
+
+def fake_send(method, url, json=None):
+    path = url.split("/organizations/org", 1)[1]
+    today = date.today().isoformat()
+    if path == "/offices":
+        return [{"_id": office} for office in OFFICES]
+    if path.startswith("/members"):
+        if OFFICES[1] in path:
+            raise HttpException("Service unavailable", 503)
+        return [{"_id": "m1", "email": "ada@example.com"}]
+    if path.startswith("/resources"):
+        if "type=meeting_room" not in path or OFFICES[1] in path:
+            return []
+        return [{"_id": ROOM, "office": OFFICES[0]}]
+    if path.startswith("/bookings/occurrences"):
+        return [
+            {
+                "_id": "b1",
+                "resourceId": ROOM,
+                "start": {"dateTime": f"{today}T09:00:00Z"},
+                "end": {"dateTime": f"{today}T10:00:00Z"},
+            }
+        ]
+    raise AssertionError(path)
+
+
+def test_warmup_fills_caches_and_reports(stub_send):
+    cache = MemoryCache()
+    client = ORNDClient("token", "org", metadata_cache=cache)
+    stub_send(client, fake_send)
+    index = BookingIntervalIndex()
+    members: dict[str, Any] = {}
+
+    report = client.warmup(days=2, index=index, members=members)
+    assert (report.offices, report.resources, report.bookings) == (2, 1, 1)
+    assert report.members == 1 and list(members) == ["m1"]
+    assert "b1" in index
+    assert list(report.errors) == [f"members:{OFFICES[1]}"]
+    assert not report.ok and report.as_dict()["ok"] is False
+    assert report.elapsed > 0
+
+    # resources are now answered from the metadata cache
+    stub_send(client, pytest.fail)
+    resources = client.get_all_resources(OFFICES[0], "meeting_room")
+    assert resources[0]["_id"] == ROOM
+
+
+def test_warmup_only_fetches_what_it_can_keep(stub_send):
+    client = ORNDClient("token", "org", metadata_cache=MemoryCache())
+    paths = []
+
+    def send(method, url, json=None):
+        paths.append(url.split("/organizations/org", 1)[1])
+        return fake_send(method, url, json)
+
+    stub_send(client, send)
+    report = client.warmup(offices=[OFFICES[0]], max_workers=2)
+    assert (report.resources, report.bookings, report.members) == (1, 0, 0)
+    assert all(path.startswith("/resources") for path in paths)
+    with pytest.raises(ValidationException):
+        client.warmup(days=3)  # nowhere to keep the bookings
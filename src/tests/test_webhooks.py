@@ -0,0 +1,132 @@
+import asyncio
+import hashlib
+import hmac
+import io
+import json
+import time
+from typing import Any
+
+import pytest
+
+from officerndapilib.exceptions import ValidationException
+from officerndapilib.intervals import BookingIntervalIndex
+from officerndapilib.webhooks import (
+    ORNDWebhookEvent,
+    WebhookDispatcher,
+    WebhookReceiver,
+    parse_event,
+    verify_signature,
+)
+
+SECRET = "whsec_test"
+ROOM = "65c38ead5e6d7bd36ed6a540"
+
+
+def booking_event(event_type, canceled=False):
+    return json.dumps(
+        {
+            "event": "evt_1",
+            "eventType": event_type,
+            "createdAt": "2024-03-01T08:00:00Z",
+            "data": {
+                "object": {
+                    "_id": "booking_1",
+                    "resourceId": ROOM,
+                    "start": {"dateTime": "2024-03-01T09:00:00Z"},
+                    "end": {"dateTime": "2024-03-01T10:00:00Z"},
+                    "canceled": canceled,
+                }
+            },
+        }
+    ).encode()
+
+
+def sign(body, timestamp=None, secret=SECRET):
+    t = str(int(timestamp or time.time()))
+    digest = hmac.new(
+        secret.encode(), body + b"." + t.encode(), hashlib.sha256
+    ).hexdigest()
+    return f"t={t},signature={digest}"
+
+
+def test_verify_signature():
+    body = booking_event("booking.created")
+    assert verify_signature(body, sign(body), SECRET)
+    assert not verify_signature(body, sign(body, secret="other"), SECRET)
+    assert not verify_signature(body, sign(body, time.time() - 3600), SECRET)
+    assert not verify_signature(body, "garbage", SECRET)
+
+
+def test_parse_event():
+    event = parse_event(booking_event("booking.updated"))
+    assert (event.kind, event.action) == ("booking", "updated")
+    assert event.object["_id"] == "booking_1"
+    with pytest.raises(ValidationException):
+        parse_event(b"{}")
+
+
+def test_dispatcher_keeps_cache_and_index_in_sync():
+    cache: dict[str, Any] = {}
+    index = BookingIntervalIndex()
+    dispatcher = WebhookDispatcher()
+    dispatcher.register_cache("booking", cache)
+    dispatcher.register_index(index)
+
+    dispatcher.dispatch(parse_event(booking_event("booking.created")))
+    assert "booking_1" in cache
+    assert index.conflicts(
+        ROOM, "2024-03-01T09:30:00Z", "2024-03-01T09:45:00Z"
+    )
+
+    dispatcher.dispatch(
+        parse_event(booking_event("booking.updated", canceled=True))
+    )
+    assert not index.conflicts(
+        ROOM, "2024-03-01T09:30:00Z", "2024-03-01T09:45:00Z"
+    )
+
+    dispatcher.dispatch(parse_event(booking_event("booking.removed")))
+    assert cache == {}
+
+
+def test_wsgi_rejects_bad_signature():
+    received: list[ORNDWebhookEvent] = []
+    receiver = WebhookReceiver(SECRET)
+    receiver.dispatcher.register("booking.created", received.append)
+    body = booking_event("booking.created")
+
+    def call(signature):
+        statuses = []
+        environ = {
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": io.BytesIO(body),
+            "HTTP_OFFICERND_SIGNATURE": signature,
+        }
+        receiver.wsgi(environ, lambda status, headers: statuses.append(status))
+        return statuses[0]
+
+    assert call("t=1,signature=bad").startswith("401")
+    assert call(sign(body)).startswith("200")
+    assert len(received) == 1
+
+
+def test_asgi_dispatches_event():
+    received: list[ORNDWebhookEvent] = []
+    receiver = WebhookReceiver(SECRET)
+    receiver.dispatcher.register("booking", received.append)
+    body = booking_event("booking.created")
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "headers": [(b"officernd-signature", sign(body).encode())],
+    }
+    asyncio.run(receiver.asgi(scope, receive, send))
+    assert sent[0]["status"] == 200
+    assert received[0].type == "booking.created"